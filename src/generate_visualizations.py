@@ -5,6 +5,7 @@ Creates publication-ready charts for presentation slides
 
 import json
 import os
+from collections import Counter
 from typing import Dict, List
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
@@ -281,15 +282,21 @@ def plot_risk_distribution(metrics: Dict, output_path: str):
     
     fig, ax = plt.subplots(figsize=(9, 7))
     
-    wedges, texts, autotexts = ax.pie(sizes, labels=labels, autopct='%1.1f%%',
-                                        colors=colors_list, startangle=90,
-                                        textprops={'fontsize': 12, 'fontweight': 'bold'},
-                                        wedgeprops={'edgecolor': 'white', 'linewidth': 2})
+    # Precompute percentage labels instead of a per-wedge autopct callback
+    total = sum(sizes)
+    pct_labels = [f'{100 * size / total:.1f}%' for size in sizes]
     
-    # Make percentage text white
-    for autotext in autotexts:
-        autotext.set_color('white')
-        autotext.set_fontsize(11)
+    wedges, texts = ax.pie(sizes, labels=labels,
+                           colors=colors_list, startangle=90,
+                           textprops={'fontsize': 12, 'fontweight': 'bold'},
+                           wedgeprops={'edgecolor': 'white', 'linewidth': 2})
+    
+    # Place white percentage text at each wedge's midpoint
+    for wedge, pct_label in zip(wedges, pct_labels):
+        angle = np.deg2rad((wedge.theta1 + wedge.theta2) / 2)
+        ax.text(0.6 * np.cos(angle), 0.6 * np.sin(angle), pct_label,
+               ha='center', va='center', color='white',
+               fontsize=11, fontweight='bold')
     
     ax.set_title('Risk Category Distribution', fontsize=16, fontweight='bold', pad=20)
     
@@ -365,17 +372,20 @@ def plot_error_analysis_by_risk(data: List[Dict], output_path: str):
         'LOW': {'fn': 0, 'fp': 0, 'correct': 0}
     }
     
-    for doc in data:
-        risk_cat = doc.get('risk_category', 'UNKNOWN')
-        label = doc.get('validation', {}).get('label')
-        
+    risk_label_counts = Counter(
+        (doc.get('risk_category', 'UNKNOWN'), doc.get('validation', {}).get('label'))
+        for doc in data
+    )
+    
+    # Pivot (risk_category, label) buckets into the per-category table
+    for (risk_cat, label), n in risk_label_counts.items():
         if risk_cat in risk_errors:
             if label == 'false_negative':
-                risk_errors[risk_cat]['fn'] += 1
+                risk_errors[risk_cat]['fn'] += n
             elif label == 'false_positive':
-                risk_errors[risk_cat]['fp'] += 1
+                risk_errors[risk_cat]['fp'] += n
             elif label in ['true_positive', 'true_negative']:
-                risk_errors[risk_cat]['correct'] += 1
+                risk_errors[risk_cat]['correct'] += n
     
     # Prepare data
     categories = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
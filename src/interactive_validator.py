@@ -5,17 +5,88 @@ Interactive Validation Tool - Terminal-based labeling interface
 import json
 import csv
 import os
+import sys
+import threading
+from collections import Counter
+from itertools import islice
 from datetime import datetime
 from typing import List, Dict, Optional
 import webbrowser
 
 try:
-    from pymongo import MongoClient
-    from pymongo.errors import ConnectionFailure
+    from pymongo import MongoClient, UpdateOne
+    from pymongo.errors import BulkWriteError, ConnectionFailure
     MONGODB_AVAILABLE = True
 except ImportError:
     MONGODB_AVAILABLE = False
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Number of queued label updates sent to MongoDB per bulk_write
+MONGO_BATCH_SIZE = 100
+
+# Signals shown per list in the detection panel
+MAX_DISPLAY_SIGNALS = 5
+
+
+def _json_dumps(obj, pretty: bool = False) -> bytes:
+    """Encode to UTF-8 JSON bytes, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+class LazyDetections:
+    """Read-only sequence of detections held as compact JSON, decoded on access"""
+    
+    def __init__(self, records: List[bytes]):
+        self._records = records
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def __getitem__(self, index: int) -> Dict:
+        return _json_loads(self._records[index])
+
+
+def load_detections(data_file: str) -> LazyDetections:
+    """
+    Load detections without keeping the parsed JSON tree resident
+    
+    Streams records with ijson when installed; otherwise parses the whole
+    file once and keeps only the compact per-record encoding.
+    """
+    with open(data_file, 'rb') as f:
+        head = f.read(64).lstrip()
+    
+    if IJSON_AVAILABLE:
+        prefix = 'results.item' if head.startswith(b'{') else 'item'
+        with open(data_file, 'rb') as f:
+            records = [_json_dumps(item) for item in ijson.items(f, prefix, use_float=True)]
+        return LazyDetections(records)
+    
+    with open(data_file, 'rb') as f:
+        data = _json_loads(f.read())
+    if isinstance(data, dict) and 'results' in data:
+        data = data['results']
+    return LazyDetections([_json_dumps(item) for item in data])
+
 
 class InteractiveValidator:
     def __init__(self, data_file: str, progress_file: str = None):
@@ -28,23 +99,31 @@ class InteractiveValidator:
         """
         self.data_file = data_file
         self.progress_file = progress_file or data_file.replace('.json', '_validated.json')
+        # Append-only log: one JSON line per label, consolidated into progress_file on save
+        self.progress_log = os.path.splitext(self.progress_file)[0] + '.jsonl'
         
         # Load detections
-        with open(data_file, 'r') as f:
-            data = json.load(f)
-            if isinstance(data, dict) and 'results' in data:
-                self.detections = data['results']
-            else:
-                self.detections = data
+        self.detections = load_detections(data_file)
         
         # Load existing progress if available
         self.validated = self._load_progress()
+        self._progress_fh = open(self.progress_log, 'ab')
         
-        self.current_index = len(self.validated)
-        self.stats = {'tp': 0, 'fp': 0, 'uncertain': 0, 'skipped': 0}
+        self.current_index = max(self.validated) + 1 if self.validated else 0
+        # Seed stats from resumed progress so precision estimates stay correct
+        label_counts = Counter(v.get('validation', {}).get('label') for v in self.validated.values())
+        self.stats = {
+            'tp': label_counts['true_positive'],
+            'fp': label_counts['false_positive'],
+            'uncertain': label_counts['uncertain'],
+            'skipped': label_counts['skipped']
+        }
+        self._render_cache: Dict[int, str] = {}
+        self._opened_urls = set()
         
         # Initialize MongoDB connection (optional)
         self.mongo_collection = None
+        self._pending_ops = {}  # video_id -> UpdateOne; a relabel replaces the queued op
         if MONGODB_AVAILABLE:
             self._init_mongodb()
         
@@ -63,87 +142,160 @@ class InteractiveValidator:
             print("   Validation labels will only be saved to JSON file")
             self.mongo_collection = None
     
-    def _load_progress(self) -> List[Dict]:
-        """Load existing validation progress"""
+    def _load_progress(self) -> Dict[int, Dict]:
+        """Load existing validation progress, keyed by detection index"""
+        if os.path.exists(self.progress_log):
+            validated = {}
+            with open(self.progress_log, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        entry = _json_loads(line)
+                        # Later lines win, so relabels after going back override
+                        validated[entry['index']] = entry['detection']
+            return validated
         if os.path.exists(self.progress_file):
-            with open(self.progress_file, 'r') as f:
-                return json.load(f)
-        return []
+            # Seed the append-only log from a previously consolidated file
+            with open(self.progress_file, 'rb') as f:
+                validated = dict(enumerate(_json_loads(f.read())))
+            self._rewrite_progress_log(validated)
+            return validated
+        return {}
+    
+    def _append_progress(self, index: int, validated_detection: Dict):
+        """Append a single label to the progress log"""
+        entry = {'index': index, 'detection': validated_detection}
+        self._progress_fh.write(_json_dumps(entry) + b'\n')
+        self._progress_fh.flush()
+    
+    def _rewrite_progress_log(self, validated: Dict[int, Dict]):
+        """Rewrite the progress log from scratch"""
+        with open(self.progress_log, 'wb') as f:
+            for index, item in validated.items():
+                f.write(_json_dumps({'index': index, 'detection': item}) + b'\n')
+    
+    def _validated_list(self) -> List[Dict]:
+        """Validated detections in detection order"""
+        return [self.validated[i] for i in sorted(self.validated)]
     
     def _save_progress(self):
-        """Auto-save progress to JSON and MongoDB"""
-        with open(self.progress_file, 'w') as f:
-            json.dump(self.validated, f, indent=2)
+        """Consolidate the progress log into the JSON results file"""
+        self._progress_fh.flush()
+        with open(self.progress_file, 'wb') as f:
+            f.write(_json_dumps(self._validated_list()))
         print(f"   💾 Progress saved to file ({len(self.validated)} validated)")
     
+    def export_pretty(self, output_file: str = None) -> str:
+        """Write an indented copy of the validated results for manual review"""
+        output_file = output_file or os.path.splitext(self.progress_file)[0] + '_pretty.json'
+        with open(output_file, 'wb') as f:
+            f.write(_json_dumps(self._validated_list(), pretty=True))
+        return output_file
+    
+    def _close_progress(self):
+        """Close the progress log handle"""
+        if not self._progress_fh.closed:
+            self._progress_fh.close()
+    
     def _sync_validation_to_mongodb(self, validated_detection: Dict) -> bool:
-        """Sync validation label to MongoDB"""
+        """Queue validation label for MongoDB, flushing in batches"""
         if self.mongo_collection is None:
             return False
         
-        try:
-            video_id = validated_detection.get('video_id')
-            validation = validated_detection.get('validation', {})
-            
-            # Update the detection record with validation info
-            result = self.mongo_collection.update_one(
-                {'video_id': video_id},
-                {
-                    '$set': {
-                        'validation': validation,
-                        'validated_at': validation.get('reviewed_at'),
-                        'ground_truth_label': validation.get('label'),
-                        'validation_reasoning': validation.get('reasoning'),
-                        'scam_type': validation.get('scam_type')
-                    }
+        video_id = validated_detection.get('video_id')
+        validation = validated_detection.get('validation', {})
+        
+        # Update the detection record with validation info
+        self._pending_ops[video_id] = UpdateOne(
+            {'video_id': video_id},
+            {
+                '$set': {
+                    'validation': validation,
+                    'validated_at': validation.get('reviewed_at'),
+                    'ground_truth_label': validation.get('label'),
+                    'validation_reasoning': validation.get('reasoning'),
+                    'scam_type': validation.get('scam_type')
                 }
-            )
-            
-            if result.modified_count > 0:
-                print(f"   ✅ Synced to MongoDB")
-                return True
-            else:
-                print(f"   ⚠️  MongoDB: Record not found for video {video_id[:12]}...")
-                return False
-                
+            }
+        )
+        
+        if len(self._pending_ops) >= MONGO_BATCH_SIZE:
+            return self._flush_mongo()
+        return True
+    
+    def _flush_mongo(self) -> bool:
+        """Send queued validation updates to MongoDB in one bulk_write"""
+        if self.mongo_collection is None or not self._pending_ops:
+            return False
+        
+        ops, self._pending_ops = list(self._pending_ops.values()), {}
+        try:
+            result = self.mongo_collection.bulk_write(ops, ordered=False)
+            print(f"   ✅ Synced {result.modified_count}/{len(ops)} labels to MongoDB")
+            if result.matched_count < len(ops):
+                print(f"   ⚠️  MongoDB: {len(ops) - result.matched_count} records not found")
+            return True
+        except BulkWriteError as e:
+            print(f"   ⚠️  MongoDB sync partially failed: {len(e.details.get('writeErrors', []))} errors")
+            return False
         except Exception as e:
             print(f"   ⚠️  MongoDB sync failed: {e}")
             return False
     
     def _display_detection(self, detection: Dict, index: int):
         """Display detection details"""
-        print("\n" + "="*80)
-        print(f"🔍 DETECTION #{index + 1} of {len(self.detections)}")
-        print("="*80)
-        
-        print(f"\n📺 VIDEO: {detection.get('video_title', 'N/A')}")
-        print(f"   URL: {detection.get('video_url', 'N/A')}")
-        
-        print(f"\n👤 CHANNEL: {detection.get('channel_title', 'N/A')}")
-        print(f"   URL: {detection.get('channel_url', 'N/A')}")
-        
-        print(f"\n⚠️  RISK SCORE: {detection.get('total_risk_score', 0):.1f} ({detection.get('risk_category', 'UNKNOWN')})")
-        print(f"   Confidence: {detection.get('confidence_score', 0):.2f}")
-        
-        print(f"\n🚩 TRIGGERED SIGNALS:")
-        video_signals = detection.get('video_signals', [])
-        channel_signals = detection.get('channel_signals', [])
-        
-        if video_signals:
-            print(f"   Video ({len(video_signals)}):")
-            for sig in video_signals[:5]:  # Show top 5
-                print(f"      • {sig}")
-            if len(video_signals) > 5:
-                print(f"      ... and {len(video_signals) - 5} more")
+        panel = self._render_cache.get(index)
+        if panel is None:
+            panel = self._render_cache[index] = self._render_detection(detection, index)
+        sys.stdout.write(panel)
+        sys.stdout.flush()
+    
+    def _render_detection(self, detection: Dict, index: int) -> str:
+        """Render detection details panel (cached per index for redisplay)"""
+        parts = [
+            "\n" + "="*80,
+            f"🔍 DETECTION #{index + 1} of {len(self.detections)}",
+            "="*80,
+            f"\n📺 VIDEO: {detection.get('video_title', 'N/A')}",
+            f"   URL: {detection.get('video_url', 'N/A')}",
+            f"\n👤 CHANNEL: {detection.get('channel_title', 'N/A')}",
+            f"   URL: {detection.get('channel_url', 'N/A')}",
+            f"\n⚠️  RISK SCORE: {detection.get('total_risk_score', 0):.1f} ({detection.get('risk_category', 'UNKNOWN')})",
+            f"   Confidence: {detection.get('confidence_score', 0):.2f}",
+            f"\n🚩 TRIGGERED SIGNALS:",
+        ]
+        for name, key in (('Video', 'video_signals'), ('Channel', 'channel_signals')):
+            signals = detection.get(key, [])
+            if not signals:
+                continue
+            total = len(signals)
+            parts.append(f"   {name} ({total}):")
+            parts.extend(f"      • {sig}" for sig in islice(signals, MAX_DISPLAY_SIGNALS))
+            if total > MAX_DISPLAY_SIGNALS:
+                parts.append(f"      ... and {total - MAX_DISPLAY_SIGNALS} more")
         
-        if channel_signals:
-            print(f"   Channel ({len(channel_signals)}):")
-            for sig in channel_signals[:5]:
-                print(f"      • {sig}")
-            if len(channel_signals) > 5:
-                print(f"      ... and {len(channel_signals) - 5} more")
+        parts.append("\n" + "-"*80)
+        return '\n'.join(parts) + '\n'
+    
+    def _open_urls(self, video_url: Optional[str], channel_url: Optional[str]):
+        """Open video/channel URLs in the browser without blocking the prompt"""
+        urls = []
+        for kind, url in (('video', video_url), ('channel', channel_url)):
+            if not url:
+                continue
+            if url in self._opened_urls:
+                print(f"   ↩️  Already opened {kind}: {url}")
+                continue
+            print(f"   🌐 Opening {kind}: {url}")
+            self._opened_urls.add(url)
+            urls.append(url)
         
-        print("\n" + "-"*80)
+        if urls:
+            threading.Thread(target=self._open_in_browser, args=(urls,), daemon=True).start()
+    
+    @staticmethod
+    def _open_in_browser(urls: List[str]):
+        for url in urls:
+            webbrowser.open(url)
     
     def _get_label(self) -> Optional[Dict]:
         """Get validation label from user"""
@@ -227,21 +379,25 @@ class InteractiveValidator:
         validated = len(self.validated)
         remaining = total - validated
         
-        print("\n" + "="*80)
-        print("📊 PROGRESS")
-        print("="*80)
-        print(f"   Validated: {validated}/{total} ({validated/total*100:.1f}%)")
-        print(f"   Remaining: {remaining}")
-        print(f"\n   True Positives:  {self.stats['tp']}")
-        print(f"   False Positives: {self.stats['fp']}")
-        print(f"   Uncertain:       {self.stats['uncertain']}")
-        print(f"   Skipped:         {self.stats['skipped']}")
+        parts = [
+            "\n" + "="*80,
+            "📊 PROGRESS",
+            "="*80,
+            f"   Validated: {validated}/{total} ({validated/total*100:.1f}%)",
+            f"   Remaining: {remaining}",
+            f"\n   True Positives:  {self.stats['tp']}",
+            f"   False Positives: {self.stats['fp']}",
+            f"   Uncertain:       {self.stats['uncertain']}",
+            f"   Skipped:         {self.stats['skipped']}",
+        ]
         
         if validated > 0:
             precision_est = self.stats['tp'] / (self.stats['tp'] + self.stats['fp']) if (self.stats['tp'] + self.stats['fp']) > 0 else 0
-            print(f"\n   Estimated Precision: {precision_est:.2%}")
+            parts.append(f"\n   Estimated Precision: {precision_est:.2%}")
         
-        print("="*80)
+        parts.append("="*80)
+        sys.stdout.write('\n'.join(parts) + '\n')
+        sys.stdout.flush()
     
     def validate(self):
         """Run interactive validation"""
@@ -264,36 +420,22 @@ class InteractiveValidator:
             # Handle special commands
             if label_result is None:
                 # Open URLs
-                video_url = detection.get('video_url')
-                channel_url = detection.get('channel_url')
-                if video_url:
-                    print(f"   🌐 Opening video: {video_url}")
-                    webbrowser.open(video_url)
-                if channel_url:
-                    print(f"   🌐 Opening channel: {channel_url}")
-                    webbrowser.open(channel_url)
+                self._open_urls(detection.get('video_url'), detection.get('channel_url'))
                 continue  # Re-display same detection
             
             if label_result['label'] == 'quit':
                 print("\n💾 Saving progress...")
                 self._save_progress()
+                self._close_progress()
+                self._flush_mongo()
                 self._show_progress()
                 print("\n👋 Validation paused. Run again to resume.")
                 return
             
             if label_result['label'] == 'back':
                 if self.current_index > 0:
+                    # Pointer move only; the earlier label is replaced if relabeled
                     self.current_index -= 1
-                    # Remove last validation
-                    if self.validated:
-                        removed = self.validated.pop()
-                        # Update stats
-                        if removed['validation']['label'] == 'true_positive':
-                            self.stats['tp'] -= 1
-                        elif removed['validation']['label'] == 'false_positive':
-                            self.stats['fp'] -= 1
-                        elif removed['validation']['label'] == 'uncertain':
-                            self.stats['uncertain'] -= 1
                     print("   ⏪ Moved back to previous detection")
                 else:
                     print("   ⚠️  Already at first detection")
@@ -306,21 +448,27 @@ class InteractiveValidator:
             # Save validation
             validated_detection = detection.copy()
             validated_detection['validation'] = label_result
-            self.validated.append(validated_detection)
+            previous = self.validated.get(self.current_index)
+            if previous is not None:
+                # Relabel after going back: retract the earlier label from stats
+                stat_key = {'true_positive': 'tp', 'false_positive': 'fp',
+                            'uncertain': 'uncertain'}.get(previous['validation']['label'])
+                if stat_key:
+                    self.stats[stat_key] -= 1
+            self.validated[self.current_index] = validated_detection
+            self._append_progress(self.current_index, validated_detection)
             
-            # Sync to MongoDB immediately
+            # Queue MongoDB sync (flushed in batches)
             self._sync_validation_to_mongodb(validated_detection)
             
-            # Auto-save every 5 detections
-            if len(self.validated) % 5 == 0:
-                self._save_progress()
-            
             self.current_index += 1
             
             print("   ✅ Labeled successfully!")
         
         # Final save
         self._save_progress()
+        self._close_progress()
+        self._flush_mongo()
         self._show_progress()
         
         print("\n" + "="*80)
@@ -332,9 +480,29 @@ class InteractiveValidator:
         # Export to CSV
         self._export_to_csv()
     
+    @staticmethod
+    def _csv_row(item: Dict) -> tuple:
+        """Flatten one validated detection into a CSV row"""
+        val = item.get('validation', {})
+        return (
+            item.get('video_id'),
+            item.get('channel_id'),
+            item.get('video_title'),
+            item.get('channel_title'),
+            item.get('total_risk_score'),
+            item.get('risk_category'),
+            val.get('label'),
+            val.get('scam_type', ''),
+            val.get('reasoning', ''),
+            val.get('reviewed_at', ''),
+            val.get('reviewer', ''),
+            item.get('video_url'),
+            item.get('channel_url')
+        )
+    
     def _export_to_csv(self):
         """Export validated results to CSV"""
-        csv_file = self.progress_file.replace('.json', '.csv')
+        csv_file = os.path.splitext(self.progress_file)[0] + '.csv'
         
         with open(csv_file, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
@@ -355,23 +523,7 @@ class InteractiveValidator:
                 'channel_url'
             ])
             
-            for item in self.validated:
-                val = item.get('validation', {})
-                writer.writerow([
-                    item.get('video_id'),
-                    item.get('channel_id'),
-                    item.get('video_title'),
-                    item.get('channel_title'),
-                    item.get('total_risk_score'),
-                    item.get('risk_category'),
-                    val.get('label'),
-                    val.get('scam_type', ''),
-                    val.get('reasoning', ''),
-                    val.get('reviewed_at', ''),
-                    val.get('reviewer', ''),
-                    item.get('video_url'),
-                    item.get('channel_url')
-                ])
+            writer.writerows(self._csv_row(item) for item in self._validated_list())
         
         print(f"\n📊 CSV exported to: {csv_file}")
 
@@ -399,8 +551,17 @@ def main():
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user")
         validator._save_progress()
+        validator._close_progress()
+        validator._flush_mongo()
         validator._show_progress()
         print("💾 Progress saved. Run again to resume.")
+    finally:
+        # Any other exit (EOFError from input(), Mongo or render errors) skips
+        # the in-loop saves; still persist progress and send queued labels
+        if not validator._progress_fh.closed:
+            validator._save_progress()
+            validator._close_progress()
+        validator._flush_mongo()
 
 
 if __name__ == "__main__":
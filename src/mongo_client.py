@@ -0,0 +1,33 @@
+"""
+Shared MongoDB connection helpers
+Wire-compressor detection and a lazily created process-wide client
+"""
+
+import os
+from pymongo import MongoClient
+
+# Wire compressors in preference order; zstd/snappy need optional packages,
+# zlib ships with Python so there is always a fallback
+try:
+    import zstandard  # noqa: F401
+    _ZSTD = ['zstd']
+except ImportError:
+    _ZSTD = []
+try:
+    import snappy  # noqa: F401
+    _SNAPPY = ['snappy']
+except ImportError:
+    _SNAPPY = []
+MONGO_COMPRESSORS = ','.join(_ZSTD + _SNAPPY + ['zlib'])
+
+# Lazily created client shared by every MongoDB path in this process
+_client = None
+
+
+def get_client() -> MongoClient:
+    """Return the process-wide MongoClient, connecting on first use"""
+    global _client
+    if _client is None:
+        conn_str = os.environ.get('MONGODB_URI', 'mongodb://localhost:27017/')
+        _client = MongoClient(conn_str, serverSelectionTimeoutMS=5000, compressors=MONGO_COMPRESSORS)
+    return _client
@@ -2,33 +2,50 @@
 Query MongoDB for specific video detection details
 """
 import sys
-from pymongo import MongoClient
+from pymongo import ASCENDING
+from pymongo.errors import OperationFailure
 import json
 from dotenv import load_dotenv
-import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from mongo_client import get_client
 
 load_dotenv()
 
+_index_ensured = False
+
+# Only the fields printed by this tool are sent over the wire
+DETAIL_PROJECTION = {
+    '_id': 0,
+    'video_id': 1,
+    'video_title': 1,
+    'channel_title': 1,
+    'total_risk_score': 1,
+    'risk_category': 1,
+    'video_signals': 1,
+    'channel_signals': 1,
+    'validation': 1
+}
+
+def _get_collection():
+    global _index_ensured
+    collection = get_client()['streamjacking']['detection_results_v3']
+    if not _index_ensured:
+        # Point lookups by video_id should never fall back to a collection scan
+        try:
+            collection.create_index([('video_id', ASCENDING)])
+        except OperationFailure:
+            pass  # Already indexed (e.g. the detector's unique video_id index)
+        _index_ensured = True
+    return collection
+
 def get_video_details(video_id):
     try:
-        conn_str = os.environ.get('MONGODB_URI', 'mongodb://localhost:27017/')
-        client = MongoClient(conn_str, serverSelectionTimeoutMS=5000)
-        client.admin.command('ping')
-        
-        db = client['streamjacking']
-        collection = db['detection_results_v3']
-        
-        doc = collection.find_one({'video_id': video_id})
-        
-        client.close()
-        
-        if doc:
-            # Remove MongoDB _id for cleaner output
-            if '_id' in doc:
-                doc['_id'] = str(doc['_id'])
-            return doc
-        else:
-            return None
+        return _get_collection().find_one({'video_id': video_id}, projection=DETAIL_PROJECTION)
             
     except Exception as e:
         print(f"Error: {e}")
@@ -40,6 +57,9 @@ if __name__ == '__main__':
     result = get_video_details(video_id)
     
     if result:
-        print(json.dumps(result, indent=2))
+        if orjson is not None:
+            print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode('utf-8'))
+        else:
+            print(json.dumps(result, indent=2))
     else:
         print(f"Video {video_id} not found in database")
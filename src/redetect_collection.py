@@ -7,11 +7,26 @@ import os
 import sys
 import json
 import time
-from typing import Dict, List, Optional, Tuple
+import asyncio
+import logging
+import logging.handlers
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from collections import deque
+from itertools import islice
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from mongo_client import MONGO_COMPRESSORS
+
 # Import detector classes
 from youtube_streamjacking_detector_enhanced import (
     EnhancedYouTubeAPIClient,
@@ -22,6 +37,93 @@ from youtube_streamjacking_detector_enhanced import (
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+def setup_logging(level: int = logging.INFO):
+    """Send log output to stdout through a MemoryHandler so routine progress is written in batches"""
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    # Warnings and errors flush the buffer immediately
+    buffered = logging.handlers.MemoryHandler(capacity=100, flushLevel=logging.WARNING,
+                                              target=stream_handler)
+    logger.addHandler(buffered)
+    logger.setLevel(level)
+    logger.propagate = False
+
+# Per-process detector for the video-analysis pool
+_worker_detector: Optional[EnhancedStreamJackingDetector] = None
+
+
+def _init_detection_worker():
+    """Build the worker's detector; workers never call the API or load CryptoBERT
+    (see _analyze_prefetched_videos)"""
+    global _worker_detector
+    _worker_detector = EnhancedStreamJackingDetector(None)
+    _worker_detector.bert_signal = None
+
+
+def _analyze_video_worker(video_meta: EnhancedVideoMetadata) -> EnhancedVideoMetadata:
+    """Run the CPU-bound video analysis in a pool process"""
+    return _worker_detector.analyze_video_enhanced(video_meta)
+
+class TokenBucket:
+    """Proactive rate limiter: sleeps only as long as needed to stay under `rate` calls/sec"""
+    
+    def __init__(self, rate: float = 10, capacity: float = 10):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, waiting for a refill if the bucket is empty"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            # Tokens may go negative; the deficit is paid off by this wait
+            self.tokens -= 1
+        if wait:
+            time.sleep(wait)
+
+
+class AdaptiveBatchSizer:
+    """Halves the batch under rate-limit pressure and grows it back once fetches are steady"""
+    
+    def __init__(self, max_size: int, min_size: int = 10, step: int = 10,
+                 error_threshold: float = 0.05, stable_batches: int = 5, window: int = 100):
+        self.max_size = max_size
+        self.min_size = min(min_size, max_size)
+        self.step = step
+        self.error_threshold = error_threshold
+        self.stable_batches = stable_batches
+        self.size = max_size
+        self._latencies = deque(maxlen=window)
+        self._rate_limited = deque(maxlen=window)
+        self._stable = 0
+    
+    def record(self, latency: float, rate_limited: bool):
+        """Record one batch API call and adjust the batch size"""
+        mean_latency = sum(self._latencies) / len(self._latencies) if self._latencies else latency
+        self._latencies.append(latency)
+        self._rate_limited.append(rate_limited)
+        error_rate = sum(self._rate_limited) / len(self._rate_limited)
+        
+        if rate_limited and error_rate > self.error_threshold:
+            self.size = max(self.min_size, self.size // 2)
+            self._stable = 0
+        elif not rate_limited and latency <= 1.5 * mean_latency:
+            self._stable += 1
+            if self._stable >= self.stable_batches:
+                self.size = min(self.max_size, self.size + self.step)
+                self._stable = 0
+        else:
+            self._stable = 0
+
+
 class RedetectionManager:
     """Manages re-detection of videos in MongoDB collection"""
     
@@ -34,10 +136,19 @@ class RedetectionManager:
         self.detector = EnhancedStreamJackingDetector(self.api_client)
         self.max_quota_usage = max_quota_usage
         self.checkpoint_file = checkpoint_file
+        self.rate_limiter = TokenBucket(rate=10, capacity=10)
+        self.batch_sizer = AdaptiveBatchSizer(max_size=50)
         
         # Connect to MongoDB
         conn_str = os.environ.get('MONGODB_URI', 'mongodb://localhost:27017/')
-        self.client = MongoClient(conn_str, serverSelectionTimeoutMS=5000)
+        self.client = MongoClient(
+            conn_str,
+            serverSelectionTimeoutMS=5000,
+            maxPoolSize=16,
+            minPoolSize=2,
+            waitQueueTimeoutMS=5000,
+            compressors=MONGO_COMPRESSORS
+        )
         self.db = self.client['streamjacking']
         self.collection = self.db[collection_name]
         
@@ -47,14 +158,44 @@ class RedetectionManager:
         # Track skipped videos
         self.skipped_videos = []
         
+        # Video metadata prefetched for the current cursor batch (None = not returned by API)
+        self._prefetched_videos: Dict[str, Optional[EnhancedVideoMetadata]] = {}
+        # Channels looked up by the current batch prefetch, not yet charged to a doc
+        self._prefetched_channels: Set[str] = set()
+        
+        # Channel metadata shared across batches: channel_id -> (fetched_at, meta or None).
+        # Channels hosting many videos are fetched and analyzed once per TTL
+        self._channel_cache: Dict[str, Tuple[float, Optional[EnhancedChannelMetadata]]] = {}
+        self._analyzed_channel_ids: Set[str] = set()
+        
+        # Video analyses computed in the process pool for the current batch
+        self._analyzed_videos: Dict[str, EnhancedVideoMetadata] = {}
+        self._detection_pool: Optional[ProcessPoolExecutor] = None
+        
+        # Checkpoint writes run on one background worker; saves requested while
+        # a write is in flight are coalesced into the next one (or the final flush)
+        self._checkpoint_executor = ThreadPoolExecutor(max_workers=1)
+        self._checkpoint_future: Optional[Future] = None
+        self._checkpoint_dirty = False
+        
+    # Checkpoint keys held as sets in memory and sorted lists on disk
+    CHECKPOINT_ID_SETS = ('processed_video_ids', 'skipped_video_ids')
+    
+    # Channel cache bounds (oldest evicted first; entries refetched after the TTL)
+    CHANNEL_CACHE_SIZE = 2048
+    CHANNEL_CACHE_TTL = 6 * 3600
+    
     def _load_checkpoint(self) -> Dict:
         """Load checkpoint from file"""
         if os.path.exists(self.checkpoint_file):
-            with open(self.checkpoint_file, 'r') as f:
-                return json.load(f)
+            with open(self.checkpoint_file, 'rb') as f:
+                checkpoint = orjson.loads(f.read()) if orjson else json.load(f)
+            for key in self.CHECKPOINT_ID_SETS:
+                checkpoint[key] = set(checkpoint.get(key, []))
+            return checkpoint
         return {
-            'processed_video_ids': [],
-            'skipped_video_ids': [],
+            'processed_video_ids': set(),
+            'skipped_video_ids': set(),
             'last_processed_index': 0,
             'total_processed': 0,
             'total_skipped': 0,
@@ -63,126 +204,309 @@ class RedetectionManager:
             'last_updated': None
         }
     
-    def _save_checkpoint(self):
-        """Save checkpoint to file"""
+    def _save_checkpoint(self, wait: bool = False):
+        """Save checkpoint to file in the background, or synchronously if wait=True"""
         self.checkpoint['last_updated'] = datetime.now().isoformat()
-        with open(self.checkpoint_file, 'w') as f:
-            json.dump(self.checkpoint, f, indent=2)
+        pending = self._checkpoint_future
+        if not wait and pending is not None and not pending.done():
+            self._checkpoint_dirty = True
+            return
+        if pending is not None:
+            pending.result()  # surface errors from the previous write
+        # Copy the id sets here so the worker never sees them mid-update
+        snapshot = dict(self.checkpoint)
+        for key in self.CHECKPOINT_ID_SETS:
+            snapshot[key] = list(self.checkpoint[key])
+        self._checkpoint_dirty = False
+        if wait:
+            self._checkpoint_future = None
+            self._write_checkpoint(snapshot)
+        else:
+            self._checkpoint_future = self._checkpoint_executor.submit(self._write_checkpoint, snapshot)
     
-    def _create_video_metadata_from_cache(self, doc: Dict) -> Optional[EnhancedVideoMetadata]:
-        """Create video metadata object from cached MongoDB data"""
-        try:
-            return EnhancedVideoMetadata(
-                video_id=doc.get('video_id', ''),
-                title=doc.get('video_title', ''),
-                description=doc.get('video_description', ''),
-                channel_id=doc.get('channel_id', ''),
-                channel_title=doc.get('channel_title', ''),
-                published_at=doc.get('published_at', ''),
-                is_live=doc.get('is_live', False),
-                live_streaming_details=doc.get('live_streaming_details'),
-                view_count=doc.get('view_count', 0),
-                like_count=doc.get('like_count', 0),
-                comment_count=doc.get('comment_count', 0),
-                tags=doc.get('tags', []),
-                comments_disabled=doc.get('comments_disabled', False),
-                live_chat_id=doc.get('live_chat_id'),
-                default_language=doc.get('default_language')
-            )
-        except Exception as e:
-            print(f"   ⚠️  Error creating video metadata from cache: {e}")
-            return None
+    def _write_checkpoint(self, snapshot: Dict):
+        """Write a checkpoint snapshot atomically via a temp file and os.replace"""
+        for key in self.CHECKPOINT_ID_SETS:
+            snapshot[key].sort()
+        tmp_file = f"{self.checkpoint_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            if orjson:
+                f.write(orjson.dumps(snapshot, option=orjson.OPT_INDENT_2))
+            else:
+                f.write(json.dumps(snapshot, indent=2).encode('utf-8'))
+        os.replace(tmp_file, self.checkpoint_file)
     
-    def _create_channel_metadata_from_cache(self, doc: Dict) -> Optional[EnhancedChannelMetadata]:
-        """Create channel metadata object from cached MongoDB data"""
+    def _prefetch_metadata(self, docs: List[Dict]):
+        """Fetch fresh metadata for a whole cursor batch with multi-id API calls"""
+        self._prefetched_videos = {}
+        self._prefetched_channels = set()
+        
+        video_ids = list(dict.fromkeys(d['video_id'] for d in docs if d.get('video_id')))
+        # Unique channels only, minus any still fresh in the channel cache
+        channel_ids = [cid for cid in dict.fromkeys(d['channel_id'] for d in docs if d.get('channel_id'))
+                       if not self._get_cached_channel(cid)[0]]
+        per_call = EnhancedYouTubeAPIClient.MAX_IDS_PER_REQUEST
+        
+        # Each list call costs 5 units regardless of how many ids it carries
+        video_cost = 5 * -(-len(video_ids) // per_call)
+        channel_cost = 5 * -(-len(channel_ids) // per_call)
+        budget = self.max_quota_usage - self.api_client.quota_used
+        fetch_videos = bool(video_ids) and video_cost <= budget
+        fetch_channels = bool(channel_ids) and video_cost * fetch_videos + channel_cost <= budget
+        
+        videos, channels = asyncio.run(self._fetch_batches_async(
+            video_ids if fetch_videos else [],
+            channel_ids if fetch_channels else []
+        ))
+        
+        if fetch_videos:
+            self._prefetched_videos = {vid: videos.get(vid) for vid in video_ids}
+            logger.info(f"\n   ✓ Batch-fetched {len(videos)}/{len(video_ids)} videos (quota: {self.api_client.quota_used})")
+        if fetch_channels:
+            for cid, meta in channels.items():
+                self._cache_channel(cid, meta)
+            # An empty response most likely means the call failed, so don't cache misses then
+            if channels:
+                self._prefetched_channels = set(channel_ids)
+                for cid in channel_ids:
+                    if cid not in channels:
+                        self._cache_channel(cid, None)
+            logger.info(f"   ✓ Batch-fetched {len(channels)}/{len(channel_ids)} channels (quota: {self.api_client.quota_used})")
+    
+    async def _fetch_batches_async(self, video_ids: List[str], channel_ids: List[str]) -> Tuple[Dict, Dict]:
+        """Issue the video and channel batch requests concurrently"""
+        def call(method, ids):
+            # Runs on the worker thread: a rate-limit wait must not block the event loop,
+            # and the client's per-thread keep-alive transport is used for the request
+            self.rate_limiter.acquire()
+            started = time.monotonic()
+            return method(ids), time.monotonic() - started
+        
+        async def fetch(method, ids):
+            if not ids:
+                return {}
+            rate_limited_before = self.api_client.rate_limited_calls
+            result, elapsed = await asyncio.to_thread(call, method, ids)
+            self.batch_sizer.record(elapsed, self.api_client.rate_limited_calls > rate_limited_before)
+            return result
+        
+        return tuple(await asyncio.gather(
+            fetch(self.api_client.get_videos_metadata_batch, video_ids),
+            fetch(self.api_client.get_channels_metadata_batch, channel_ids)
+        ))
+    
+    def _analyze_prefetched_videos(self):
+        """Analyze the prefetched videos of a batch in parallel across processes"""
+        self._analyzed_videos = {}
+        # With the CryptoBERT model present, every video stays in this process: one model
+        # copy per worker would multiply its memory, and a forked child cannot use CUDA
+        bert_signal = self.detector.bert_signal
+        if bert_signal is not None and bert_signal.is_available():
+            return
+        
+        # Live videos with chat need the API client, so they stay in this process;
+        # videos without a description are skipped by the quality check anyway
+        metas = [meta for meta in self._prefetched_videos.values()
+                 if meta and meta.description and not (meta.live_chat_id and meta.is_live)]
+        if not metas:
+            return
+        
+        if self._detection_pool is None:
+            self._detection_pool = ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                                       initializer=_init_detection_worker)
+        chunksize = max(1, len(metas) // ((os.cpu_count() or 1) * 4))
         try:
-            return EnhancedChannelMetadata(
-                channel_id=doc.get('channel_id', ''),
-                channel_title=doc.get('channel_title', ''),
-                custom_url=doc.get('channel_custom_url'),
-                handle=doc.get('channel_handle'),
-                description=doc.get('channel_description', ''),
-                subscriber_count=doc.get('subscriber_count', 0),
-                video_count=doc.get('video_count', 0),
-                view_count=doc.get('channel_view_count', 0),
-                published_at=doc.get('channel_published_at', ''),
-                country=doc.get('country'),
-                thumbnail_url=doc.get('channel_thumbnail_url', ''),
-                topic_categories=doc.get('topic_categories', []),
-                branding_settings=doc.get('branding_settings', {}),
-                hidden_subscriber_count=doc.get('hidden_subscriber_count', False),
-                default_language=doc.get('channel_default_language')
-            )
+            analyzed = self._detection_pool.map(_analyze_video_worker, metas, chunksize=chunksize)
+            self._analyzed_videos = {meta.video_id: result for meta, result in zip(metas, analyzed)}
         except Exception as e:
-            print(f"   ⚠️  Error creating channel metadata from cache: {e}")
-            return None
+            # Fall back to analyzing inline in redetect_video
+            logger.warning(f"   ⚠️  Parallel analysis failed, continuing serially: {e}")
+            self._analyzed_videos = {}
+    
+    def _get_cached_channel(self, channel_id: str) -> Tuple[bool, Optional[EnhancedChannelMetadata]]:
+        """Look up a channel in the cache, returning (hit, meta) and dropping expired entries"""
+        entry = self._channel_cache.get(channel_id)
+        if entry is None:
+            return False, None
+        if time.monotonic() - entry[0] > self.CHANNEL_CACHE_TTL:
+            del self._channel_cache[channel_id]
+            self._analyzed_channel_ids.discard(channel_id)
+            return False, None
+        return True, entry[1]
+    
+    def _cache_channel(self, channel_id: str, channel_meta: Optional[EnhancedChannelMetadata]):
+        """Store fetched channel metadata, evicting the oldest entry when full"""
+        if channel_id not in self._channel_cache and len(self._channel_cache) >= self.CHANNEL_CACHE_SIZE:
+            evicted = next(iter(self._channel_cache))
+            del self._channel_cache[evicted]
+            self._analyzed_channel_ids.discard(evicted)
+        self._channel_cache[channel_id] = (time.monotonic(), channel_meta)
+    
+    def _is_prefetched(self, video_id: str, channel_id: str) -> bool:
+        """Whether the batch prefetch and channel cache already cover this video and channel"""
+        return video_id in self._prefetched_videos and self._get_cached_channel(channel_id)[0]
+    
+    def _fetch_cost(self, video_id: str, channel_id: str, quota_before: int) -> int:
+        """Integer quota units spent on a doc: 1 per video or channel lookup served by the
+        batch prefetch (a channel is charged to the first doc that uses it) plus the units
+        actually charged for calls made for this doc alone"""
+        cost = self.api_client.quota_used - quota_before
+        if video_id in self._prefetched_videos:
+            cost += 1
+        if channel_id in self._prefetched_channels:
+            self._prefetched_channels.discard(channel_id)
+            cost += 1
+        return cost
     
     def _fetch_fresh_metadata(self, video_id: str, channel_id: str) -> Tuple[Optional[EnhancedVideoMetadata], Optional[EnhancedChannelMetadata]]:
         """Attempt to fetch fresh metadata from YouTube API"""
         video_meta = None
         channel_meta = None
         
+        # Served from the batch prefetch / channel cache when available
+        channel_hit, cached_channel = self._get_cached_channel(channel_id)
+        video_prefetched = video_id in self._prefetched_videos
+        if channel_hit and video_prefetched:
+            return self._prefetched_videos[video_id], cached_channel
+        
         # Check quota before making calls
         if self.api_client.quota_used >= self.max_quota_usage:
             return None, None
         
         try:
-            # Fetch video metadata (1 unit)
-            video_meta = self.api_client.get_video_metadata(video_id)
-            if video_meta:
-                print(f"      ✓ Fresh video metadata fetched (quota: {self.api_client.quota_used})")
+            # Fetch video metadata (1 unit) unless the batch prefetch already has it
+            if video_prefetched:
+                video_meta = self._prefetched_videos[video_id]
+            else:
+                self.rate_limiter.acquire()
+                video_meta = self.api_client.get_video_metadata(video_id)
+                if video_meta:
+                    logger.debug(f"      ✓ Fresh video metadata fetched (quota: {self.api_client.quota_used})")
             
             # Fetch channel metadata (1 unit)
-            if self.api_client.quota_used < self.max_quota_usage:
+            if channel_hit:
+                channel_meta = cached_channel
+            elif self.api_client.quota_used < self.max_quota_usage:
+                self.rate_limiter.acquire()
                 channel_meta = self.api_client.get_channel_metadata(channel_id)
                 if channel_meta:
-                    print(f"      ✓ Fresh channel metadata fetched (quota: {self.api_client.quota_used})")
-            
-            time.sleep(0.5)  # Rate limiting
+                    self._cache_channel(channel_id, channel_meta)
+                    logger.debug(f"      ✓ Fresh channel metadata fetched (quota: {self.api_client.quota_used})")
             
         except Exception as e:
-            print(f"      ⚠️  API error: {e}")
+            logger.warning(f"      ⚠️  API error: {e}")
         
         return video_meta, channel_meta
     
+    def _analyze_channel(self, channel_meta: EnhancedChannelMetadata) -> EnhancedChannelMetadata:
+        """Run channel analysis once per cached channel and reuse the result
+        
+        Analysis annotates the cached metadata object in place, so an analyzed
+        channel is just its cache entry.
+        """
+        if channel_meta.channel_id in self._analyzed_channel_ids:
+            return channel_meta
+        
+        analyzed = self.detector.analyze_channel_enhanced(channel_meta)
+        if channel_meta.channel_id in self._channel_cache:
+            self._analyzed_channel_ids.add(channel_meta.channel_id)
+        return analyzed
+    
     def _validate_metadata_quality(self, video_meta: EnhancedVideoMetadata, channel_meta: Optional[EnhancedChannelMetadata]) -> bool:
         """Validate that metadata has critical fields for accurate detection"""
         # Critical fields that must be present for accurate detection
         if not video_meta.description:
-            print(f"      ⚠️  Missing video description (critical for scam detection)")
+            logger.warning(f"      ⚠️  Missing video description (critical for scam detection)")
             return False
         
         if channel_meta and not channel_meta.description:
-            print(f"      ⚠️  Missing channel description")
+            logger.debug(f"      ⚠️  Missing channel description")
             # Not critical, but log it
         
         return True
     
-    def redetect_video(self, doc: Dict, fresh_api_only: bool = True) -> Dict:
-        """Re-run detection on a single video using only fresh API data"""
+    def _pending_query(self) -> Dict:
+        """Documents not yet redetected or skipped in this checkpoint's session
+        
+        Markers are compared against the session start, so a fresh checkpoint picks up
+        every document again without rewriting the collection.
+        """
+        session = self.checkpoint['started_at']
+        return {'redetected_at': {'$not': {'$gte': session}},
+                'redetection_skipped': {'$ne': session}}
+    
+    def _flush_updates(self, pending_updates: List[UpdateOne], pending_ids: List[str],
+                       pending_skips: List[str], dry_run: bool) -> int:
+        """Write queued updates and skip markers in one bulk_write, then checkpoint"""
+        if not pending_ids and not pending_skips:
+            return 0
+        
+        ops = list(pending_updates)
+        if pending_skips:
+            ops.append(UpdateMany({'video_id': {'$in': pending_skips}},
+                                  {'$set': {'redetection_skipped': self.checkpoint['started_at']}}))
+        
+        failed_indexes = set()
+        if not dry_run:
+            try:
+                self.collection.bulk_write(ops, ordered=False)
+            except BulkWriteError as e:
+                for err in e.details.get('writeErrors', []):
+                    failed_indexes.add(err['index'])
+                    target = pending_ids[err['index']] if err['index'] < len(pending_ids) else 'skip markers'
+                    logger.error(f"    ❌ Write failed for {target}: {err.get('errmsg')}")
+            except PyMongoError as e:
+                # Connection-level failure: nothing in the batch is known to be written,
+                # so leave it out of the checkpoint and let the next session retry it
+                failed_indexes.update(range(len(pending_ids)))
+                logger.error(f"    ❌ Bulk write of {len(pending_ids)} updates failed, will retry next session: {e}")
+        
+        written = [vid for i, vid in enumerate(pending_ids) if i not in failed_indexes]
+        self.checkpoint['processed_video_ids'].update(written)
+        self.checkpoint['total_processed'] += len(written)
+        self.checkpoint['quota_used'] = self.api_client.quota_used
+        self._save_checkpoint()
+        logger.info(f"\n    💾 Wrote {len(written)} updates, checkpoint saved ({self.checkpoint['total_processed']} processed, {self.checkpoint.get('total_skipped', 0)} skipped)")
+        
+        pending_updates.clear()
+        pending_ids.clear()
+        pending_skips.clear()
+        return len(written)
+    
+    def redetect_video(self, doc: Dict, fresh_api_only: bool = True,
+                       batch_ts: Optional[str] = None) -> Tuple[Optional[Dict], Optional[str]]:
+        """Re-run detection on a single video using only fresh API data
+        
+        Returns (update_doc, None) on success or (None, skip_reason) for expected
+        skips; genuine failures still raise.
+        """
         video_id = doc.get('video_id')
         channel_id = doc.get('channel_id')
+        # Quota charged for calls made for this doc alone (single-id fetches, channel analysis)
+        quota_before = self.api_client.quota_used
         
-        # Check quota availability
-        if self.api_client.quota_used >= self.max_quota_usage:
-            raise Exception(f"Quota exhausted ({self.api_client.quota_used}/{self.max_quota_usage})")
+        # Check quota availability (prefetched metadata is already paid for)
+        if not self._is_prefetched(video_id, channel_id) and self.api_client.quota_used >= self.max_quota_usage:
+            return None, f"Quota exhausted ({self.api_client.quota_used}/{self.max_quota_usage})"
         
         # Fetch fresh metadata (required)
         video_meta, channel_meta = self._fetch_fresh_metadata(video_id, channel_id)
         
         if not video_meta:
-            raise Exception("Fresh API data unavailable - skipping video")
+            return None, "Fresh API data unavailable - skipping video"
         
         # Validate metadata quality
         if not self._validate_metadata_quality(video_meta, channel_meta):
-            raise Exception("Insufficient metadata quality - description missing")
+            return None, "Insufficient metadata quality - description missing"
         
-        # Run enhanced detection
-        video_analyzed = self.detector.analyze_video_enhanced(video_meta)
+        # Run enhanced detection (video analysis usually done by the process pool)
+        video_analyzed = self._analyzed_videos.pop(video_id, None)
+        if video_analyzed is None:
+            video_analyzed = self.detector.analyze_video_enhanced(video_meta)
         
         channel_analyzed = None
         if channel_meta:
-            channel_analyzed = self.detector.analyze_channel_enhanced(channel_meta)
+            channel_analyzed = self._analyze_channel(channel_meta)
         
         # Apply composite rules
         composite_result = self.detector.apply_composite_rules(video_analyzed, channel_analyzed)
@@ -194,175 +518,197 @@ class RedetectionManager:
             'risk_category': composite_result['risk_category'],
             'confidence_score': composite_result['confidence_score'],
             'total_risk_score': composite_result['total_risk_score'],
-            'redetected_at': datetime.now().isoformat(),
-            'redetection_quota_used': self.api_client.quota_used - self.checkpoint['quota_used']
+            'redetected_at': batch_ts or datetime.now().isoformat(),
+            'redetection_quota_used': self._fetch_cost(video_id, channel_id, quota_before)
         }
         
         if channel_analyzed:
             update_doc['channel_risk_score'] = channel_analyzed.risk_score
             update_doc['channel_signals'] = channel_analyzed.suspicious_signals
         
-        return update_doc
+        return update_doc, None
     
     def run_redetection(self, 
                        batch_size: int = 50,
                        dry_run: bool = False):
         """Run re-detection using ONLY fresh API data (no cache fallback)"""
         
-        print("=" * 70)
-        print("STREAMJACKING DETECTOR - FRESH API RE-DETECTION")
-        print("=" * 70)
-        print()
-        print("🔒 MODE: Fresh API Only (no cached data fallback)")
-        print("   This ensures complete metadata including descriptions")
-        print()
-        
-        # Get total count
-        total_videos = self.collection.count_documents({})
-        print(f"📊 Total videos in collection: {total_videos}")
-        print(f"📊 Already processed: {len(self.checkpoint['processed_video_ids'])}")
-        print(f"📊 Previously skipped: {len(self.checkpoint.get('skipped_video_ids', []))}")
-        print(f"📊 Remaining: {total_videos - len(self.checkpoint['processed_video_ids']) - len(self.checkpoint.get('skipped_video_ids', []))}")
-        print(f"⚡ Quota budget: {self.max_quota_usage} units")
-        print(f"⚡ Quota already used: {self.checkpoint['quota_used']} units")
-        print(f"⚡ Estimated videos processable: ~{(self.max_quota_usage - self.checkpoint['quota_used']) // 2}")
-        print()
-        
-        if dry_run:
-            print("🔍 DRY RUN MODE - No changes will be saved")
-            print()
+        logger.info("=" * 70)
+        logger.info("STREAMJACKING DETECTOR - FRESH API RE-DETECTION")
+        logger.info("=" * 70)
+        logger.info('')
+        logger.info("🔒 MODE: Fresh API Only (no cached data fallback)")
+        logger.info("   This ensures complete metadata including descriptions")
+        logger.info('')
         
-        # Initialize checkpoint if first run
+        # Initialize checkpoint if first run; its start time scopes the redetection markers
         if not self.checkpoint['started_at']:
             self.checkpoint['started_at'] = datetime.now().isoformat()
         
-        # Query videos not yet processed or skipped
-        processed_ids = set(self.checkpoint['processed_video_ids'])
-        skipped_ids = set(self.checkpoint.get('skipped_video_ids', []))
-        excluded_ids = list(processed_ids | skipped_ids)
-        query = {'video_id': {'$nin': excluded_ids}} if excluded_ids else {}
+        # Query videos not yet processed or skipped (indexed markers written back per batch)
+        query = self._pending_query()
+        if not dry_run:
+            self.collection.create_index('redetected_at')
+            self.collection.create_index('redetection_skipped')
+        
+        # Total comes from collection metadata; remaining is counted server-side on the marker index
+        total_videos = self.collection.estimated_document_count()
+        remaining = next(self.collection.aggregate([{'$match': query}, {'$count': 'n'}]), {}).get('n', 0)
+        logger.info(f"📊 Total videos in collection: ~{total_videos}")
+        logger.info(f"📊 Already processed: {len(self.checkpoint['processed_video_ids'])}")
+        logger.info(f"📊 Previously skipped: {len(self.checkpoint['skipped_video_ids'])}")
+        logger.info(f"📊 Remaining: {remaining}")
+        logger.info(f"⚡ Quota budget: {self.max_quota_usage} units")
+        logger.info(f"⚡ Quota already used: {self.checkpoint['quota_used']} units")
+        logger.info(f"⚡ Estimated videos processable: ~{(self.max_quota_usage - self.checkpoint['quota_used']) // 2}")
+        logger.info('')
+        
+        if dry_run:
+            logger.info("🔍 DRY RUN MODE - No changes will be saved")
+            logger.info('')
         
-        cursor = self.collection.find(query).batch_size(batch_size)
+        # Fresh API data replaces cached fields, so only identifiers and log fields are read
+        projection = {'video_id': 1, 'channel_id': 1, 'channel_title': 1,
+                      'video_title': 1, 'risk_category': 1, '_id': 0}
+        cursor = self.collection.find(query, projection=projection).batch_size(batch_size)
         
         batch_count = 0
         success_count = 0
         skipped_count = 0
         error_count = 0
         quota_exhausted = False
-        
-        for doc in cursor:
-            video_id = doc.get('video_id')
-            channel_title = doc.get('channel_title', 'Unknown')
-            video_title = doc.get('video_title', 'Unknown')
-            
-            batch_count += 1
-            
-            print(f"\n[{batch_count}] Processing: {video_id}")
-            print(f"    Channel: {channel_title}")
-            print(f"    Video: {video_title[:80]}...")
-            print(f"    Current risk: {doc.get('risk_category', 'UNKNOWN')}")
-            
-            # Check quota
-            if self.api_client.quota_used >= self.max_quota_usage:
-                print(f"    ⚠️  QUOTA LIMIT REACHED ({self.api_client.quota_used}/{self.max_quota_usage})")
-                quota_exhausted = True
+        pending_updates: List[UpdateOne] = []
+        pending_ids: List[str] = []
+        pending_skips: List[str] = []
+        
+        # Docs per batch (and so ids per videos.list call) adapt to API pressure
+        self.batch_sizer = AdaptiveBatchSizer(max_size=batch_size)
+        cursor_iter = iter(cursor)
+        
+        # The next cursor batch is read on a worker thread (the only one touching
+        # the cursor) while the current batch is fetched, scored and written
+        reader = ThreadPoolExecutor(max_workers=1)
+        def read_batch() -> List[Dict]:
+            return list(islice(cursor_iter, self.batch_sizer.size))
+        
+        next_docs = reader.submit(read_batch)
+        while not quota_exhausted:
+            docs = next_docs.result()
+            if not docs:
                 break
+            next_docs = reader.submit(read_batch)
+            self._prefetch_metadata(docs)
+            self._analyze_prefetched_videos()
+            # One timestamp per batch, shared by every doc in its bulk_write
+            batch_ts = datetime.now().isoformat()
             
-            try:
-                # Re-detect using fresh API only
-                update_doc = self.redetect_video(doc, fresh_api_only=True)
+            for doc in docs:
+                video_id = doc.get('video_id')
+                channel_title = doc.get('channel_title', 'Unknown')
+                video_title = doc.get('video_title', 'Unknown')
                 
-                print(f"    ✅ New risk: {update_doc['risk_category']} "
-                      f"(score: {update_doc['total_risk_score']:.1f}, "
-                      f"confidence: {update_doc['confidence_score']:.0%})")
-                print(f"    📊 Video signals: {len(update_doc['video_signals'])}")
-                if 'channel_signals' in update_doc:
-                    print(f"    📊 Channel signals: {len(update_doc['channel_signals'])}")
-                
-                # Update MongoDB
-                if not dry_run:
-                    self.collection.update_one(
-                        {'video_id': video_id},
-                        {'$set': update_doc}
-                    )
+                batch_count += 1
                 
-                # Update checkpoint
-                self.checkpoint['processed_video_ids'].append(video_id)
-                self.checkpoint['total_processed'] += 1
-                self.checkpoint['quota_used'] = self.api_client.quota_used
-                success_count += 1
+                logger.info(f"\n[{batch_count}] Processing: {video_id}")
+                logger.debug(f"    Channel: {channel_title}")
+                logger.debug(f"    Video: {video_title[:80]}...")
+                logger.debug(f"    Current risk: {doc.get('risk_category', 'UNKNOWN')}")
                 
-                # Save checkpoint every 10 videos
-                if batch_count % 10 == 0:
-                    self._save_checkpoint()
-                    print(f"\n    💾 Checkpoint saved ({self.checkpoint['total_processed']} processed, {self.checkpoint.get('total_skipped', 0)} skipped)")
+                # Check quota
+                if (not self._is_prefetched(video_id, doc.get('channel_id'))
+                        and self.api_client.quota_used >= self.max_quota_usage):
+                    logger.warning(f"    ⚠️  QUOTA LIMIT REACHED ({self.api_client.quota_used}/{self.max_quota_usage})")
+                    quota_exhausted = True
+                    break
                 
-            except Exception as e:
-                error_msg = str(e)
+                try:
+                    # Re-detect using fresh API only
+                    update_doc, skip_reason = self.redetect_video(doc, fresh_api_only=True, batch_ts=batch_ts)
+                except Exception as e:
+                    logger.error(f"    ❌ Error: {e}")
+                    error_count += 1
+                    continue
                 
-                # Check if video should be skipped (API unavailable or missing description)
-                if "Fresh API data unavailable" in error_msg or "Insufficient metadata quality" in error_msg or "Quota exhausted" in error_msg:
-                    print(f"    ⏭️  SKIPPED: {error_msg}")
+                # Skip videos whose API data is unavailable, incomplete, or out of quota
+                if skip_reason:
+                    logger.info(f"    ⏭️  SKIPPED: {skip_reason}")
                     
-                    # Track skipped video
-                    if 'skipped_video_ids' not in self.checkpoint:
-                        self.checkpoint['skipped_video_ids'] = []
-                    self.checkpoint['skipped_video_ids'].append(video_id)
+                    # Track skipped video; quota stops stay eligible for the next session
+                    quota_stop = skip_reason.startswith("Quota exhausted")
+                    self.checkpoint['skipped_video_ids'].add(video_id)
+                    if not quota_stop:
+                        pending_skips.append(video_id)
                     self.checkpoint['total_skipped'] = self.checkpoint.get('total_skipped', 0) + 1
                     skipped_count += 1
                     
                     # If quota exhausted, stop processing
-                    if "Quota exhausted" in error_msg:
+                    if quota_stop:
                         quota_exhausted = True
                         break
-                else:
-                    print(f"    ❌ Error: {e}")
-                    error_count += 1
+                    continue
                 
-                continue
+                logger.info(f"    ✅ New risk: {update_doc['risk_category']} "
+                            f"(score: {update_doc['total_risk_score']:.1f}, "
+                            f"confidence: {update_doc['confidence_score']:.0%})")
+                logger.debug(f"    📊 Video signals: {len(update_doc['video_signals'])}")
+                if 'channel_signals' in update_doc:
+                    logger.debug(f"    📊 Channel signals: {len(update_doc['channel_signals'])}")
+                
+                # Queue MongoDB update (written once per batch)
+                pending_updates.append(UpdateOne({'video_id': video_id}, {'$set': update_doc}))
+                pending_ids.append(video_id)
+            
+            success_count += self._flush_updates(pending_updates, pending_ids, pending_skips, dry_run)
         
-        # Final checkpoint save
-        self._save_checkpoint()
+        reader.shutdown(wait=True)
+        cursor.close()
+        
+        # Final checkpoint save (also flushes anything left after a quota stop)
+        success_count += self._flush_updates(pending_updates, pending_ids, pending_skips, dry_run)
+        self._save_checkpoint(wait=True)
         
         # Summary
-        print()
-        print("=" * 70)
-        print("RE-DETECTION COMPLETE")
-        print("=" * 70)
-        print(f"✅ Successfully processed: {success_count}")
-        print(f"⏭️  Skipped (API/quality issues): {skipped_count}")
-        print(f"❌ Errors: {error_count}")
-        print(f"📊 Total processed (cumulative): {self.checkpoint['total_processed']}/{total_videos}")
-        print(f"📊 Total skipped (cumulative): {self.checkpoint.get('total_skipped', 0)}/{total_videos}")
-        print(f"⚡ Quota used (this session): {self.api_client.quota_used} units")
-        print(f"⚡ Quota used (total): {self.checkpoint['quota_used']} units")
+        logger.info('')
+        logger.info("=" * 70)
+        logger.info("RE-DETECTION COMPLETE")
+        logger.info("=" * 70)
+        logger.info(f"✅ Successfully processed: {success_count}")
+        logger.info(f"⏭️  Skipped (API/quality issues): {skipped_count}")
+        logger.info(f"❌ Errors: {error_count}")
+        logger.info(f"📊 Total processed (cumulative): {self.checkpoint['total_processed']}/{total_videos}")
+        logger.info(f"📊 Total skipped (cumulative): {self.checkpoint.get('total_skipped', 0)}/{total_videos}")
+        logger.info(f"⚡ Quota used (this session): {self.api_client.quota_used} units")
+        logger.info(f"⚡ Quota used (total): {self.checkpoint['quota_used']} units")
         
         if quota_exhausted:
-            print()
-            print("⚠️  QUOTA LIMIT REACHED - Resume later to continue")
-            print(f"   Skipped videos will be retried in next session")
-            print(f"   Run script again tomorrow to process remaining videos")
+            logger.info('')
+            logger.warning("⚠️  QUOTA LIMIT REACHED - Resume later to continue")
+            logger.warning(f"   Skipped videos will be retried in next session")
+            logger.warning(f"   Run script again tomorrow to process remaining videos")
         
         if skipped_count > 0:
-            print()
-            print("💡 TIP: Skipped videos can be retried by:")
-            print("   1. Running script again with fresh quota (next day)")
-            print("   2. Or use --reset-checkpoint to re-process all skipped videos")
+            logger.info('')
+            logger.info("💡 TIP: Skipped videos can be retried by:")
+            logger.info("   1. Running script again with fresh quota (next day)")
+            logger.info("   2. Or use --reset-checkpoint to re-process all skipped videos")
         
-        print("=" * 70)
+        logger.info("=" * 70)
     
     def reset_checkpoint(self, keep_processed: bool = False):
         """Reset checkpoint to start fresh or retry skipped videos"""
         if keep_processed:
             # Only clear skipped videos, keep processed ones
-            self.checkpoint['skipped_video_ids'] = []
+            if self.checkpoint['started_at']:
+                self.collection.update_many({'redetection_skipped': self.checkpoint['started_at']},
+                                            {'$unset': {'redetection_skipped': ''}})
+            self.checkpoint['skipped_video_ids'] = set()
             self.checkpoint['total_skipped'] = 0
-            print("✅ Checkpoint reset: Cleared skipped videos, keeping processed ones")
+            logger.info("✅ Checkpoint reset: Cleared skipped videos, keeping processed ones")
         else:
-            # Full reset
+            # Full reset; the new session's markers make every document pending again
             self.checkpoint = {
-                'processed_video_ids': [],
-                'skipped_video_ids': [],
+                'processed_video_ids': set(),
+                'skipped_video_ids': set(),
                 'last_processed_index': 0,
                 'total_processed': 0,
                 'total_skipped': 0,
@@ -370,13 +716,28 @@ class RedetectionManager:
                 'started_at': None,
                 'last_updated': None
             }
-            print("✅ Checkpoint reset: All videos will be reprocessed")
+            logger.info("✅ Checkpoint reset: All videos will be reprocessed")
         
-        self._save_checkpoint()
+        self._save_checkpoint(wait=True)
+    
+    def clear_redetection_markers(self):
+        """Remove redetected_at / redetection_skipped from every document in the collection"""
+        result = self.collection.update_many(
+            {'$or': [{'redetected_at': {'$exists': True}}, {'redetection_skipped': {'$exists': True}}]},
+            {'$unset': {'redetected_at': '', 'redetection_skipped': ''}}
+        )
+        logger.info(f"✅ Cleared redetection markers from {result.modified_count} documents")
     
     def close(self):
-        """Close MongoDB connection"""
+        """Flush any coalesced checkpoint save and buffered logs, close MongoDB connection"""
+        if self._checkpoint_dirty:
+            self._save_checkpoint(wait=True)
+        self._checkpoint_executor.shutdown(wait=True)
+        if self._detection_pool is not None:
+            self._detection_pool.shutdown(wait=True)
         self.client.close()
+        for handler in logger.handlers:
+            handler.flush()
 
 
 def main():
@@ -396,14 +757,22 @@ def main():
                        help='Reset checkpoint and start from beginning')
     parser.add_argument('--retry-skipped', action='store_true',
                        help='Clear skipped videos and retry them (keeps processed videos)')
+    parser.add_argument('--clear-markers', action='store_true',
+                       help='Remove redetected_at/redetection_skipped from every document in the collection')
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument('--verbose', action='store_true',
+                           help='Log per-video details and fetch progress')
+    verbosity.add_argument('--quiet', action='store_true',
+                           help='Only log warnings and errors')
     
     args = parser.parse_args()
+    setup_logging(logging.DEBUG if args.verbose else logging.WARNING if args.quiet else logging.INFO)
     
     # Get API key
     api_key = os.environ.get('YOUTUBE_API_KEY')
     if not api_key:
-        print("❌ Error: YOUTUBE_API_KEY not found in environment")
-        print("   Set it with: export YOUTUBE_API_KEY='your-key'")
+        logger.error("❌ Error: YOUTUBE_API_KEY not found in environment")
+        logger.error("   Set it with: export YOUTUBE_API_KEY='your-key'")
         sys.exit(1)
     
     # Initialize manager
@@ -416,10 +785,13 @@ def main():
     # Reset checkpoint if requested
     if args.reset_checkpoint:
         manager.reset_checkpoint(keep_processed=False)
-        print()
+        logger.info('')
     elif args.retry_skipped:
         manager.reset_checkpoint(keep_processed=True)
-        print()
+        logger.info('')
+    if args.clear_markers:
+        manager.clear_redetection_markers()
+        logger.info('')
     
     try:
         # Run re-detection
@@ -4,24 +4,40 @@ Evaluates which detection signals are most reliable for academic paper.
 """
 
 import json
+import multiprocessing as mp
 import os
 import re
 from collections import defaultdict, Counter
 from datetime import datetime
-from typing import Dict, List, Tuple, Set
+from itertools import islice
+from typing import Dict, FrozenSet, Iterable, List, Tuple, Set
 import argparse
 
+import matplotlib
+matplotlib.use('Agg')  # Headless rendering; skips interactive backend probing
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib import rcParams
 import numpy as np
-from pymongo import MongoClient
+from pymongo.errors import OperationFailure
 from dotenv import load_dotenv
-import seaborn as sns
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Load environment variables
 load_dotenv()
 
+from mongo_client import get_client
+
 # NYU Purple Color Palette
 NYU_PURPLE = '#57068c'
 NYU_VIOLET = '#8900e1'
@@ -39,15 +55,29 @@ rcParams['xtick.labelsize'] = 10
 rcParams['ytick.labelsize'] = 10
 rcParams['legend.fontsize'] = 10
 rcParams['figure.titlesize'] = 16
+rcParams['path.simplify'] = True
+rcParams['agg.path.chunksize'] = 10000
+
+
+REGEX_METACHARS = set('.^$*+?{}[]\\|()')
 
 
 class SignalDefinition:
     """Definition of a detection signal"""
+    __slots__ = ('signal_id', 'name', 'signal_type', 'patterns', 'compiled', 'literal_patterns', 'regex')
+    
     def __init__(self, signal_id: int, name: str, signal_type: str, patterns: List[str]):
         self.signal_id = signal_id
         self.name = name
         self.signal_type = signal_type  # 'video' or 'channel'
         self.patterns = patterns  # List of regex/substring patterns to match
+        # All patterns as one case-insensitive alternation, compiled once
+        self.compiled = re.compile("(?:" + ")|(?:".join(patterns) + ")", re.IGNORECASE)
+        # Plain substrings can go through the Aho-Corasick scanner; the rest stay regex
+        self.literal_patterns = [p for p in patterns if not REGEX_METACHARS.intersection(p)]
+        regex_patterns = [p for p in patterns if REGEX_METACHARS.intersection(p)]
+        self.regex = (re.compile("(?:" + ")|(?:".join(regex_patterns) + ")", re.IGNORECASE)
+                      if regex_patterns else None)
         
 
 # Define all 11 signals
@@ -83,42 +113,98 @@ SIGNAL_DEFINITIONS = [
 ]
 
 
+def build_signal_automata() -> Dict[str, 'ahocorasick.Automaton']:
+    """Build one automaton per signal type mapping literal patterns to signal ids"""
+    automata = {}
+    for signal_type in ('video', 'channel'):
+        automaton = ahocorasick.Automaton()
+        for signal_def in SIGNAL_DEFINITIONS:
+            if signal_def.signal_type != signal_type:
+                continue
+            for pattern in signal_def.literal_patterns:
+                # Text is lowercased before scanning
+                automaton.add_word(pattern.lower(), signal_def.signal_id)
+        automaton.make_automaton()
+        automata[signal_type] = automaton
+    return automata
+
+
+SIGNAL_AUTOMATA = build_signal_automata() if AHOCORASICK_AVAILABLE else None
+# Signals that still need a regex pass when the automata are in use
+REGEX_SIGNAL_DEFINITIONS = [s for s in SIGNAL_DEFINITIONS if s.regex is not None]
+
+
+# Samples per extraction chunk, and the sample count at which chunks go to a process pool
+EXTRACT_CHUNK_SIZE = 1000
+PARALLEL_MIN_SAMPLES = 5000
+
+# Validation labels counted as actual positives (scams)
+_POS = frozenset({'true_positive', 'false_negative'})
+
+# Sample fields read by the analysis
+SAMPLE_PROJECTION = {'_id': 0, 'video_id': 1, 'video_signals': 1, 'channel_signals': 1,
+                     'validation.label': 1, 'takeover_type': 1}
+
+
 class SignalAnalyzer:
     """Analyzes detection signals from validated samples"""
     
     def __init__(self, collection_name: str = 'detection_results_v3'):
         self.collection_name = collection_name
-        self.samples = []
+        self.video_ids: List[str] = []  # Row order of bits / y, for sample references
         self.signal_data = {}
-        self.signal_definitions = {s.signal_id: s for s in SIGNAL_DEFINITIONS}
+        # Indexed by signal_id - 1, matching the bit/column order of the detections
+        self.signal_defs = tuple(sorted(SIGNAL_DEFINITIONS, key=lambda s: s.signal_id))
+        # Packed detections: bit (signal_id - 1) of bits[i] is set when sample i shows
+        # the signal (uint16 holds up to 16 signals), y[i] is True for actual positives;
+        # built by _build_detection_matrix()
+        self.bits = np.zeros(0, dtype=np.uint16)
+        self.y = np.zeros(0, dtype=bool)
+        self.takeover_types = np.zeros(0, dtype=object)
+        # Summaries of the detections, filled in by _summarize_detections()
+        self.detections = np.zeros((0, len(SIGNAL_DEFINITIONS)), dtype=bool)
+        self.per_signal_cm = np.zeros((len(SIGNAL_DEFINITIONS), 4), dtype=np.int64)  # tp, fp, tn, fn
+        self.cooccurrence = np.zeros((len(SIGNAL_DEFINITIONS), len(SIGNAL_DEFINITIONS)))
         
     def load_data_from_mongodb(self) -> int:
         """Load validated samples from MongoDB"""
         try:
-            conn_str = os.environ.get('MONGODB_URI', 'mongodb://localhost:27017/')
-            client = MongoClient(conn_str, serverSelectionTimeoutMS=5000)
+            client = get_client()
             client.admin.command('ping')
             
             db = client['streamjacking']
             collection = db[self.collection_name]
             
-            # Query only documents with validation labels
-            self.samples = list(collection.find({
-                'validation.label': {'$exists': True, '$ne': None}
-            }))
+            # The label filter and sample references are served by indexes
+            collection.create_index('validation.label')
+            try:
+                collection.create_index('video_id')
+            except OperationFailure:
+                pass  # Already indexed (e.g. the detector's unique video_id index)
             
-            client.close()
+            # Query only documents with validation labels, reading just the analyzed fields,
+            # and extract signals as the cursor streams instead of holding every document
+            query = {'validation.label': {'$exists': True, '$ne': None}}
+            expected = collection.count_documents(query)
+            cursor = collection.find(query, projection=SAMPLE_PROJECTION, batch_size=EXTRACT_CHUNK_SIZE)
+            # Pool startup only pays off on larger sets
+            processes = (os.cpu_count() or 1) if expected >= PARALLEL_MIN_SAMPLES else 1
+            n_samples = self._build_detection_matrix(cursor, processes)
             
-            print(f"✅ Loaded {len(self.samples)} validated samples from MongoDB")
-            return len(self.samples)
+            print(f"✅ Loaded {n_samples} validated samples from MongoDB")
+            return n_samples
             
         except Exception as e:
             print(f"❌ Error connecting to MongoDB: {e}")
             print("Make sure MongoDB is running and MONGODB_URI is set in .env")
             return 0
     
-    def extract_signals_from_sample(self, sample: Dict) -> Set[int]:
-        """Extract which signals are present in a sample"""
+    def extract_signals_from_sample(self, sample: Dict) -> FrozenSet[int]:
+        """Extract which signals are present in a sample (cached on the sample as '_detected')"""
+        cached = sample.get('_detected')
+        if cached is not None:
+            return cached
+        
         detected_signals = set()
         
         # Get signal arrays
@@ -134,26 +220,101 @@ class SignalAnalyzer:
         video_signals_text = ' '.join(str(s).lower() for s in video_signals)
         channel_signals_text = ' '.join(str(s).lower() for s in channel_signals)
         
-        # Check each signal definition
-        for signal_def in SIGNAL_DEFINITIONS:
-            if signal_def.signal_type == 'video':
-                text = video_signals_text
-            else:
-                text = channel_signals_text
-            
-            # Check if any pattern matches
-            for pattern in signal_def.patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    detected_signals.add(signal_def.signal_id)
-                    break
+        texts = {'video': video_signals_text, 'channel': channel_signals_text}
+        
+        if SIGNAL_AUTOMATA is not None:
+            # One pass per signal type for all literal patterns
+            for signal_type, automaton in SIGNAL_AUTOMATA.items():
+                detected_signals.update(sid for _, sid in automaton.iter(texts[signal_type]))
+            signal_defs = REGEX_SIGNAL_DEFINITIONS
+        else:
+            signal_defs = SIGNAL_DEFINITIONS
+        
+        # Check each remaining signal definition
+        for signal_def in signal_defs:
+            if signal_def.signal_id in detected_signals:
+                continue
+            pattern = signal_def.regex if SIGNAL_AUTOMATA is not None else signal_def.compiled
+            if pattern.search(texts[signal_def.signal_type]):
+                detected_signals.add(signal_def.signal_id)
+        
+        sample['_detected'] = frozenset(detected_signals)
+        return sample['_detected']
+    
+    def _build_detection_matrix(self, samples: Iterable[Dict], processes: int = 1) -> int:
+        """Extract signals and labels for each sample as it streams in, into bits and y
+        
+        Samples are read in chunks; with processes > 1 the chunks are extracted
+        across a multiprocessing pool (row order is preserved). Returns the
+        number of samples read.
+        """
+        rows, labels = [], []
+        takeover_types = []
+        self.video_ids = []
+        
+        def chunks():
+            sample_iter = iter(samples)
+            while True:
+                chunk = list(islice(sample_iter, EXTRACT_CHUNK_SIZE))
+                if not chunk:
+                    return
+                self.video_ids.extend(sample.get('video_id') for sample in chunk)
+                takeover_types.extend(sample.get('takeover_type') for sample in chunk)
+                yield chunk
+        
+        if processes > 1:
+            with mp.Pool(processes) as pool:
+                results = list(pool.imap(_extract_batch, chunks()))
+        else:
+            results = [_extract_batch(chunk) for chunk in chunks()]
+        for chunk_bits, chunk_labels in results:
+            rows.append(chunk_bits)
+            labels.append(chunk_labels)
         
-        return detected_signals
+        self.bits = np.concatenate(rows) if rows else np.zeros(0, dtype=np.uint16)
+        self.y = np.concatenate(labels) if labels else np.zeros(0, dtype=bool)
+        self.takeover_types = np.empty(len(takeover_types), dtype=object)
+        self.takeover_types[:] = takeover_types
+        self._summarize_detections()
+        return len(self.video_ids)
+    
+    def _summarize_detections(self):
+        """Unpack the detections once and derive per-signal confusion counts and co-occurrence"""
+        self.detections = self._detection_matrix()
+        self.per_signal_cm = np.stack(self._confusion(self.detections, self.y), axis=1).astype(np.int64)
+        # Pairwise co-detection counts in one matrix product; the diagonal is per-signal support
+        detected = self.detections.astype(np.float64)
+        self.cooccurrence = detected.T @ detected
+    
+    def _signal_mask(self, signal_keys: List[str]) -> int:
+        """Bit mask selecting 'signal_<id>' keys in the packed detections"""
+        mask = 0
+        for sig in signal_keys:
+            mask |= 1 << (int(sig.split('_')[1]) - 1)
+        return mask
+    
+    def _detection_matrix(self) -> np.ndarray:
+        """Unpack bits into a boolean (samples x signals) matrix"""
+        shifts = np.arange(len(SIGNAL_DEFINITIONS), dtype=np.uint16)
+        return ((self.bits[:, None] >> shifts) & 1).astype(bool)
+    
+    @staticmethod
+    def _confusion(present: np.ndarray, actual: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """tp, fp, tn, fn counts (per column when present is 2-D)"""
+        # One masked count plus two plain counts; the other cells follow from the totals
+        tp = np.count_nonzero(present & (actual[:, None] if present.ndim == 2 else actual), axis=0)
+        detected = np.count_nonzero(present, axis=0)
+        positives = np.count_nonzero(actual)
+        fp = detected - tp
+        fn = positives - tp
+        tn = len(actual) - detected - fn
+        return tp, fp, tn, fn
     
     def get_actual_label(self, sample: Dict) -> bool:
         """Get ground truth: True if actual positive (scam), False if actual negative"""
         label = sample.get('validation', {}).get('label', '')
         # true_positive and false_negative are actual positives
-        return label in ['true_positive', 'false_negative']
+        return label in _POS
     
     def calculate_signal_metrics(self) -> Dict:
         """Calculate per-signal metrics overall and by takeover type"""
@@ -161,45 +322,22 @@ class SignalAnalyzer:
         
         results = {}
         
-        for signal_id, signal_def in self.signal_definitions.items():
-            tp = fp = tn = fn = 0
-            samples_with_signal = []
-            
-            # Track metrics by takeover type
+        # Confusion counts for every signal at once, overall and per takeover type
+        detections = self.detections
+        takeover_counts = {}
+        for takeover_type in ('COMPLETE_ATO', 'PARTIAL_ATO'):
+            mask = self.takeover_types == takeover_type
+            takeover_counts[takeover_type] = self._confusion(detections[mask], self.y[mask])
+        
+        for col, signal_def in enumerate(self.signal_defs):
+            signal_id = signal_def.signal_id
+            tp, fp, tn, fn = (int(c) for c in self.per_signal_cm[col])
+            samples_with_signal = [self.video_ids[i] for i in np.flatnonzero(detections[:, col])[:5]]
             takeover_metrics = {
-                'COMPLETE_ATO': {'tp': 0, 'fp': 0, 'tn': 0, 'fn': 0},
-                'PARTIAL_ATO': {'tp': 0, 'fp': 0, 'tn': 0, 'fn': 0}
+                takeover_type: dict(zip(('tp', 'fp', 'tn', 'fn'), (int(c[col]) for c in counts)))
+                for takeover_type, counts in takeover_counts.items()
             }
             
-            for sample in self.samples:
-                detected_signals = self.extract_signals_from_sample(sample)
-                actual_positive = self.get_actual_label(sample)
-                signal_present = signal_id in detected_signals
-                
-                # Overall Confusion matrix
-                if signal_present and actual_positive:
-                    tp += 1
-                    samples_with_signal.append(sample['video_id'])
-                elif signal_present and not actual_positive:
-                    fp += 1
-                    samples_with_signal.append(sample['video_id'])
-                elif not signal_present and actual_positive:
-                    fn += 1
-                elif not signal_present and not actual_positive:
-                    tn += 1
-                    
-                # Track takeover type
-                takeover_type = sample.get('takeover_type')
-                if takeover_type in ['COMPLETE_ATO', 'PARTIAL_ATO']:
-                    if signal_present and actual_positive:
-                        takeover_metrics[takeover_type]['tp'] += 1
-                    elif signal_present and not actual_positive:
-                        takeover_metrics[takeover_type]['fp'] += 1
-                    elif not signal_present and actual_positive:
-                        takeover_metrics[takeover_type]['fn'] += 1
-                    elif not signal_present and not actual_positive:
-                        takeover_metrics[takeover_type]['tn'] += 1
-            
             # Calculate metrics
             def calc_metrics(tp, fp, tn, fn):
                 prec = tp / (tp + fp) if (tp + fp) > 0 else 0
@@ -253,18 +391,8 @@ class SignalAnalyzer:
         """Calculate signal co-occurrence matrix"""
         print("\n🔗 Calculating signal co-occurrence...")
         
-        n_signals = len(SIGNAL_DEFINITIONS)
-        cooccurrence = np.zeros((n_signals, n_signals))
-        
-        for sample in self.samples:
-            detected_signals = list(self.extract_signals_from_sample(sample))
-            
-            # Update co-occurrence matrix
-            for i, sig1 in enumerate(detected_signals):
-                for sig2 in detected_signals:
-                    cooccurrence[sig1-1][sig2-1] += 1
-        
-        return cooccurrence
+        # Computed alongside the per-signal counts when the detections were built
+        return self.cooccurrence
     
     def analyze_combinations(self, signal_metrics: Dict) -> Dict:
         """Test signal combinations for optimal performance"""
@@ -280,6 +408,8 @@ class SignalAnalyzer:
         # Test cumulative performance
         cumulative_performance = []
         selected_signals = []
+        # Selected signals as a bit mask, grown one signal at a time
+        selected_mask = 0
         
         for sig_id, sig_data in sorted_signals:
             if sig_data['metrics']['f1'] == 0:
@@ -288,26 +418,9 @@ class SignalAnalyzer:
             selected_signals.append(sig_id)
             
             # Calculate performance with this subset
-            tp = fp = tn = fn = 0
-            
-            for sample in self.samples:
-                detected_signals = self.extract_signals_from_sample(sample)
-                actual_positive = self.get_actual_label(sample)
-                
-                # Check if ANY of the selected signals are present
-                any_signal_present = any(
-                    int(sig.split('_')[1]) in detected_signals 
-                    for sig in selected_signals
-                )
-                
-                if any_signal_present and actual_positive:
-                    tp += 1
-                elif any_signal_present and not actual_positive:
-                    fp += 1
-                elif not any_signal_present and actual_positive:
-                    fn += 1
-                else:
-                    tn += 1
+            selected_mask |= self._signal_mask([sig_id])
+            any_present = (self.bits & selected_mask) != 0
+            tp, fp, tn, fn = (int(c) for c in self._confusion(any_present, self.y))
             
             precision = tp / (tp + fp) if (tp + fp) > 0 else 0
             recall = tp / (tp + fn) if (tp + fn) > 0 else 0
@@ -349,25 +462,8 @@ class SignalAnalyzer:
     
     def _calculate_group_f1(self, signal_ids: List[str]) -> float:
         """Calculate F1 for a group of signals"""
-        tp = fp = tn = fn = 0
-        
-        for sample in self.samples:
-            detected_signals = self.extract_signals_from_sample(sample)
-            actual_positive = self.get_actual_label(sample)
-            
-            any_signal_present = any(
-                int(sig.split('_')[1]) in detected_signals 
-                for sig in signal_ids
-            )
-            
-            if any_signal_present and actual_positive:
-                tp += 1
-            elif any_signal_present and not actual_positive:
-                fp += 1
-            elif not any_signal_present and actual_positive:
-                fn += 1
-            else:
-                tn += 1
+        any_present = (self.bits & self._signal_mask(signal_ids)) != 0
+        tp, fp, tn, fn = (int(c) for c in self._confusion(any_present, self.y))
         
         precision = tp / (tp + fp) if (tp + fp) > 0 else 0
         recall = tp / (tp + fn) if (tp + fn) > 0 else 0
@@ -437,6 +533,31 @@ class SignalAnalyzer:
         return recommendations
 
 
+def _extract_batch(samples: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Packed detection bits and labels for a chunk of samples (runs in pool workers)"""
+    analyzer = _batch_analyzer()
+    bits = np.zeros(len(samples), dtype=np.uint16)
+    for i, sample in enumerate(samples):
+        row = 0
+        for signal_id in analyzer.extract_signals_from_sample(sample):
+            row |= 1 << (signal_id - 1)
+        bits[i] = row
+    labels = np.fromiter((sample.get('validation', {}).get('label', '') in _POS for sample in samples),
+                         dtype=bool, count=len(samples))
+    return bits, labels
+
+
+_BATCH_ANALYZER = None
+
+
+def _batch_analyzer() -> SignalAnalyzer:
+    """Per-process analyzer used only for its extraction methods"""
+    global _BATCH_ANALYZER
+    if _BATCH_ANALYZER is None:
+        _BATCH_ANALYZER = SignalAnalyzer()
+    return _BATCH_ANALYZER
+
+
 def create_visualizations(signal_metrics: Dict, cooccurrence: np.ndarray, 
                          combinations: Dict, output_dir: str):
     """Generate all visualizations"""
@@ -445,8 +566,20 @@ def create_visualizations(signal_metrics: Dict, cooccurrence: np.ndarray,
     signals_dir = os.path.join(output_dir, 'visualizations', 'signals')
     os.makedirs(signals_dir, exist_ok=True)
     
+    # One figure is reused for every chart: resized, drawn, saved, then cleared
+    fig = plt.figure()
+    
+    def new_chart(figsize, ncols=1):
+        fig.clear()
+        fig.set_size_inches(*figsize)
+        return fig.subplots(1, ncols)
+    
+    def save_chart(filename):
+        fig.tight_layout()
+        fig.savefig(os.path.join(signals_dir, filename), dpi=300, bbox_inches='tight')
+    
     # 1. Per-signal performance bar chart
-    fig, ax = plt.subplots(figsize=(14, 8))
+    ax = new_chart((14, 8))
     
     # Sort by F1 descending
     sorted_data = sorted(signal_metrics.items(), 
@@ -475,39 +608,39 @@ def create_visualizations(signal_metrics: Dict, cooccurrence: np.ndarray,
     ax.grid(axis='y', alpha=0.3)
     ax.set_ylim(0, 1.1)
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(signals_dir, '01_signal_performance.png'), dpi=300, bbox_inches='tight')
-    plt.close()
+    save_chart('01_signal_performance.png')
     print(f"  ✓ Saved signal performance chart")
     
     # 2. Signal co-occurrence heatmap
-    fig, ax = plt.subplots(figsize=(12, 10))
+    ax = new_chart((12, 10))
     
-    # Normalize by diagonal (self-occurrence)
-    cooccurrence_norm = cooccurrence.copy()
-    for i in range(len(cooccurrence)):
-        if cooccurrence[i, i] > 0:
-            cooccurrence_norm[i, :] /= cooccurrence[i, i]
-            cooccurrence_norm[:, i] /= cooccurrence[i, i]
+    # Normalize each row by its diagonal (self-occurrence); never-seen signals stay 0
+    diag = np.diag(cooccurrence)
+    safe_diag = np.where(diag > 0, diag, 1)
+    cooccurrence_norm = np.where(diag[:, None] > 0, cooccurrence / safe_diag[:, None], 0)
     
     n_signals = len(SIGNAL_DEFINITIONS)
-    sns.heatmap(cooccurrence_norm, annot=True, fmt='.2f', cmap='Purples',
-                cbar_kws={'label': 'Co-occurrence Rate'},
-                xticklabels=[f"S{i+1}" for i in range(n_signals)],
-                yticklabels=[f"S{i+1}" for i in range(n_signals)],
-                ax=ax, square=True)
+    tick_labels = [f"S{i+1}" for i in range(n_signals)]
+    image = ax.imshow(cooccurrence_norm, cmap='Purples')
+    fig.colorbar(image, ax=ax, label='Co-occurrence Rate')
+    ax.set_xticks(np.arange(n_signals))
+    ax.set_xticklabels(tick_labels)
+    ax.set_yticks(np.arange(n_signals))
+    ax.set_yticklabels(tick_labels)
+    text_threshold = cooccurrence_norm.max() / 2
+    for (i, j), value in np.ndenumerate(cooccurrence_norm):
+        ax.text(j, i, f'{value:.2f}', ha='center', va='center', fontsize=8,
+                color='white' if value > text_threshold else 'black')
     
     ax.set_title('Signal Co-occurrence Matrix (Normalized)', fontweight='bold', pad=20)
     ax.set_xlabel('Signal', fontweight='bold')
     ax.set_ylabel('Signal', fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(signals_dir, '02_cooccurrence_matrix.png'), dpi=300, bbox_inches='tight')
-    plt.close()
+    save_chart('02_cooccurrence_matrix.png')
     print(f"  ✓ Saved co-occurrence heatmap")
     
     # 3. Cumulative F1 score line chart
-    fig, ax = plt.subplots(figsize=(12, 7))
+    ax = new_chart((12, 7))
     
     cumulative = combinations['cumulative_performance']
     counts = [c['count'] for c in cumulative]
@@ -537,13 +670,11 @@ def create_visualizations(signal_metrics: Dict, cooccurrence: np.ndarray,
     ax.grid(True, alpha=0.3)
     ax.set_ylim(0, 1.1)
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(signals_dir, '03_cumulative_f1.png'), dpi=300, bbox_inches='tight')
-    plt.close()
+    save_chart('03_cumulative_f1.png')
     print(f"  ✓ Saved cumulative F1 chart")
     
     # 4. Video vs Channel signals comparison
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+    ax1, ax2 = new_chart((16, 6), ncols=2)
     
     video_signals = {k: v for k, v in signal_metrics.items() if v['type'] == 'video'}
     channel_signals = {k: v for k, v in signal_metrics.items() if v['type'] == 'channel'}
@@ -587,11 +718,11 @@ def create_visualizations(signal_metrics: Dict, cooccurrence: np.ndarray,
     ax2.grid(axis='y', alpha=0.3)
     ax2.set_ylim(0, 1.1)
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(signals_dir, '04_video_vs_channel.png'), dpi=300, bbox_inches='tight')
-    plt.close()
+    save_chart('04_video_vs_channel.png')
     print(f"  ✓ Saved video vs channel comparison")
     
+    plt.close(fig)
+    
     print(f"\n✅ All visualizations saved to {signals_dir}")
 
 
@@ -644,8 +775,11 @@ def main():
     output_file = os.path.join(args.output_dir, 'signal_analysis_report.json')
     os.makedirs(args.output_dir, exist_ok=True)
     
-    with open(output_file, 'w') as f:
-        json.dump(report, f, indent=2)
+    with open(output_file, 'wb') as f:
+        if orjson:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            f.write(json.dumps(report, indent=2).encode('utf-8'))
     
     print(f"\n💾 Saved comprehensive report to {output_file}")
     
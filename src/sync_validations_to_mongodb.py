@@ -11,13 +11,23 @@ from dotenv import load_dotenv
 load_dotenv()
 
 try:
-    from pymongo import MongoClient
-    from pymongo.errors import ConnectionFailure
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from pymongo import UpdateOne
+    from pymongo.errors import BulkWriteError, ConnectionFailure, OperationFailure
 except ImportError:
     print("❌ Error: pymongo not installed")
     print("Install with: pip install pymongo")
     sys.exit(1)
 
+# Validation updates sent per bulk_write round-trip
+BULK_BATCH_SIZE = 1000
+
+from mongo_client import get_client
+
 
 def sync_validations_to_mongodb(validated_file: str, database: str = 'streamjacking', collection: str = 'detection_results_v2'):
     """
@@ -31,16 +41,15 @@ def sync_validations_to_mongodb(validated_file: str, database: str = 'streamjack
     
     # Load validated data
     print(f"Loading validated data from {validated_file}...")
-    with open(validated_file, 'r') as f:
-        validated_data = json.load(f)
+    with open(validated_file, 'rb') as f:
+        validated_data = orjson.loads(f.read()) if orjson else json.load(f)
     
     print(f"Found {len(validated_data)} validated detections")
     
     # Connect to MongoDB
     print("\nConnecting to MongoDB...")
     try:
-        conn_str = os.environ.get('MONGODB_URI', 'mongodb://localhost:27017/')
-        client = MongoClient(conn_str, serverSelectionTimeoutMS=5000)
+        client = get_client()
         client.admin.command('ping')
         print("✅ Connected to MongoDB")
     except Exception as e:
@@ -50,13 +59,56 @@ def sync_validations_to_mongodb(validated_file: str, database: str = 'streamjack
     db = client[database]
     coll = db[collection]
     
-    # Sync each validation
+    # Every update matches on video_id, so make sure that lookup is indexed
+    try:
+        coll.create_index('video_id')
+    except OperationFailure:
+        pass  # Already indexed (e.g. the detector's unique video_id index)
+    
+    # Sync validations in bulk batches
     print(f"\nSyncing validation labels to {database}.{collection}...")
     
     synced = 0
     not_found = 0
     failed = 0
     
+    def flush(ops, op_ids):
+        """Write one batch and tally matched / missing / failed updates"""
+        nonlocal synced, not_found, failed
+        if not ops:
+            return
+        failed_ids = set()
+        try:
+            matched = coll.bulk_write(ops, ordered=False).matched_count
+        except BulkWriteError as e:
+            matched = e.details.get('nMatched', 0)
+            for err in e.details.get('writeErrors', []):
+                video_id = op_ids[err['index']]
+                failed_ids.add(video_id)
+                print(f"❌ Failed to sync {video_id[:12]}: {err.get('errmsg')}")
+        except Exception as e:
+            failed += len(ops)
+            print(f"❌ Failed to sync batch of {len(ops)}: {e}")
+            ops.clear()
+            op_ids.clear()
+            return
+        
+        failed += len(failed_ids)
+        synced += matched
+        missing = len(ops) - matched - len(failed_ids)
+        if missing > 0:
+            # Only look up which ids were missing when some were
+            found = set(coll.distinct('video_id', {'video_id': {'$in': op_ids}}))
+            for video_id in op_ids:
+                if video_id not in found and video_id not in failed_ids:
+                    print(f"⚠️  Not found in DB: {video_id[:12]}...")
+            not_found += missing
+        print(f"   Synced {synced}/{len(validated_data)}...")
+        ops.clear()
+        op_ids.clear()
+    
+    ops = []
+    op_ids = []
     for item in validated_data:
         video_id = item.get('video_id')
         validation = item.get('validation', {})
@@ -66,31 +118,22 @@ def sync_validations_to_mongodb(validated_file: str, database: str = 'streamjack
             failed += 1
             continue
         
-        try:
-            result = coll.update_one(
-                {'video_id': video_id},
-                {
-                    '$set': {
-                        'validation': validation,
-                        'validated_at': validation.get('reviewed_at'),
-                        'ground_truth_label': validation.get('label'),
-                        'validation_reasoning': validation.get('reasoning'),
-                        'scam_type': validation.get('scam_type')
-                    }
+        ops.append(UpdateOne(
+            {'video_id': video_id},
+            {
+                '$set': {
+                    'validation': validation,
+                    'validated_at': validation.get('reviewed_at'),
+                    'ground_truth_label': validation.get('label'),
+                    'validation_reasoning': validation.get('reasoning'),
+                    'scam_type': validation.get('scam_type')
                 }
-            )
-            
-            if result.matched_count > 0:
-                synced += 1
-                if synced % 10 == 0:
-                    print(f"   Synced {synced}/{len(validated_data)}...")
-            else:
-                not_found += 1
-                print(f"⚠️  Not found in DB: {video_id[:12]}...")
-                
-        except Exception as e:
-            failed += 1
-            print(f"❌ Failed to sync {video_id[:12]}: {e}")
+            }
+        ))
+        op_ids.append(video_id)
+        if len(ops) >= BULK_BATCH_SIZE:
+            flush(ops, op_ids)
+    flush(ops, op_ids)
     
     # Summary
     print("\n" + "="*70)
@@ -102,8 +145,6 @@ def sync_validations_to_mongodb(validated_file: str, database: str = 'streamjack
     print(f"❌ Failed to sync:          {failed}")
     print("="*70)
     
-    client.close()
-    
     if not_found > 0:
         print(f"\n💡 Tip: {not_found} detections weren't found in MongoDB.")
         print("   This usually means they were validated from an older detection run.")
@@ -3,17 +3,51 @@ Generate synthetic test data for detector validation
 Useful for testing without consuming API quota
 """
 
+import base64
 import json
-import random
-from datetime import datetime, timedelta
-from typing import List, Dict
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import chain, islice
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Records encoded per write when saving a dataset
+SAVE_CHUNK_SIZE = 1000
+
+
+@dataclass(slots=True)
+class SyntheticDetection:
+    """One generated detection record; serializes to the detector's result fields"""
+    video_id: str
+    video_title: str
+    channel_id: str
+    channel_title: str
+    is_live: bool
+    video_risk_score: float
+    channel_risk_score: float
+    total_risk_score: float
+    video_signals: Tuple[str, ...]
+    channel_signals: Tuple[str, ...]
+    top_signals: str
+    detected_at: str
+    search_query: str
+    
+    def to_dict(self) -> Dict:
+        """Fields as a dict, in declaration order (orjson serializes the dataclass directly)"""
+        return {name: getattr(self, name) for name in self.__slots__}
 
 
 class TestDataGenerator:
     """Generate realistic test data for stream-jacking detection"""
     
     # Legitimate channel names
-    LEGITIMATE_CHANNELS = [
+    LEGITIMATE_CHANNELS = (
         "Tech Reviews Daily",
         "Gaming Central",
         "Cooking Adventures",
@@ -21,35 +55,41 @@ class TestDataGenerator:
         "Music Producer Tips",
         "Fitness Journey",
         "DIY Projects"
-    ]
+    )
     
     # Impersonation variations
-    IMPERSONATION_PATTERNS = [
-        ("Tesla", ["Tеsla", "TesIa", "T3sla", "Tes1a"]),  # Note: first 'e' is Cyrillic
-        ("Elon Musk", ["EIon Musk", "Elon Μusk", "Ε1on Musk"]),
-        ("SpaceX", ["SpaceΧ", "Space X Official", "SpасeX"]),
-        ("Ethereum", ["Ethеreum", "Ethеrеum", "Eth3reum"]),
-        ("Vitalik Buterin", ["VitaIik Buterin", "Vitalik Butеrin"]),
-        ("Apple", ["AppIe", "Αpple", "App1e"])
-    ]
+    IMPERSONATION_PATTERNS = (
+        ("Tesla", ("Tеsla", "TesIa", "T3sla", "Tes1a")),  # Note: first 'e' is Cyrillic
+        ("Elon Musk", ("EIon Musk", "Elon Μusk", "Ε1on Musk")),
+        ("SpaceX", ("SpaceΧ", "Space X Official", "SpасeX")),
+        ("Ethereum", ("Ethеreum", "Ethеrеum", "Eth3reum")),
+        ("Vitalik Buterin", ("VitaIik Buterin", "Vitalik Butеrin")),
+        ("Apple", ("AppIe", "Αpple", "App1e"))
+    )
+    # Flattened (original, fake) pairs so one draw picks both
+    TARGET_VARIATIONS = tuple(
+        (original, fake) for original, variations in IMPERSONATION_PATTERNS for fake in variations
+    )
     
-    SCAM_TITLES = [
+    SCAM_TITLES = (
         "{target} LIVE: ETH 2.0 Giveaway - Send 1 ETH, Get 2 ETH Back!",
         "{target} Bitcoin Announcement - Limited Time Double Your BTC",
         "EXCLUSIVE: {target} Crypto Event LIVE NOW - Scan QR for Bonus",
         "{target} Ethereum Giveaway 2024 - Official Livestream",
         "Send 0.1 BTC to {target} Wallet - Receive 1 BTC Back INSTANTLY"
-    ]
+    )
+    # Titles pre-split around {target} so generation is plain concatenation
+    SCAM_TITLE_PARTS = tuple(tuple(title.split('{target}', 1)) for title in SCAM_TITLES)
     
-    LEGITIMATE_TITLES = [
+    LEGITIMATE_TITLES = (
         "Daily Tech News Update - {date}",
         "Product Review: Latest Smartphone",
         "How To Tutorial: Web Development",
         "Gaming Stream - Playing New Release",
         "Q&A Session with Viewers"
-    ]
+    )
     
-    SCAM_DESCRIPTIONS = [
+    SCAM_DESCRIPTIONS = (
         """🎉 OFFICIAL GIVEAWAY 🎉
 Send ETH to: 0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb
 Get 2X back instantly!
@@ -66,59 +106,168 @@ Official partnership announcement
 Guaranteed returns within 24 hours
 Join thousands of successful participants
         """
-    ]
+    )
+    
+    # (video_risk, channel_risk) uniform ranges per risk level
+    RISK_RANGES = {
+        'high': ((65, 90), (45, 70)),
+        'medium': ((35, 55), (25, 40)),
+        'low': ((25, 40), (15, 25))
+    }
+    # Risk level codes index RISK_LEVELS; RISK_BOUNDS[code] holds that level's ranges
+    RISK_LEVELS = tuple(RISK_RANGES)
+    RISK_BOUNDS = np.array(list(RISK_RANGES.values()), dtype=np.float64)
     
     def __init__(self, seed: int = 42):
         """Initialize generator with seed for reproducibility"""
-        random.seed(seed)
+        # Every draw goes through one PCG64-backed generator
+        self.rng = np.random.default_rng(seed)
+    
+    def _generate_ids(self, n: int, length: int) -> List[str]:
+        """Draw n random IDs of the given length from the YouTube ID alphabet
+        
+        All IDs come from one block of random bytes and one base64 encode; each ID
+        gets whole 3-byte groups so slices never straddle padding.
+        """
+        width = -(-length // 4) * 4
+        encoded = base64.urlsafe_b64encode(self.rng.bytes(n * width // 4 * 3)).decode('ascii')
+        return [encoded[i:i + length] for i in range(0, n * width, width)]
+    
+    def _random_id(self, length: int) -> str:
+        """One random ID: the URL-safe base64 alphabet is the YouTube ID alphabet,
+        so encode enough random bytes for length full 6-bit characters"""
+        return base64.urlsafe_b64encode(self.rng.bytes(length * 6 // 8 + 1))[:length].decode('ascii')
     
     def generate_channel_id(self) -> str:
         """Generate realistic YouTube channel ID"""
-        chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
-        return "UC" + ''.join(random.choices(chars, k=22))
+        return "UC" + self._random_id(22)
     
     def generate_video_id(self) -> str:
         """Generate realistic YouTube video ID"""
-        chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
-        return ''.join(random.choices(chars, k=11))
+        return self._random_id(11)
     
-    def generate_legitimate_detection(self) -> Dict:
+    def generate_legitimate_detection(self) -> SyntheticDetection:
         """Generate a legitimate channel detection (false positive test)"""
-        channel_name = random.choice(self.LEGITIMATE_CHANNELS)
-        video_title = random.choice(self.LEGITIMATE_TITLES).format(
-            date=datetime.now().strftime("%Y-%m-%d")
-        )
-        
-        return {
-            'video_id': self.generate_video_id(),
-            'video_title': video_title,
-            'channel_id': self.generate_channel_id(),
-            'channel_title': channel_name,
-            'is_live': random.random() < 0.2,
-            'video_risk_score': random.uniform(0, 25),
-            'channel_risk_score': random.uniform(0, 15),
-            'total_risk_score': random.uniform(0, 30),
-            'video_signals': [],
-            'channel_signals': [],
-            'detected_at': datetime.now().isoformat(),
-            'search_query': random.choice(['tech news', 'gaming', 'tutorials'])
-        }
+        return self._generate_legitimate_batch(1)[0]
     
-    def generate_suspicious_detection(self, risk_level: str = 'high') -> Dict:
+    def generate_suspicious_detection(self, risk_level: str = 'high') -> SyntheticDetection:
         """
         Generate a suspicious channel detection
         
         Args:
             risk_level: 'low', 'medium', or 'high'
         """
-        # Choose impersonation target
-        target_original, variations = random.choice(self.IMPERSONATION_PATTERNS)
-        target_fake = random.choice(variations)
+        return self._generate_suspicious_batch(np.array([self.RISK_LEVELS.index(risk_level)]))[0]
+    
+    def _generate_legitimate_batch(self, n: int, now: Optional[datetime] = None) -> List[SyntheticDetection]:
+        """Generate n legitimate detections from one set of vectorized draws"""
+        rng = self.rng
+        channels = rng.integers(0, len(self.LEGITIMATE_CHANNELS), n)
+        titles = rng.integers(0, len(self.LEGITIMATE_TITLES), n)
+        is_live = (rng.random(n) < 0.2).tolist()
+        video_risk = rng.uniform(0, 25, n).tolist()
+        channel_risk = rng.uniform(0, 15, n).tolist()
+        total_risk = rng.uniform(0, 30, n).tolist()
+        queries = rng.integers(0, 3, n)
+        video_ids = self._generate_ids(n, 11)
+        channel_ids = self._generate_ids(n, 22)
+        
+        # One clock read per batch; titles are formatted once rather than per record
+        now = now or datetime.now()
+        detected_at = now.isoformat()
+        date = now.strftime("%Y-%m-%d")
+        legitimate_titles = [title.format(date=date) for title in self.LEGITIMATE_TITLES]
+        legitimate_channels = self.LEGITIMATE_CHANNELS
+        search_queries = ('tech news', 'gaming', 'tutorials')
         
-        # Generate title and description
-        video_title = random.choice(self.SCAM_TITLES).format(target=target_fake)
-        video_description = random.choice(self.SCAM_DESCRIPTIONS)
+        return [
+            SyntheticDetection(
+                video_id=video_ids[i],
+                video_title=legitimate_titles[titles[i]],
+                channel_id="UC" + channel_ids[i],
+                channel_title=legitimate_channels[channels[i]],
+                is_live=is_live[i],
+                video_risk_score=video_risk[i],
+                channel_risk_score=channel_risk[i],
+                total_risk_score=total_risk[i],
+                video_signals=(),
+                channel_signals=(),
+                top_signals='',
+                detected_at=detected_at,
+                search_query=search_queries[queries[i]]
+            )
+            for i in range(n)
+        ]
+    
+    def _generate_suspicious_batch(self, level_codes: np.ndarray,
+                                   now: Optional[datetime] = None) -> List[SyntheticDetection]:
+        """Generate one suspicious detection per risk level code (see RISK_LEVELS),
+        across all levels from one set of vectorized draws"""
+        rng = self.rng
+        n = len(level_codes)
+        # Choose impersonation target/variation pairs
+        targets = rng.integers(0, len(self.TARGET_VARIATIONS), n)
+        titles = rng.integers(0, len(self.SCAM_TITLES), n)
+        
+        # Adjust risk scores, with each record's ranges selected by its level
+        bounds = self.RISK_BOUNDS[level_codes]
+        video_risk = rng.uniform(bounds[:, 0, 0], bounds[:, 0, 1])
+        channel_risk = rng.uniform(bounds[:, 1, 0], bounds[:, 1, 1])
+        total_risk = video_risk + (channel_risk * 0.5)
+        video_risk, channel_risk, total_risk = video_risk.tolist(), channel_risk.tolist(), total_risk.tolist()
+        
+        # 70% of scams are live; 60% of those restrict comments
+        is_live = (rng.random(n) < 0.7).tolist()
+        restricted = (rng.random(n) < 0.6).tolist()
+        hours_ago = rng.integers(0, 49, n)
+        queries = rng.integers(0, 4, n)
+        video_ids = self._generate_ids(n, 11)
+        channel_ids = self._generate_ids(n, 22)
+        
+        # Detection times as one datetime64 subtraction, formatted to ISO strings in bulk
+        now = now or datetime.now()
+        detected_at = (np.datetime64(now, 'us') - hours_ago.astype('timedelta64[h]')).astype(str).tolist()
+        target_variations = self.TARGET_VARIATIONS
+        title_parts = self.SCAM_TITLE_PARTS
+        dataset = []
+        append = dataset.append
+        risk_levels = self.RISK_LEVELS
+        levels = level_codes.tolist()
+        # Signal tuples depend only on (level, target, live, restricted), so records
+        # sharing them share one immutable tuple instead of fresh lists
+        signal_cache = {}
+        for i in range(n):
+            target_original, target_fake = target_variations[targets[i]]
+            title_prefix, title_suffix = title_parts[titles[i]]
+            
+            key = (levels[i], target_original, is_live[i], restricted[i])
+            cached = signal_cache.get(key)
+            if cached is None:
+                cached = signal_cache[key] = self._suspicious_signals(risk_levels[key[0]], *key[1:])
+            video_signals, channel_signals, top_signals, search_queries = cached
+            
+            append(SyntheticDetection(
+                video_id=video_ids[i],
+                video_title=title_prefix + target_fake + title_suffix,
+                channel_id="UC" + channel_ids[i],
+                channel_title=target_fake,
+                is_live=is_live[i],
+                video_risk_score=round(video_risk[i], 1),
+                channel_risk_score=round(channel_risk[i], 1),
+                total_risk_score=round(total_risk[i], 1),
+                video_signals=video_signals,
+                channel_signals=channel_signals,
+                top_signals=top_signals,
+                detected_at=detected_at[i],
+                search_query=search_queries[queries[i]]
+            ))
         
+        return dataset
+    
+    @staticmethod
+    def _suspicious_signals(risk_level: str, target_original: str, is_live: bool,
+                            restricted: bool) -> Tuple[Tuple[str, ...], Tuple[str, ...], str, Tuple[str, ...]]:
+        """Video signals, channel signals, top signals and search queries for one kind of record"""
         # Generate signals based on risk level
         video_signals = []
         channel_signals = []
@@ -140,47 +289,22 @@ Join thousands of successful participants
             video_signals.append("Multiple scam keywords: giveaway, crypto")
             channel_signals.append("Crypto-heavy description (3 keywords)")
         
-        # Adjust risk scores
-        if risk_level == 'high':
-            video_risk = random.uniform(65, 90)
-            channel_risk = random.uniform(45, 70)
-        elif risk_level == 'medium':
-            video_risk = random.uniform(35, 55)
-            channel_risk = random.uniform(25, 40)
-        else:  # low
-            video_risk = random.uniform(25, 40)
-            channel_risk = random.uniform(15, 25)
-        
-        total_risk = video_risk + (channel_risk * 0.5)
-        
         # Add live streaming signals if applicable
-        is_live = random.random() < 0.7  # 70% of scams are live
         if is_live:
             video_signals.append("Currently live streaming")
-            if random.random() < 0.6:
+            if restricted:
                 video_signals.append("High views but restricted comments")
         
-        return {
-            'video_id': self.generate_video_id(),
-            'video_title': video_title,
-            'channel_id': self.generate_channel_id(),
-            'channel_title': target_fake,
-            'is_live': is_live,
-            'video_risk_score': round(video_risk, 1),
-            'channel_risk_score': round(channel_risk, 1),
-            'total_risk_score': round(total_risk, 1),
-            'video_signals': video_signals,
-            'channel_signals': channel_signals,
-            'detected_at': (datetime.now() - timedelta(
-                hours=random.randint(0, 48)
-            )).isoformat(),
-            'search_query': random.choice([
-                'crypto giveaway live',
-                'ethereum event',
-                'bitcoin doubling',
-                f'{target_original} crypto'
-            ])
-        }
+        search_queries = (
+            'crypto giveaway live',
+            'ethereum event',
+            'bitcoin doubling',
+            f'{target_original} crypto'
+        )
+        
+        # Top signals are precomputed for validation exports (validation_helper.create_validation_csv)
+        top_signals = '; '.join(islice(chain(video_signals, channel_signals), 3))
+        return tuple(video_signals), tuple(channel_signals), top_signals, search_queries
     
     def generate_dataset(
         self,
@@ -188,7 +312,7 @@ Join thousands of successful participants
         num_medium_risk: int = 15,
         num_low_risk: int = 10,
         num_legitimate: int = 5
-    ) -> List[Dict]:
+    ) -> List[SyntheticDetection]:
         """
         Generate complete test dataset
         
@@ -198,35 +322,42 @@ Join thousands of successful participants
             num_low_risk: Number of low-risk detections
             num_legitimate: Number of legitimate channels (false positives)
         """
-        dataset = []
-        
-        # Generate high-risk detections
-        for _ in range(num_high_risk):
-            dataset.append(self.generate_suspicious_detection('high'))
-        
-        # Generate medium-risk detections
-        for _ in range(num_medium_risk):
-            dataset.append(self.generate_suspicious_detection('medium'))
+        now = datetime.now()
         
-        # Generate low-risk detections
-        for _ in range(num_low_risk):
-            dataset.append(self.generate_suspicious_detection('low'))
+        # Lay out every record's kind in shuffled order up front (a permutation of small
+        # ints rather than a shuffle of the records), with legitimate coded past RISK_LEVELS
+        legitimate_code = len(self.RISK_LEVELS)
+        kinds = self.rng.permutation(np.repeat(
+            [self.RISK_LEVELS.index(level) for level in ('high', 'medium', 'low')] + [legitimate_code],
+            [num_high_risk, num_medium_risk, num_low_risk, num_legitimate]
+        ))
+        is_legitimate = kinds == legitimate_code
         
-        # Generate legitimate channels
-        for _ in range(num_legitimate):
-            dataset.append(self.generate_legitimate_detection())
+        # All suspicious tiers come from one batch of vectorized draws, keyed by level code
+        suspicious = iter(self._generate_suspicious_batch(kinds[~is_legitimate], now))
+        legitimate = iter(self._generate_legitimate_batch(num_legitimate, now))
         
-        # Shuffle to mix risk levels
-        random.shuffle(dataset)
-        
-        return dataset
+        # Fill the slots in order, so risk levels come out already mixed
+        return [next(legitimate) if legit else next(suspicious) for legit in is_legitimate.tolist()]
     
     def save_dataset(self, filename: str, **kwargs):
         """Generate and save test dataset"""
         dataset = self.generate_dataset(**kwargs)
         
-        with open(filename, 'w') as f:
-            json.dump(dataset, f, indent=2)
+        # Encode SAVE_CHUNK_SIZE records at a time so the whole JSON document is never held
+        # in memory: each chunk is an indented array whose items are spliced into one array
+        with open(filename, 'wb') as f:
+            f.write(b'[')
+            for start in range(0, len(dataset), SAVE_CHUNK_SIZE):
+                chunk = dataset[start:start + SAVE_CHUNK_SIZE]
+                if orjson:
+                    encoded = orjson.dumps(chunk, option=orjson.OPT_INDENT_2)
+                else:
+                    encoded = json.dumps(chunk, indent=2, default=SyntheticDetection.to_dict).encode('utf-8')
+                if start:
+                    f.write(b',')
+                f.write(encoded[1:-2])  # Drop the chunk's opening '[' and closing '\n]'
+            f.write(b'\n]' if dataset else b']')
         
         print(f"Generated {len(dataset)} test samples")
         print(f"Saved to {filename}")
@@ -4,46 +4,55 @@ Validation Helper - Prepare sample for manual ground truth labeling
 
 import json
 import random
+import sys
+from itertools import chain, islice
 from typing import List, Dict
-import csv
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Tier boundaries on total_risk_score, and the np.digitize tier codes they produce
+RISK_THRESHOLDS = (40, 70)
+LOW_RISK, MEDIUM_RISK, HIGH_RISK = 0, 1, 2
 
 
 def load_results(filepath: str) -> List[Dict]:
     """Load detection results"""
-    with open(filepath, 'r') as f:
-        data = json.load(f)
+    with open(filepath, 'rb') as f:
+        data = orjson.loads(f.read()) if orjson else json.load(f)
         if isinstance(data, dict) and 'results' in data:
             return data['results']
         return data
 
 
+def risk_tiers(results: List[Dict]) -> np.ndarray:
+    """Risk tier per result as a NumPy column: LOW_RISK (<40), MEDIUM_RISK (40-69), HIGH_RISK (>=70)"""
+    scores = np.fromiter((r['total_risk_score'] for r in results), dtype=np.float64, count=len(results))
+    return np.digitize(scores, RISK_THRESHOLDS)
+
+
 def stratified_sample(results: List[Dict], 
                      high_risk_n: int = 25,
                      medium_risk_n: int = 20,
                      low_risk_n: int = 5) -> List[Dict]:
     """Create stratified sample across risk levels"""
     
-    high_risk = [r for r in results if r['total_risk_score'] >= 70]
-    medium_risk = [r for r in results if 40 <= r['total_risk_score'] < 70]
-    low_risk = [r for r in results if r['total_risk_score'] < 40]
-    
-    # Sample from each tier
-    sample = []
+    tiers = risk_tiers(results)
+    # Seeded from the random module so random.seed() keeps samples reproducible
+    rng = np.random.default_rng(random.getrandbits(64))
     
-    if len(high_risk) >= high_risk_n:
-        sample.extend(random.sample(high_risk, high_risk_n))
-    else:
-        sample.extend(high_risk)
-    
-    if len(medium_risk) >= medium_risk_n:
-        sample.extend(random.sample(medium_risk, medium_risk_n))
-    else:
-        sample.extend(medium_risk)
-    
-    if len(low_risk) >= low_risk_n:
-        sample.extend(random.sample(low_risk, low_risk_n))
-    else:
-        sample.extend(low_risk)
+    # Sample row indices from each tier (the whole tier when it is smaller than requested).
+    # For small samples from large tiers Generator.choice uses Floyd's algorithm (O(k)
+    # memory); the within-tier shuffle is skipped since the whole sample is shuffled below
+    chosen = []
+    for tier, n in ((HIGH_RISK, high_risk_n), (MEDIUM_RISK, medium_risk_n), (LOW_RISK, low_risk_n)):
+        tier_idx = np.flatnonzero(tiers == tier)
+        chosen.extend(rng.choice(tier_idx, size=min(n, tier_idx.size), replace=False, shuffle=False).tolist())
+    sample = [results[i] for i in chosen]
     
     # Shuffle to avoid order bias during manual review
     random.shuffle(sample)
@@ -53,6 +62,7 @@ def stratified_sample(results: List[Dict],
 
 def create_validation_csv(sample: List[Dict], output_file: str):
     """Create CSV template for manual labeling"""
+    import csv  # Only the CSV export needs it
     
     with open(output_file, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
@@ -71,24 +81,30 @@ def create_validation_csv(sample: List[Dict], output_file: str):
             'Notes'
         ])
         
-        # Data rows
-        for idx, result in enumerate(sample, 1):
-            # Get top 3 signals
-            all_signals = result.get('video_signals', []) + result.get('channel_signals', [])
-            top_signals = '; '.join(all_signals[:3]) if all_signals else 'None'
-            
-            writer.writerow([
-                idx,
-                result.get('video_url', ''),
-                result.get('channel_url', ''),
-                result.get('video_title', '')[:80],  # Truncate long titles
-                result.get('channel_title', ''),
-                result.get('total_risk_score', 0),
-                result.get('risk_category', 'UNKNOWN'),
-                top_signals[:150],  # Truncate long signal lists
-                '',  # Empty for manual labeling
-                ''   # Empty for notes
-            ])
+        # Data rows, handed to the writer as one generator
+        def rows():
+            for idx, result in enumerate(sample, 1):
+                get = result.get
+                # Get top 3 signals (precomputed by producers that set 'top_signals'),
+                # without concatenating the signal lists
+                top_signals = (get('top_signals')
+                               or '; '.join(islice(chain(get('video_signals', ()), get('channel_signals', ())), 3))
+                               or 'None')
+                
+                yield (
+                    idx,
+                    get('video_url', ''),
+                    get('channel_url', ''),
+                    get('video_title', '')[:80],  # Truncate long titles
+                    get('channel_title', ''),
+                    get('total_risk_score', 0),
+                    get('risk_category', 'UNKNOWN'),
+                    top_signals[:150],  # Truncate long signal lists
+                    '',  # Empty for manual labeling
+                    ''   # Empty for notes
+                )
+        
+        writer.writerows(rows())
     
     print(f"✅ Created validation CSV: {output_file}")
     print(f"   {len(sample)} samples ready for manual review")
@@ -124,61 +140,71 @@ def create_validation_json(sample: List[Dict], output_file: str):
         }
         validation_data.append(validation_entry)
     
-    with open(output_file, 'w') as f:
-        json.dump(validation_data, f, indent=2)
+    with open(output_file, 'wb') as f:
+        if orjson:
+            f.write(orjson.dumps(validation_data, option=orjson.OPT_INDENT_2))
+        else:
+            f.write(json.dumps(validation_data, indent=2).encode('utf-8'))
     
     print(f"✅ Created validation JSON: {output_file}")
     print(f"   {len(validation_data)} samples ready for manual review")
 
 
+# Printed in one write rather than line by line
+_RULE = "=" * 80
+VALIDATION_INSTRUCTIONS = f"""
+{_RULE}
+MANUAL VALIDATION INSTRUCTIONS
+{_RULE}
+
+📋 LABELING GUIDELINES:
+
+1. For each entry, visit the YouTube URL and examine:
+   • Video title and description
+   • Channel name and about section
+   • Video content (if still available)
+   • Comments section (if enabled)
+   • Channel history and other videos
+
+2. Assign Ground Truth Label:
+   • 'true_positive' - Definitely stream-jacking/scam
+   • 'false_positive' - Legitimate content
+   • 'uncertain' - Unclear, needs more investigation
+
+3. Common Stream-Jacking Indicators:
+   ✓ Impersonating celebrities/brands
+   ✓ Crypto giveaway scams
+   ✓ Fake live events with scam links
+   ✓ Hijacked accounts with suspicious content
+   ✓ Urgent language pushing immediate action
+
+4. Common False Positives:
+   ✓ Legitimate news channels (Bloomberg, CNBC)
+   ✓ Educational crypto content
+   ✓ Space enthusiast channels (LabPadre)
+   ✓ Legitimate company channels
+
+5. Document Your Reasoning:
+   • Why you classified it this way
+   • What made it obvious or unclear
+   • Any patterns you notice
+
+{_RULE}
+
+💡 TIP: Review in batches of 10-15 to maintain consistency
+💡 TIP: Take breaks to avoid decision fatigue
+{_RULE}
+
+"""
+
+
 def print_validation_instructions():
     """Print instructions for manual validation"""
-    
-    print("\n" + "="*80)
-    print("MANUAL VALIDATION INSTRUCTIONS")
-    print("="*80)
-    
-    print("\n📋 LABELING GUIDELINES:")
-    print("\n1. For each entry, visit the YouTube URL and examine:")
-    print("   • Video title and description")
-    print("   • Channel name and about section")
-    print("   • Video content (if still available)")
-    print("   • Comments section (if enabled)")
-    print("   • Channel history and other videos")
-    
-    print("\n2. Assign Ground Truth Label:")
-    print("   • 'true_positive' - Definitely stream-jacking/scam")
-    print("   • 'false_positive' - Legitimate content")
-    print("   • 'uncertain' - Unclear, needs more investigation")
-    
-    print("\n3. Common Stream-Jacking Indicators:")
-    print("   ✓ Impersonating celebrities/brands")
-    print("   ✓ Crypto giveaway scams")
-    print("   ✓ Fake live events with scam links")
-    print("   ✓ Hijacked accounts with suspicious content")
-    print("   ✓ Urgent language pushing immediate action")
-    
-    print("\n4. Common False Positives:")
-    print("   ✓ Legitimate news channels (Bloomberg, CNBC)")
-    print("   ✓ Educational crypto content")
-    print("   ✓ Space enthusiast channels (LabPadre)")
-    print("   ✓ Legitimate company channels")
-    
-    print("\n5. Document Your Reasoning:")
-    print("   • Why you classified it this way")
-    print("   • What made it obvious or unclear")
-    print("   • Any patterns you notice")
-    
-    print("\n" + "="*80)
-    print("\n💡 TIP: Review in batches of 10-15 to maintain consistency")
-    print("💡 TIP: Take breaks to avoid decision fatigue")
-    print("="*80 + "\n")
+    sys.stdout.write(VALIDATION_INSTRUCTIONS)
 
 
 def main():
     """Generate validation samples"""
-    import sys
-    
     # Set random seed for reproducibility
     random.seed(42)
     
@@ -194,9 +220,7 @@ def main():
     print(f"Total results: {len(results)}")
     
     # Count by risk level
-    high = sum(1 for r in results if r['total_risk_score'] >= 70)
-    medium = sum(1 for r in results if 40 <= r['total_risk_score'] < 70)
-    low = sum(1 for r in results if r['total_risk_score'] < 40)
+    low, medium, high = np.bincount(risk_tiers(results), minlength=3).tolist()
     
     print(f"Risk distribution:")
     print(f"  High (≥70):   {high}")
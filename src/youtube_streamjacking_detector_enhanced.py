@@ -13,11 +13,17 @@ This version adds:
 
 import os
 import re
+import copy
 import time
 import argparse
 import random
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import takewhile
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 import json
 from dotenv import load_dotenv
@@ -30,24 +36,93 @@ try:
 except ImportError:
     CRYPTOBERT_AVAILABLE = False
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 try:
     from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
+    from googleapiclient.http import build_http
 except ImportError:
     print("Please install: pip install google-api-python-client --break-system-packages")
     exit(1)
 
 try:
-    from pymongo import MongoClient
-    from pymongo.errors import ConnectionFailure, OperationFailure
+    from pymongo import MongoClient, UpdateOne
+    from pymongo.errors import BulkWriteError, ConnectionFailure, OperationFailure
     MONGODB_AVAILABLE = True
 except ImportError:
     MONGODB_AVAILABLE = False
     print("⚠️  Warning: pymongo not installed. MongoDB storage disabled.")
     print("   Install with: pip install pymongo")
 
+# Detection upserts sent per bulk_write round-trip
+BULK_BATCH_SIZE = 1000
+
+# Detections are appended here as each query finishes, so a crashed run keeps its results;
+# the log is never truncated, so earlier runs survive the next launch
+RESULTS_LOG_FILE = 'data/results/streamjacking_detection_results.jsonl'
 
-@dataclass
+# Streams analyzed concurrently; analysis waits mostly on live chat and channel history calls
+ANALYSIS_WORKERS = 8
+
+# Searches run ahead of the query being processed, overlapping their round-trips with analysis
+SEARCH_WORKERS = 4
+
+
+def _build_keyword_automaton(keywords: List[str]) -> Optional['ahocorasick.Automaton']:
+    """Build one automaton mapping each keyword to (list position, keyword)"""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for position, keyword in enumerate(keywords):
+        automaton.add_word(keyword, (position, keyword))
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_category_automaton(categories: Dict[str, List[str]]) -> Optional['ahocorasick.Automaton']:
+    """Build one automaton over several keyword lists, mapping each keyword to
+    (keyword, ((category, list position), ...)) so a single scan serves every list"""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    tags = {}
+    for category, keywords in categories.items():
+        for position, keyword in enumerate(keywords):
+            tags.setdefault(keyword, []).append((category, position))
+    automaton = ahocorasick.Automaton()
+    for keyword, keyword_tags in tags.items():
+        automaton.add_word(keyword, (keyword, tuple(keyword_tags)))
+    automaton.make_automaton()
+    return automaton
+
+
+def _json_line(obj) -> bytes:
+    """One compact UTF-8 JSON Lines record, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY)
+    return (json.dumps(obj) + '\n').encode('utf-8')
+
+
+def _write_json(path: str, obj):
+    """Write obj as indented JSON, using orjson when installed"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2)
+
+
+@dataclass(slots=True)
 class EnhancedChannelMetadata:
     """Extended channel metadata with additional fields"""
     channel_id: str
@@ -75,7 +150,7 @@ class EnhancedChannelMetadata:
     risk_category: str = "unknown"  # critical, high, medium, low
 
 
-@dataclass
+@dataclass(slots=True)
 class EnhancedVideoMetadata:
     """Extended video metadata"""
     video_id: str
@@ -100,12 +175,21 @@ class EnhancedVideoMetadata:
     suspicious_signals: List[str] = field(default_factory=list)
     risk_score: float = 0.0
     confidence_score: float = 0.0
+    risk_category: str = "unknown"  # critical, high, medium, low
     bert_scam_score: float = 0.0  # Signal 12: CryptoBERT semantic scam score
+    
+    # Lowercased title/description, set by analyze_video_enhanced for reuse by the composite rules
+    title_lower: Optional[str] = field(default=None, repr=False)
+    description_lower: Optional[str] = field(default=None, repr=False)
 
 
 class MongoDBManager:
     """Manages MongoDB connection and upsert operations for detection results"""
     
+    # Detection fields fixed for a given video_id: written on insert only, so repeat
+    # detections $set just the scoring fields that can change between scans
+    IMMUTABLE_DETECTION_FIELDS = ('video_id', 'channel_id', 'video_url', 'channel_url')
+    
     def __init__(self, connection_string: Optional[str] = None, database_name: str = 'streamjacking_detector'):
         """
         Initialize MongoDB connection
@@ -131,12 +215,14 @@ class MongoDBManager:
             self.db = self.client[database_name]
             self.collection = self.db['detection_results_latest']
             
-            # Create indexes for efficient querying
+            # Create indexes for efficient querying, before any write. The unique video_id
+            # index serves the upsert filter as a single seek; a (video_id, ...) compound would
+            # only duplicate it and add another index update to every upsert
             self.collection.create_index('video_id', unique=True)
-            self.collection.create_index('channel_id')
+            # Per-channel lookups, newest first; the prefix also serves plain channel_id queries
+            self.collection.create_index([('channel_id', 1), ('detected_at', -1)])
             self.collection.create_index('detected_at')
             self.collection.create_index('risk_category')
-            self.collection.create_index([('video_id', 1), ('detected_at', -1)])
             
             print("✅ MongoDB connected successfully")
             
@@ -161,17 +247,10 @@ class MongoDBManager:
             return False
             
         try:
-            # Add first_detected timestamp if new record
-            detection_copy = detection.copy()
-            
             # Use video_id as unique identifier
-            result = self.collection.update_one(
+            self.collection.update_one(
                 {'video_id': detection['video_id']},
-                {
-                    '$set': detection_copy,
-                    '$setOnInsert': {'first_detected': detection['detected_at']},
-                    '$inc': {'detection_count': 1}
-                },
+                self._upsert_update(detection),
                 upsert=True
             )
             
@@ -191,16 +270,41 @@ class MongoDBManager:
         Returns:
             Number of successfully upserted records
         """
-        if not self.collection or not detections:
+        if self.collection is None or not detections:
             return 0
             
         success_count = 0
-        for detection in detections:
-            if self.upsert_detection(detection):
-                success_count += 1
+        # One unordered bulk_write per BULK_BATCH_SIZE detections instead of a round-trip each
+        for start in range(0, len(detections), BULK_BATCH_SIZE):
+            ops = [
+                UpdateOne({'video_id': detection['video_id']}, self._upsert_update(detection), upsert=True)
+                for detection in detections[start:start + BULK_BATCH_SIZE]
+            ]
+            try:
+                result = self.collection.bulk_write(ops, ordered=False)
+                success_count += result.upserted_count + result.matched_count
+            except BulkWriteError as e:
+                # Unordered: the rest of the batch was still applied
+                details = e.details
+                success_count += details.get('nUpserted', 0) + details.get('nMatched', 0)
+                print(f"   ⚠️  MongoDB bulk upsert: {len(details.get('writeErrors', []))} detections failed")
+            except Exception as e:
+                print(f"   ⚠️  MongoDB bulk upsert failed: {e}")
         
         return success_count
     
+    @classmethod
+    def _upsert_update(cls, detection: Dict) -> Dict:
+        """Update document for upserting a detection by video_id"""
+        immutable = {k: detection[k] for k in cls.IMMUTABLE_DETECTION_FIELDS if k in detection}
+        # Add first_detected timestamp if new record
+        immutable['first_detected'] = detection['detected_at']
+        return {
+            '$set': {k: v for k, v in detection.items() if k not in cls.IMMUTABLE_DETECTION_FIELDS},
+            '$setOnInsert': immutable,
+            '$inc': {'detection_count': 1}
+        }
+    
     def video_exists(self, video_id: str) -> bool:
         """Check if video already exists in collection
         
@@ -282,8 +386,25 @@ class EnhancedYouTubeAPIClient:
         self._key_idx: int = 0
         self._exhausted: Set[str] = set()
         self._per_key_quota: Dict[str, int] = {k: 0 for k in self._keys}
-        self.youtube = build('youtube', 'v3', developerKey=self._keys[0])
+        # One keep-alive HTTP connection shared by every main-thread request and kept across
+        # key rotations; worker threads each get their own (httplib2 is not thread-safe)
+        self._http = build_http()
+        self._thread_state = threading.local()
+        # Service client for the active key, built on first use
+        self._youtube = None
         self.quota_used = 0
+        # Guards quota counters and key rotation when requests run on worker threads
+        self._quota_lock = threading.Lock()
+        # Batch calls rejected with 429/403 rate or quota errors (read by callers to back off)
+        self.rate_limited_calls = 0
+        # Metadata caches: id -> (fetched_at, meta or None), least recently used first.
+        # A channel hosting many streams is fetched once per TTL instead of once per video
+        self._channel_cache: Dict[str, Tuple[float, Optional[EnhancedChannelMetadata]]] = {}
+        self._video_cache: Dict[str, Tuple[float, Optional[EnhancedVideoMetadata]]] = {}
+        # Upload histories: channel id -> (fetched_at, (video_items, playlist_id)), shared by
+        # channel analysis and ATO classification of every stream on the channel
+        self._history_cache: Dict[str, Tuple[float, Tuple[List[Dict], str]]] = {}
+        self._cache_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Key rotation
@@ -293,23 +414,70 @@ class EnhancedYouTubeAPIClient:
     def _active_key(self) -> str:
         return self._keys[self._key_idx]
 
-    def _rotate_key(self) -> bool:
-        """Mark the current key as exhausted and switch to the next available one.
-        Returns True if a new key is available, False if all keys are exhausted."""
-        self._exhausted.add(self._active_key)
-        remaining = [k for k in self._keys if k not in self._exhausted]
-        if not remaining:
-            print("\n⛔ All API keys exhausted for today. Stopping further requests.")
-            return False
-        self._key_idx = self._keys.index(remaining[0])
-        self.youtube = build('youtube', 'v3', developerKey=self._active_key)
-        print(f"\n🔄 API key rotated → key {self._key_idx + 1}/{len(self._keys)} "
-              f"({len(self._exhausted)} exhausted, {len(remaining) - 1} remaining after this)")
-        return True
+    @property
+    def youtube(self):
+        """YouTube service client for the active key, built lazily on the shared HTTP connection"""
+        return self._service()[1]
+
+    def _service(self) -> Tuple[str, object]:
+        """(active key, service client for it), read together so a request can report
+        which key it was built with if that key turns out to be exhausted"""
+        with self._quota_lock:
+            if self._youtube is None:
+                self._youtube = build('youtube', 'v3', developerKey=self._active_key,
+                                      http=self._http, cache_discovery=False)
+            return self._active_key, self._youtube
+
+    def _thread_http(self):
+        """HTTP transport for the calling thread"""
+        if threading.current_thread() is threading.main_thread():
+            return self._http
+        http = getattr(self._thread_state, 'http', None)
+        if http is None:
+            http = self._thread_state.http = build_http()
+        return http
+
+    def _execute(self, request, cost: int, http=None, key: Optional[str] = None) -> Dict:
+        """Execute an API request on the calling thread's transport and charge its quota
+        cost to the key it was built with (the active key if not given)"""
+        response = request.execute(http=http or self._thread_http())
+        with self._quota_lock:
+            key = key or self._active_key
+            self.quota_used += cost
+            self._per_key_quota[key] = self._per_key_quota.get(key, 0) + cost
+        return response
+
+    def _rotate_key(self, failed_key: Optional[str] = None) -> bool:
+        """Mark failed_key (default: the current key) as exhausted and switch to the next
+        available one. Requests running concurrently may all fail on the same key, so
+        only the first report rotates; later ones just retry on the key already active.
+        Returns True if a usable key is available, False if all keys are exhausted."""
+        with self._quota_lock:
+            if failed_key is None:
+                failed_key = self._active_key
+            self._exhausted.add(failed_key)
+            if failed_key != self._active_key and self._active_key not in self._exhausted:
+                return True
+            remaining = [k for k in self._keys if k not in self._exhausted]
+            if not remaining:
+                print("\n⛔ All API keys exhausted for today. Stopping further requests.")
+                return False
+            self._key_idx = self._keys.index(remaining[0])
+            self._youtube = None
+            print(f"\n🔄 API key rotated → key {self._key_idx + 1}/{len(self._keys)} "
+                  f"({len(self._exhausted)} exhausted, {len(remaining) - 1} remaining after this)")
+            return True
 
     def _is_quota_error(self, e: HttpError) -> bool:
         return e.resp.status == 403 and 'quotaExceeded' in str(e)
 
+    def _is_rate_limited(self, e: HttpError) -> bool:
+        if e.resp.status == 429:
+            return True
+        reason = str(e)
+        return e.resp.status == 403 and ('rateLimitExceeded' in reason or 'userRateLimitExceeded' in reason
+                                         or 'quotaExceeded' in reason)
+
     def quota_summary(self) -> str:
         """Return a formatted per-key quota usage summary."""
         lines = [f"\n🔑 API Key Quota Summary ({len(self._keys)} key(s)):"]
@@ -323,20 +491,19 @@ class EnhancedYouTubeAPIClient:
     def get_channel_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
         """Get the uploads playlist ID for a channel (costs 1 quota unit)"""
         for _ in range(len(self._keys)):
+            key, youtube = self._service()
             try:
-                request = self.youtube.channels().list(
+                request = youtube.channels().list(
                     part="contentDetails",
                     id=channel_id
                 )
-                response = request.execute()
-                self.quota_used += 1
-                self._per_key_quota[self._active_key] = self._per_key_quota.get(self._active_key, 0) + 1
+                response = self._execute(request, 1, key=key)
                 if not response.get('items'):
                     return None
                 return response['items'][0].get('contentDetails', {}).get('relatedPlaylists', {}).get('uploads')
             except HttpError as e:
                 if self._is_quota_error(e):
-                    if not self._rotate_key():
+                    if not self._rotate_key(key):
                         return None
                     continue
                 print(f"API Error fetching uploads playlist: {e}")
@@ -351,23 +518,22 @@ class EnhancedYouTubeAPIClient:
         for _ in range(max_pages):
             fetched = False
             for _ in range(len(self._keys)):
+                key, youtube = self._service()
                 try:
-                    request = self.youtube.playlistItems().list(
+                    request = youtube.playlistItems().list(
                         part="snippet,contentDetails",
                         playlistId=playlist_id,
                         maxResults=50,
                         pageToken=next_page_token
                     )
-                    response = request.execute()
-                    self.quota_used += 1
-                    self._per_key_quota[self._active_key] = self._per_key_quota.get(self._active_key, 0) + 1
+                    response = self._execute(request, 1, key=key)
                     all_items.extend(response.get('items', []))
                     next_page_token = response.get('nextPageToken')
                     fetched = True
                     break
                 except HttpError as e:
                     if self._is_quota_error(e):
-                        if not self._rotate_key():
+                        if not self._rotate_key(key):
                             return all_items
                         continue
                     print(f"API Error fetching playlist items: {e}")
@@ -380,53 +546,153 @@ class EnhancedYouTubeAPIClient:
     def get_channel_history(self, channel_id: str) -> Tuple[List[Dict], Optional[str]]:
         """Fetch a channel's historical video list via the uploads playlist (cheap: ~3 quota units total).
         
+        Histories are cached per channel; a missing playlist is not cached, since the
+        lookup also comes back empty when it fails.
+        
         Returns:
             Tuple of (video_items, playlist_id)
         """
+        hit, cached = self._get_cached(self._history_cache, channel_id)
+        if hit:
+            return cached
         playlist_id = self.get_channel_uploads_playlist_id(channel_id)
         if not playlist_id:
             return [], None
         videos = self.get_playlist_items(playlist_id, max_pages=2)
+        self._cache(self._history_cache, channel_id, (videos, playlist_id))
         return videos, playlist_id
+
+    def get_channel_histories(
+        self,
+        channel_ids: List[str],
+        max_workers: int = ANALYSIS_WORKERS
+    ) -> Dict[str, Tuple[List[Dict], Optional[Exception]]]:
+        """Fetch several channels' video histories concurrently, keyed by channel ID
         
+        Each value is (video_items, error); a failed fetch yields no items and its exception.
+        """
+        def fetch(channel_id: str) -> Tuple[List[Dict], Optional[Exception]]:
+            try:
+                return self.get_channel_history(channel_id)[0], None
+            except Exception as e:
+                return [], e
+        
+        unique_ids = list(dict.fromkeys(channel_ids))
+        if len(unique_ids) <= 1 or max_workers <= 1:
+            return {channel_id: fetch(channel_id) for channel_id in unique_ids}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_ids))) as executor:
+            return dict(zip(unique_ids, executor.map(fetch, unique_ids)))
+        
+    # YouTube's videos.list / channels.list accept at most this many ids per call
+    MAX_IDS_PER_REQUEST = 50
+    CHANNEL_PARTS = "snippet,statistics,contentDetails,topicDetails,brandingSettings,status"
+    VIDEO_PARTS = "snippet,statistics,liveStreamingDetails,contentDetails,status"
+    
+    # Metadata cache bounds (least recently used evicted first; entries refetched after the TTL)
+    METADATA_CACHE_SIZE = 4096
+    METADATA_CACHE_TTL = 3600
+
+    def _get_cached(self, cache: Dict, key: str) -> Tuple[bool, Optional[object]]:
+        """Look up cached metadata, returning (hit, copy of meta) and dropping expired entries
+        
+        Callers get a copy so annotating detection results never touches the cache.
+        """
+        with self._cache_lock:
+            entry = cache.pop(key, None)
+            if entry is None or time.monotonic() - entry[0] > self.METADATA_CACHE_TTL:
+                return False, None
+            cache[key] = entry  # Re-insert as most recently used
+        return True, copy.deepcopy(entry[1])
+
+    def _cache(self, cache: Dict, key: str, meta: Optional[object]):
+        """Store fetched metadata, evicting the least recently used entry when full"""
+        with self._cache_lock:
+            cache.pop(key, None)
+            if len(cache) >= self.METADATA_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[key] = (time.monotonic(), copy.deepcopy(meta))
+
+    def _split_cached(self, cache: Dict, ids: List[str]) -> Tuple[Dict, List[str]]:
+        """Serve ids from the cache, returning (cached results, ids still to fetch)"""
+        results = {}
+        pending = []
+        for key in dict.fromkeys(ids):
+            hit, meta = self._get_cached(cache, key)
+            if not hit:
+                pending.append(key)
+            elif meta is not None:
+                results[key] = meta
+        return results, pending
+
+    @staticmethod
+    def _parse_channel_item(channel_id: str, item: Dict) -> EnhancedChannelMetadata:
+        snippet = item.get('snippet', {})
+        statistics = item.get('statistics', {})
+        branding = item.get('brandingSettings', {})
+        topics = item.get('topicDetails', {})
+        return EnhancedChannelMetadata(
+            channel_id=channel_id,
+            channel_title=snippet.get('title', ''),
+            custom_url=snippet.get('customUrl'),
+            handle=branding.get('channel', {}).get('unsubscribedTrailer'),
+            description=snippet.get('description', ''),
+            subscriber_count=int(statistics.get('subscriberCount', 0)),
+            video_count=int(statistics.get('videoCount', 0)),
+            view_count=int(statistics.get('viewCount', 0)),
+            published_at=snippet.get('publishedAt', ''),
+            country=snippet.get('country'),
+            thumbnail_url=snippet.get('thumbnails', {}).get('high', {}).get('url', ''),
+            topic_categories=topics.get('topicCategories', []),
+            branding_settings=branding,
+            hidden_subscriber_count=statistics.get('hiddenSubscriberCount', False),
+            default_language=snippet.get('defaultLanguage')
+        )
+
+    @staticmethod
+    def _parse_video_item(video_id: str, item: Dict) -> EnhancedVideoMetadata:
+        snippet = item.get('snippet', {})
+        statistics = item.get('statistics', {})
+        live_details = item.get('liveStreamingDetails')
+        status = item.get('status', {})
+        is_live = live_details is not None and live_details.get('actualEndTime') is None
+        return EnhancedVideoMetadata(
+            video_id=video_id,
+            title=snippet.get('title', ''),
+            description=snippet.get('description', ''),
+            channel_id=snippet.get('channelId', ''),
+            channel_title=snippet.get('channelTitle', ''),
+            published_at=snippet.get('publishedAt', ''),
+            is_live=is_live,
+            live_streaming_details=live_details,
+            view_count=int(statistics.get('viewCount', 0)),
+            like_count=int(statistics.get('likeCount', 0)),
+            comment_count=int(statistics.get('commentCount', 0)),
+            tags=snippet.get('tags', []),
+            comments_disabled=not status.get('publicStatsViewable', True),
+            live_chat_id=live_details.get('activeLiveChatId') if live_details else None,
+            default_language=snippet.get('defaultLanguage')
+        )
+
     def get_channel_metadata(self, channel_id: str) -> Optional[EnhancedChannelMetadata]:
-        """Retrieve comprehensive channel metadata with enhanced fields"""
+        """Retrieve comprehensive channel metadata with enhanced fields (cached per channel)"""
+        hit, cached = self._get_cached(self._channel_cache, channel_id)
+        if hit:
+            return cached
         for _ in range(len(self._keys)):
+            key, youtube = self._service()
             try:
-                request = self.youtube.channels().list(
-                    part="snippet,statistics,contentDetails,topicDetails,brandingSettings,status",
+                request = youtube.channels().list(
+                    part=self.CHANNEL_PARTS,
                     id=channel_id
                 )
-                response = request.execute()
-                self.quota_used += 5
-                self._per_key_quota[self._active_key] = self._per_key_quota.get(self._active_key, 0) + 5
-                if not response.get('items'):
-                    return None
-                item = response['items'][0]
-                snippet = item.get('snippet', {})
-                statistics = item.get('statistics', {})
-                branding = item.get('brandingSettings', {})
-                topics = item.get('topicDetails', {})
-                return EnhancedChannelMetadata(
-                    channel_id=channel_id,
-                    channel_title=snippet.get('title', ''),
-                    custom_url=snippet.get('customUrl'),
-                    handle=branding.get('channel', {}).get('unsubscribedTrailer'),
-                    description=snippet.get('description', ''),
-                    subscriber_count=int(statistics.get('subscriberCount', 0)),
-                    video_count=int(statistics.get('videoCount', 0)),
-                    view_count=int(statistics.get('viewCount', 0)),
-                    published_at=snippet.get('publishedAt', ''),
-                    country=snippet.get('country'),
-                    thumbnail_url=snippet.get('thumbnails', {}).get('high', {}).get('url', ''),
-                    topic_categories=topics.get('topicCategories', []),
-                    branding_settings=branding,
-                    hidden_subscriber_count=statistics.get('hiddenSubscriberCount', False),
-                    default_language=snippet.get('defaultLanguage')
-                )
+                response = self._execute(request, 5, key=key)
+                items = response.get('items')
+                channel_meta = self._parse_channel_item(channel_id, items[0]) if items else None
+                self._cache(self._channel_cache, channel_id, channel_meta)
+                return channel_meta
             except HttpError as e:
                 if self._is_quota_error(e):
-                    if not self._rotate_key():
+                    if not self._rotate_key(key):
                         return None
                     continue
                 print(f"API Error: {e}")
@@ -434,62 +700,126 @@ class EnhancedYouTubeAPIClient:
         return None
     
     def get_video_metadata(self, video_id: str) -> Optional[EnhancedVideoMetadata]:
-        """Retrieve comprehensive video metadata with enhanced fields"""
+        """Retrieve comprehensive video metadata with enhanced fields (cached per video)"""
+        hit, cached = self._get_cached(self._video_cache, video_id)
+        if hit:
+            return cached
         for _ in range(len(self._keys)):
+            key, youtube = self._service()
             try:
-                request = self.youtube.videos().list(
-                    part="snippet,statistics,liveStreamingDetails,contentDetails,status",
+                request = youtube.videos().list(
+                    part=self.VIDEO_PARTS,
                     id=video_id
                 )
-                response = request.execute()
-                self.quota_used += 5
-                self._per_key_quota[self._active_key] = self._per_key_quota.get(self._active_key, 0) + 5
-                if not response.get('items'):
-                    return None
-                item = response['items'][0]
-                snippet = item.get('snippet', {})
-                statistics = item.get('statistics', {})
-                live_details = item.get('liveStreamingDetails')
-                status = item.get('status', {})
-                is_live = live_details is not None and live_details.get('actualEndTime') is None
-                return EnhancedVideoMetadata(
-                    video_id=video_id,
-                    title=snippet.get('title', ''),
-                    description=snippet.get('description', ''),
-                    channel_id=snippet.get('channelId', ''),
-                    channel_title=snippet.get('channelTitle', ''),
-                    published_at=snippet.get('publishedAt', ''),
-                    is_live=is_live,
-                    live_streaming_details=live_details,
-                    view_count=int(statistics.get('viewCount', 0)),
-                    like_count=int(statistics.get('likeCount', 0)),
-                    comment_count=int(statistics.get('commentCount', 0)),
-                    tags=snippet.get('tags', []),
-                    comments_disabled=not status.get('publicStatsViewable', True),
-                    live_chat_id=live_details.get('activeLiveChatId') if live_details else None,
-                    default_language=snippet.get('defaultLanguage')
-                )
+                response = self._execute(request, 5, key=key)
+                items = response.get('items')
+                video_meta = self._parse_video_item(video_id, items[0]) if items else None
+                self._cache(self._video_cache, video_id, video_meta)
+                return video_meta
             except HttpError as e:
                 if self._is_quota_error(e):
-                    if not self._rotate_key():
+                    if not self._rotate_key(key):
                         return None
                     continue
                 print(f"API Error: {e}")
                 return None
         return None
     
+    def get_channels_metadata_batch(self, channel_ids: List[str], http=None) -> Dict[str, EnhancedChannelMetadata]:
+        """Retrieve metadata for many channels, up to 50 ids per channels.list call
+        
+        Args:
+            channel_ids: Channel IDs to fetch
+            http: Optional httplib2.Http to use instead of the calling
+                  thread's keep-alive transport
+        
+        Returns:
+            Dict of channel_id -> metadata; ids YouTube did not return are absent
+        """
+        results, pending = self._split_cached(self._channel_cache, channel_ids)
+        for start in range(0, len(pending), self.MAX_IDS_PER_REQUEST):
+            chunk = pending[start:start + self.MAX_IDS_PER_REQUEST]
+            for _ in range(len(self._keys)):
+                key, youtube = self._service()
+                try:
+                    request = youtube.channels().list(
+                        part=self.CHANNEL_PARTS,
+                        id=','.join(chunk),
+                        maxResults=self.MAX_IDS_PER_REQUEST
+                    )
+                    response = self._execute(request, 5, http=http, key=key)
+                    for item in response.get('items', []):
+                        results[item['id']] = self._parse_channel_item(item['id'], item)
+                        self._cache(self._channel_cache, item['id'], results[item['id']])
+                    for missing_id in chunk:
+                        if missing_id not in results:
+                            self._cache(self._channel_cache, missing_id, None)
+                    break
+                except HttpError as e:
+                    if self._is_rate_limited(e):
+                        with self._quota_lock:
+                            self.rate_limited_calls += 1
+                    if self._is_quota_error(e):
+                        if not self._rotate_key(key):
+                            return results
+                        continue
+                    print(f"API Error: {e}")
+                    break
+        return results
+    
+    def get_videos_metadata_batch(self, video_ids: List[str], http=None) -> Dict[str, EnhancedVideoMetadata]:
+        """Retrieve metadata for many videos, up to 50 ids per videos.list call
+        
+        Args:
+            video_ids: Video IDs to fetch
+            http: Optional httplib2.Http to use instead of the calling
+                  thread's keep-alive transport
+        
+        Returns:
+            Dict of video_id -> metadata; ids YouTube did not return are absent
+        """
+        results, pending = self._split_cached(self._video_cache, video_ids)
+        for start in range(0, len(pending), self.MAX_IDS_PER_REQUEST):
+            chunk = pending[start:start + self.MAX_IDS_PER_REQUEST]
+            for _ in range(len(self._keys)):
+                key, youtube = self._service()
+                try:
+                    request = youtube.videos().list(
+                        part=self.VIDEO_PARTS,
+                        id=','.join(chunk),
+                        maxResults=self.MAX_IDS_PER_REQUEST
+                    )
+                    response = self._execute(request, 5, http=http, key=key)
+                    for item in response.get('items', []):
+                        results[item['id']] = self._parse_video_item(item['id'], item)
+                        self._cache(self._video_cache, item['id'], results[item['id']])
+                    for missing_id in chunk:
+                        if missing_id not in results:
+                            self._cache(self._video_cache, missing_id, None)
+                    break
+                except HttpError as e:
+                    if self._is_rate_limited(e):
+                        with self._quota_lock:
+                            self.rate_limited_calls += 1
+                    if self._is_quota_error(e):
+                        if not self._rotate_key(key):
+                            return results
+                        continue
+                    print(f"API Error: {e}")
+                    break
+        return results
+    
     def get_live_chat_messages(self, live_chat_id: str, max_messages: int = 20) -> List[Dict]:
         """Sample recent live chat messages (checks for pinned Super Chats and bot spam)"""
         for _ in range(len(self._keys)):
+            key, youtube = self._service()
             try:
-                request = self.youtube.liveChatMessages().list(
+                request = youtube.liveChatMessages().list(
                     liveChatId=live_chat_id,
                     part="snippet,authorDetails",
                     maxResults=min(max_messages, 100)
                 )
-                response = request.execute()
-                self.quota_used += 5
-                self._per_key_quota[self._active_key] = self._per_key_quota.get(self._active_key, 0) + 5
+                response = self._execute(request, 5, key=key)
                 messages = []
                 for item in response.get('items', []):
                     snippet = item.get('snippet', {})
@@ -514,17 +844,21 @@ class EnhancedYouTubeAPIClient:
                 return messages
             except HttpError as e:
                 if self._is_quota_error(e):
-                    if not self._rotate_key():
+                    if not self._rotate_key(key):
                         return []
                     continue
                 return []  # Chat may be disabled or ended
         return []
     
+    # Quota units charged per search.list call
+    SEARCH_QUOTA_COST = 100
+
     def search_livestreams(self, query: str, max_results: int = 50) -> List[Dict]:
         """Search for active livestreams"""
         for _ in range(len(self._keys)):
+            key, youtube = self._service()
             try:
-                request = self.youtube.search().list(
+                request = youtube.search().list(
                     part="snippet",
                     q=query,
                     type="video",
@@ -533,19 +867,54 @@ class EnhancedYouTubeAPIClient:
                     relevanceLanguage="en",
                     safeSearch="none"
                 )
-                response = request.execute()
-                self.quota_used += 100
-                self._per_key_quota[self._active_key] = self._per_key_quota.get(self._active_key, 0) + 100
+                response = self._execute(request, self.SEARCH_QUOTA_COST, key=key)
                 return response.get('items', [])
             except HttpError as e:
                 if self._is_quota_error(e):
-                    if not self._rotate_key():
+                    if not self._rotate_key(key):
                         return []
                     continue
                 print(f"API Error: {e}")
                 return []
         return []
 
+    def prefetch_livestream_searches(
+        self,
+        queries: List[Tuple[str, int]],
+        max_quota: Optional[int] = None,
+        max_workers: int = SEARCH_WORKERS
+    ):
+        """Yield (query, max_results, future) for each query in order, running up to
+        max_workers searches ahead on worker threads
+        
+        A search is only started early if it fits in what is left of max_quota after the
+        quota spent and the searches still running; otherwise its future is None and the
+        caller decides whether to search. Searches not yet consumed are cancelled when
+        the caller stops.
+        """
+        def fits_budget() -> bool:
+            if not max_quota:
+                return True
+            running = sum(1 for future in in_flight if not future.done())
+            return self.quota_used + self.SEARCH_QUOTA_COST * (running + 1) <= max_quota
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        in_flight = deque()
+        next_idx = 0
+        try:
+            for idx, (query, max_results) in enumerate(queries):
+                while next_idx < len(queries) and len(in_flight) < max_workers and fits_budget():
+                    ahead_query, ahead_max_results = queries[next_idx]
+                    in_flight.append(executor.submit(self.search_livestreams, ahead_query, ahead_max_results))
+                    next_idx += 1
+                if next_idx > idx:
+                    yield query, max_results, in_flight.popleft()
+                else:
+                    next_idx = idx + 1
+                    yield query, max_results, None
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
 
 class EnhancedStreamJackingDetector:
     """
@@ -580,8 +949,20 @@ class EnhancedStreamJackingDetector:
         'solana', 'polygon'
     ]
     
+    # Every impersonation target, in the order detections are reported
+    IMPERSONATION_TARGETS = tuple(CRYPTO_FIGURES + TECH_BRANDS + CRYPTO_PROJECTS)
+    IMPERSONATION_TARGETS_LOWER = frozenset(target.lower() for target in IMPERSONATION_TARGETS)
+    # Targets with spaces removed, compared against normalized handles and titles
+    _NORMALIZED_BRANDS = tuple(brand.replace(' ', '') for brand in IMPERSONATION_TARGETS)
+    # Characters stripped from custom URLs and channel titles before comparing them
+    _HANDLE_STRIP = str.maketrans('', '', '@/')
+    _TITLE_STRIP = str.maketrans('', '', ' -')
+    
     # Short crypto terms that need whole-word matching to avoid false positives
     SHORT_CRYPTO_TERMS = ['eth', 'btc', 'bnb', 'ada', 'sol', 'xrp']
+    _SHORT_TERM_REGEX = re.compile(
+        r'\b(' + '|'.join(map(re.escape, SHORT_CRYPTO_TERMS)) + r')\b', re.IGNORECASE
+    )
     
     # Scam keywords
     SCAM_KEYWORDS = [
@@ -594,6 +975,9 @@ class EnhancedStreamJackingDetector:
         'live now', 'ending soon', 'limited time', 'hurry', 'last chance',
         'only today', 'expires', 'don\'t miss', 'act now', 'urgent'
     ]
+    _URGENCY_AC = _build_keyword_automaton(URGENCY_KEYWORDS)
+    # Top urgency words checked in Super Chat messages
+    _CHAT_URGENCY_RE = re.compile('|'.join(map(re.escape, URGENCY_KEYWORDS[:5])))
     
     # NEW: QR Code indicators
     QR_CODE_KEYWORDS = [
@@ -623,12 +1007,16 @@ class EnhancedStreamJackingDetector:
         r'elon\s+musk\s+(live\s+)?giveaway',
         r'send\s+\d+\s+(btc|eth).*receive\s+\d+',
     ]
+    _HCS_REGEXES = [re.compile(p) for p in HIGH_CONFIDENCE_SCAM_PHRASES]
+    # All phrases as one alternation: a single pass rules out the common no-match case
+    _HCS_COMBINED = re.compile('|'.join(f'(?:{p})' for p in HIGH_CONFIDENCE_SCAM_PHRASES))
     
     # NEW: Known scam domains (expand this list)
     # Only flag if combined with other signals - these are too generic alone
     KNOWN_SCAM_DOMAINS = [
         'telegra.ph', 'tiny.cc', 'is.gd' # Less common shorteners often used by scammers
     ]
+    _SCAM_DOMAIN_AC = _build_keyword_automaton(KNOWN_SCAM_DOMAINS)
     
     # NEW: Scam domain pattern keywords
     SCAM_DOMAIN_KEYWORDS = [
@@ -644,6 +1032,20 @@ class EnhancedStreamJackingDetector:
     
     # Generic promotional domains - only flag if combined with impersonation
     PROMO_DOMAINS = ['gift', 'bonus', 'promo']
+    _PROMO_RE = re.compile('|'.join(map(re.escape, PROMO_DOMAINS)))
+    
+    # Title claims that turn an exact target mention into impersonation
+    IMPERSONATION_CLAIM_KEYWORDS = ['official', 'giveaway', 'gift']
+    _IMPERSONATION_CLAIM_RE = re.compile('|'.join(map(re.escape, IMPERSONATION_CLAIM_KEYWORDS)))
+    
+    # Title keywords of 24/7 camera streams, exempt from the engagement anomaly signal
+    LIVE_CAM_KEYWORDS = ['cam', '24/7', 'sentinel', 'rover', 'live view']
+    _LIVE_CAM_RE = re.compile('|'.join(map(re.escape, LIVE_CAM_KEYWORDS)))
+    
+    # Scam keywords required by the CRITICAL composite rule
+    CRITICAL_SCAM_KEYWORDS = ['crypto', 'giveaway', 'double', 'send']
+    _CRITICAL_SCAM_RE = re.compile('|'.join(map(re.escape, CRITICAL_SCAM_KEYWORDS)))
+    _CRITICAL_SCAM_AC = _build_keyword_automaton(CRITICAL_SCAM_KEYWORDS)
 
     # Legitimate crypto exchange domains whose referral/affiliate URLs should not
     # trigger PROMO_DOMAINS signals (e.g. promote.mexc.com, bitget.com/referral)
@@ -668,6 +1070,44 @@ class EnhancedStreamJackingDetector:
         'UCWCEYVwSqr7Epo6sSCfUgiw', # MIRROR NOW
         'UC9-uZt8l6LaZUKuuEz6VF6w', # Day Trading with Matt
     ]
+    TRUSTED_CHANNELS_SET = frozenset(TRUSTED_CHANNELS)
+    
+    # Composite categories that trigger takeover classification
+    HIGH_RISK_CATEGORIES = frozenset({'CRITICAL', 'HIGH'})
+    
+    # Channel topics where crypto streams with impersonation suggest a hijack, and
+    # topics that exempt a channel from that signal
+    HIJACK_PRONE_TOPICS = frozenset({'Gaming', 'Music', 'Entertainment', 'Lifestyle'})
+    HIJACK_EXEMPT_TOPICS = frozenset({'Tech', 'Society', 'Knowledge'})
+    
+    # Crypto keywords for the tag combination signal
+    TAG_CRYPTO_KEYWORDS = ('bitcoin', 'btc', 'ethereum', 'eth', 'crypto', 'cryptocurrency',
+                           'blockchain', 'trading', 'investment')
+    
+    # Lowercased video signal prefixes that mark a livestream as crypto-related for ATO classification
+    TAKEOVER_CRYPTO_SIGNALS = tuple(signal.lower() for signal in (
+        'Character substitution', 'Crypto address', 'Scam link', 'Pinned scam', 'CryptoBERT',
+        'Name impersonation', 'Handle-name mismatch', 'Crypto-heavy description'
+    ))
+    
+    # Minimal, high-precision crypto keywords for takeover classification;
+    # btc and eth only count as whole words
+    _TAKEOVER_CRYPTO_RE = re.compile(
+        r'bitcoin|\bbtc\b|crypto|\beth\b|giveaway|elon|tesla|saylor|official|live'
+    )
+
+    # Wallet address patterns (BTC, ETH, BTC Bech32) fused into a single scan
+    _CRYPTO_ADDRESS_RE = re.compile(
+        r'[13][a-km-zA-HJ-NP-Z1-9]{25,34}'
+        r'|0x[a-fA-F0-9]{40}'
+        r'|bc1[a-z0-9]{39,59}'
+    )
+
+    # URL shorteners commonly used to hide scam links
+    _SHORTENER_RE = re.compile(r'bit\.ly|tinyurl|goo\.gl|t\.co|ow\.ly', re.IGNORECASE)
+
+    # Scam keywords that must accompany a shortener for it to count as suspicious
+    SHORTENER_SCAM_CONTEXT = ('giveaway', 'double', 'free', 'bonus', 'elon', 'tesla')
 
     # NEW: Educational/News intent keywords (reduces risk)
     EDUCATIONAL_KEYWORDS = [
@@ -683,6 +1123,29 @@ class EnhancedStreamJackingDetector:
         'crypto', 'bitcoin', 'ethereum', 'blockchain', 'trading', 'trader',
         'defi', 'nft', 'altcoin', 'hodl'
     ]
+    _CRYPTO_NATIVE_AC = _build_keyword_automaton(CRYPTO_NATIVE_INDICATORS)
+
+    # Keywords counted for the crypto-heavy channel description signal
+    CHANNEL_CRYPTO_KEYWORDS = ['crypto', 'bitcoin', 'ethereum', 'wallet', 'giveaway', 'btc', 'eth']
+    
+    # Keyword lists matched against the lowercased channel description,
+    # all served by one automaton scan in analyze_channel_enhanced
+    CHANNEL_DESCRIPTION_KEYWORDS = {
+        'crypto_desc': CHANNEL_CRYPTO_KEYWORDS,
+        'promo': PROMO_DOMAINS,
+    }
+    _CHANNEL_DESCRIPTION_AC = _build_category_automaton(CHANNEL_DESCRIPTION_KEYWORDS)
+
+    # Keyword lists matched against the lowercased video title + description,
+    # all served by one automaton scan in analyze_video_enhanced
+    VIDEO_TEXT_KEYWORDS = {
+        'educational': EDUCATIONAL_KEYWORDS,
+        'scam': SCAM_KEYWORDS,
+        'urgency': URGENCY_KEYWORDS,
+        'qr_code': QR_CODE_KEYWORDS,
+        'crypto_content': ['crypto', 'bitcoin', 'ethereum', 'giveaway'],
+    }
+    _VIDEO_TEXT_AC = _build_category_automaton(VIDEO_TEXT_KEYWORDS)
     
     # NEW: Topic categories mapping (Wikipedia URL suffix -> Category)
     TOPIC_MAPPING = {
@@ -745,7 +1208,33 @@ class EnhancedStreamJackingDetector:
         self.api = api_client
         # Signal 12: lazy-loaded CryptoBERT inference module
         self.bert_signal = CryptoBERTSignal() if CRYPTOBERT_AVAILABLE else None
-        
+        # Substitution variations of every impersonation target, scanned in one pass
+        self._variation_automaton = self._build_variation_automaton(self.IMPERSONATION_TARGETS)
+        self._precomputed_targets = (
+            self.IMPERSONATION_TARGETS_LOWER if self._variation_automaton is not None else frozenset()
+        )
+        # Channels recur across search queries, so impersonation hits are memoized per title
+        self._channel_impersonations = lru_cache(maxsize=8192)(self._find_channel_impersonations)
+        
+    @staticmethod
+    def _match_keywords(automaton, keywords: List[str], text_lower: str) -> List[str]:
+        """Keywords occurring in text_lower, in list order, using one automaton scan when available"""
+        if automaton is None:
+            return [kw for kw in keywords if kw in text_lower]
+        return [kw for _, kw in sorted({value for _, value in automaton.iter(text_lower)})]
+    
+    @staticmethod
+    def _match_keyword_categories(automaton, categories: Dict[str, List[str]], text_lower: str) -> Dict[str, List[str]]:
+        """Per-category keyword hits in text_lower, each in list order, from one automaton scan when available"""
+        if automaton is None:
+            return {category: [kw for kw in keywords if kw in text_lower]
+                    for category, keywords in categories.items()}
+        hits = {category: set() for category in categories}
+        for _, (keyword, keyword_tags) in automaton.iter(text_lower):
+            for category, position in keyword_tags:
+                hits[category].add((position, keyword))
+        return {category: [kw for _, kw in sorted(found)] for category, found in hits.items()}
+    
     def build_topic_fingerprint(self, videos: List[Dict]) -> Dict[str, float]:
         """Build a normalized topic vector from a list of video snippets."""
         counts = {topic: 0 for topic in self.TOPIC_KEYWORD_BUCKETS}
@@ -847,14 +1336,54 @@ class EnhancedStreamJackingDetector:
             
         return False, ""
 
+    def _build_variation_automaton(self, targets: List[str]) -> Optional['ahocorasick.Automaton']:
+        """Map every substitution variation of targets to the lowercased targets it spells"""
+        if not AHOCORASICK_AVAILABLE:
+            return None
+        variation_targets = {}
+        for target in targets:
+            target_lower = target.lower()
+            for variation in self._generate_substitution_variations(target_lower):
+                variation_targets.setdefault(variation, set()).add(target_lower)
+        automaton = ahocorasick.Automaton()
+        for variation, matched_targets in variation_targets.items():
+            automaton.add_word(variation, (variation, tuple(matched_targets)))
+        automaton.make_automaton()
+        return automaton
+    
     def detect_character_substitution(self, text: str, target_names: List[str]) -> List[str]:
         """Enhanced character substitution detection with whole-word matching for short terms"""
+        return self._detect_character_substitution_lc(text.lower(), target_names)
+    
+    def _find_channel_impersonations(self, channel_title: str) -> Tuple[str, ...]:
+        """Impersonation detections for a channel title against IMPERSONATION_TARGETS"""
+        return tuple(self.detect_character_substitution(channel_title, self.IMPERSONATION_TARGETS))
+    
+    def _detect_character_substitution_lc(self, text_lower: str, target_names: List[str]) -> List[str]:
+        """detect_character_substitution for text the caller has already lowercased"""
         detections = []
-        text_lower = text.lower()
+        
+        # One scan finds exact and substituted spellings of all precomputed targets
+        exact_targets = set()
+        substituted_targets = set()
+        if self._variation_automaton is not None:
+            for _, (variation, matched_targets) in self._variation_automaton.iter(text_lower):
+                for target_lower in matched_targets:
+                    if variation == target_lower:
+                        exact_targets.add(target_lower)
+                    else:
+                        substituted_targets.add(target_lower)
         
         for target in target_names:
             target_lower = target.lower()
             
+            if target_lower in self._precomputed_targets:
+                if target_lower in exact_targets:
+                    detections.append(f"Exact match: {target}")
+                elif target_lower in substituted_targets:
+                    detections.append(f"Substitution impersonation: {target}")
+                continue
+            
             if target_lower in text_lower:
                 detections.append(f"Exact match: {target}")
                 continue
@@ -866,49 +1395,59 @@ class EnhancedStreamJackingDetector:
                     detections.append(f"Substitution impersonation: {target}")
                     break
         
-        # Check short crypto terms with whole-word boundary
-        import re
+        # Check short crypto terms with whole-word boundary (single pass over the text)
+        found_terms = set(self._SHORT_TERM_REGEX.findall(text_lower))
         for term in self.SHORT_CRYPTO_TERMS:
-            # Match only as complete word (surrounded by non-alphanumeric)
-            pattern = r'\b' + re.escape(term) + r'\b'
-            if re.search(pattern, text_lower, re.IGNORECASE):
+            if term in found_terms:
                 detections.append(f"Exact match: {term}")
         
         return detections
     
-    def _generate_substitution_variations(self, text: str, max_variations: int = 100) -> Set[str]:
-        """Generate character substitution variations"""
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _generate_substitution_variations(cls, text: str, max_variations: int = 100) -> FrozenSet[str]:
+        """Generate character substitution variations breadth-first, stopping at max_variations
+        
+        Targets are static, so results are cached per (text, max_variations).
+        """
         variations = {text}
+        queue = deque([text])
         
-        for char, substitutes in self.CHAR_SUBSTITUTIONS.items():
-            if char in text:
-                new_variations = set()
-                for variation in list(variations):
-                    for substitute in substitutes:
-                        new_var = variation.replace(char, substitute)
-                        new_variations.add(new_var)
-                        if len(variations) + len(new_variations) >= max_variations:
-                            return variations.union(new_variations)
-                variations.update(new_variations)
+        while queue:
+            variation = queue.popleft()
+            for char, substitutes in cls.CHAR_SUBSTITUTIONS.items():
+                if char not in variation:
+                    continue
+                for substitute in substitutes:
+                    new_var = variation.replace(char, substitute)
+                    if new_var in variations:
+                        continue
+                    variations.add(new_var)
+                    if len(variations) >= max_variations:
+                        return frozenset(variations)
+                    queue.append(new_var)
         
-        return variations
+        return frozenset(variations)
     
     def detect_urgency_language(self, text: str) -> Tuple[bool, List[str]]:
         """NEW: Detect urgency/pressure language"""
         text_lower = text.lower()
-        found_keywords = [kw for kw in self.URGENCY_KEYWORDS if kw in text_lower]
+        found_keywords = self._match_keywords(self._URGENCY_AC, self.URGENCY_KEYWORDS, text_lower)
         return len(found_keywords) > 0, found_keywords
     
     def detect_high_confidence_scam_phrases(self, text: str) -> Tuple[bool, List[str]]:
         """NEW: Detect high-confidence scam phrases"""
-        text_lower = text.lower()
-        found_phrases = []
+        return self._detect_high_confidence_scam_phrases_lc(text.lower())
+    
+    def _detect_high_confidence_scam_phrases_lc(self, text_lower: str) -> Tuple[bool, List[str]]:
+        """detect_high_confidence_scam_phrases for text the caller has already lowercased"""
+        if not self._HCS_COMBINED.search(text_lower):
+            return False, []
         
-        for pattern in self.HIGH_CONFIDENCE_SCAM_PHRASES:
-            if re.search(pattern, text_lower):
-                found_phrases.append(pattern)
+        # Some phrase matched; report every pattern that does
+        found_phrases = [regex.pattern for regex in self._HCS_REGEXES if regex.search(text_lower)]
         
-        return len(found_phrases) > 0, found_phrases
+        return True, found_phrases
     
     def detect_qr_code_mention(self, text: str) -> bool:
         """NEW: Detect QR code mentions in video description/title"""
@@ -921,16 +1460,15 @@ class EnhancedStreamJackingDetector:
             return False
         
         # Extract handle from custom URL
-        handle = custom_url.lower().replace('@', '').replace('/', '')
-        title_normalized = channel_title.lower().replace(' ', '').replace('-', '')
+        handle = custom_url.lower().translate(self._HANDLE_STRIP)
+        title_normalized = channel_title.lower().translate(self._TITLE_STRIP)
         
         # Check if they're significantly different
         # Using simple string similarity
         if handle not in title_normalized and title_normalized not in handle:
             # Check if both contain brand names
-            all_brands = self.CRYPTO_FIGURES + self.TECH_BRANDS + self.CRYPTO_PROJECTS
-            handle_has_brand = any(brand.replace(' ', '') in handle for brand in all_brands)
-            title_has_brand = any(brand.replace(' ', '') in title_normalized for brand in all_brands)
+            handle_has_brand = any(brand in handle for brand in self._NORMALIZED_BRANDS)
+            title_has_brand = any(brand in title_normalized for brand in self._NORMALIZED_BRANDS)
             
             # Mismatch is suspicious if title has brand but handle doesn't
             if title_has_brand and not handle_has_brand:
@@ -940,13 +1478,12 @@ class EnhancedStreamJackingDetector:
     
     def check_known_scam_domains(self, text: str) -> Tuple[bool, List[str]]:
         """NEW: Check for known scam domains including pattern-based detection"""
-        found_domains = []
-        text_lower = text.lower()
-        
+        return self._check_known_scam_domains_lc(text.lower())
+    
+    def _check_known_scam_domains_lc(self, text_lower: str) -> Tuple[bool, List[str]]:
+        """check_known_scam_domains for text the caller has already lowercased"""
         # Check exact matches (shorteners)
-        for domain in self.KNOWN_SCAM_DOMAINS:
-            if domain in text_lower:
-                found_domains.append(domain)
+        found_domains = self._match_keywords(self._SCAM_DOMAIN_AC, self.KNOWN_SCAM_DOMAINS, text_lower)
         
         # Pattern-based detection: gift-trump.com, bitcoin-mena.today, etc.
         url_pattern = r'https?://([a-z0-9-]+\.[a-z]+)'
@@ -1003,7 +1540,7 @@ class EnhancedStreamJackingDetector:
             
             # Check for urgency language
             text_lower = text.lower()
-            if any(kw in text_lower for kw in self.URGENCY_KEYWORDS[:5]):  # Check top 5 urgency words
+            if self._CHAT_URGENCY_RE.search(text_lower):  # Check top 5 urgency words
                 if is_super_chat:
                     scam_indicators.append("Pinned Super Chat with urgency language")
                     has_pinned_scam = True
@@ -1037,20 +1574,18 @@ class EnhancedStreamJackingDetector:
         if not tags:
             return False, ""
         
-        tags_lower = [tag.lower() for tag in tags]
+        tags_text = ' '.join(tags).lower()
         combined_text = (title + ' ' + description).lower()
         
         # Check for political figures or crypto celebrities
-        political_match = any(fig in ' '.join(tags_lower) or fig in combined_text 
+        political_match = any(fig in tags_text or fig in combined_text 
                              for fig in self.POLITICAL_FIGURES)
-        celebrity_match = any(celeb in ' '.join(tags_lower) or celeb in combined_text 
+        celebrity_match = any(celeb in tags_text or celeb in combined_text 
                              for celeb in self.CRYPTO_CELEBRITIES)
         
         # Check for crypto keywords
-        crypto_keywords = ['bitcoin', 'btc', 'ethereum', 'eth', 'crypto', 'cryptocurrency', 
-                          'blockchain', 'trading', 'investment']
-        crypto_match = any(kw in ' '.join(tags_lower) or kw in combined_text 
-                          for kw in crypto_keywords)
+        crypto_match = any(kw in tags_text or kw in combined_text 
+                          for kw in self.TAG_CRYPTO_KEYWORDS)
         
         # Flag if both political/celebrity AND crypto present
         if (political_match or celebrity_match) and crypto_match:
@@ -1061,39 +1596,39 @@ class EnhancedStreamJackingDetector:
         
         return False, ""
     
-    def _map_topic_url(self, url: str) -> str:
-        """Map Wikipedia topic URL to simple category"""
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _map_topic_url(cls, url: str) -> str:
+        """Map Wikipedia topic URL to simple category (cached: the same topic URLs recur across channels)"""
         if not url:
             return 'Unknown'
         
         # Extract the last part of the URL
         topic = url.split('/')[-1]
-        return self.TOPIC_MAPPING.get(topic, topic)
+        return cls.TOPIC_MAPPING.get(topic, topic)
         
     def _compute_channel_age_days(self, published_at: str) -> int:
         """Calculate channel age in days"""
         if not published_at:
             return 0
+        published_date = self._parse_channel_published_at(published_at)
+        if published_date is None:
+            return 0
+        return (datetime.now() - published_date).days
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _parse_channel_published_at(published_at: str) -> Optional[datetime]:
+        """Parse a whole-second publishedAt timestamp as a naive datetime, or None if it
+        does not match; strptime is slow and the same channels recur across queries"""
         try:
-            published_date = datetime.strptime(published_at, "%Y-%m-%dT%H:%M:%SZ")
-            return (datetime.now() - published_date).days
+            return datetime.strptime(published_at, "%Y-%m-%dT%H:%M:%SZ")
         except Exception:
-            return 0
+            return None
 
     def _detect_crypto_keywords(self, text: str) -> bool:
         """Binary detection of minimal, high-precision crypto keywords"""
-        keywords = ['bitcoin', 'btc', 'crypto', 'eth', 'giveaway', 'elon', 'tesla', 'saylor', 'official', 'live']
-        text_lower = text.lower()
-        
-        import re
-        for kw in keywords:
-            # Word boundaries for short terms
-            if kw in ['btc', 'eth']:
-                if re.search(r'\b' + re.escape(kw) + r'\b', text_lower):
-                    return True
-            elif kw in text_lower:
-                return True
-        return False
+        return bool(self._TAKEOVER_CRYPTO_RE.search(text.lower()))
         
     def _compute_past_crypto_ratio(self, past_videos: List[Dict]) -> float:
         """Calculate ratio of past videos that are crypto-related"""
@@ -1120,16 +1655,14 @@ class EnhancedStreamJackingDetector:
         
         # Determine if livestream is crypto-related based on existing detector signals
         live_crypto = False
-        crypto_signals = ['Character substitution', 'Crypto address', 'Scam link', 'Pinned scam', 'CryptoBERT', 
-                         'Name impersonation', 'Handle-name mismatch', 'Crypto-heavy description']
-        
         for signal in video_analyzed.suspicious_signals:
-            if any(cs.lower() in signal.lower() for cs in crypto_signals):
+            signal_lower = signal.lower()
+            if any(cs in signal_lower for cs in self.TAKEOVER_CRYPTO_SIGNALS):
                 live_crypto = True
                 break
                 
         # If the livestream isn't detected as crypto/scam by our signals, it's not a hijack
-        if not live_crypto and composite_risk['risk_category'] not in ['CRITICAL', 'HIGH']:
+        if not live_crypto and composite_risk['risk_category'] not in self.HIGH_RISK_CATEGORIES:
              return "NOT_STREAMJACKING"
              
         if age < 180:
@@ -1153,16 +1686,14 @@ class EnhancedStreamJackingDetector:
         risk_score = 0.0
         
         # NEW: Whitelist check
-        if channel.channel_id in self.TRUSTED_CHANNELS:
+        if channel.channel_id in self.TRUSTED_CHANNELS_SET:
             channel.suspicious_signals = ["Trusted Channel (Whitelisted)"]
             channel.risk_score = 0.0
             channel.risk_category = "LOW"
             return channel
         
-        all_targets = self.CRYPTO_FIGURES + self.TECH_BRANDS + self.CRYPTO_PROJECTS
-        
         # Signal 1: Character substitution (weight: 30)
-        impersonations = self.detect_character_substitution(channel.channel_title, all_targets)
+        impersonations = self._channel_impersonations(channel.channel_title)
         if impersonations:
             signals.append(f"Name impersonation: {', '.join(impersonations)}")
             risk_score += 30.0
@@ -1190,9 +1721,13 @@ class EnhancedStreamJackingDetector:
             risk_score += 10.0
         
         # Signal 6: Crypto-heavy description (weight: 10)
+        # One scan of the description feeds this signal and the promo check below
         desc_lower = channel.description.lower()
-        crypto_keywords = ['crypto', 'bitcoin', 'ethereum', 'wallet', 'giveaway', 'btc', 'eth']
-        crypto_mentions = sum(1 for kw in crypto_keywords if kw in desc_lower)
+        keyword_hits = self._match_keyword_categories(
+            self._CHANNEL_DESCRIPTION_AC, self.CHANNEL_DESCRIPTION_KEYWORDS, desc_lower
+        )
+        # Distinct keywords present, not total mentions
+        crypto_mentions = len(keyword_hits['crypto_desc'])
         
         if crypto_mentions >= 3:
             signals.append(f"Crypto-heavy description ({crypto_mentions} keywords)")
@@ -1200,8 +1735,8 @@ class EnhancedStreamJackingDetector:
         
         # Signal 7: Known scam domains (NEW - weight: 15)
         # Only flag generic promo domains if there's also impersonation
-        has_scam_domain, domains = self.check_known_scam_domains(channel.description)
-        has_promo_domain = any(d in channel.description.lower() for d in self.PROMO_DOMAINS)
+        has_scam_domain, domains = self._check_known_scam_domains_lc(desc_lower)
+        has_promo_domain = bool(keyword_hits['promo'])
         
         if has_scam_domain:
             signals.append(f"Known scam domain(s): {', '.join(domains)}")
@@ -1215,11 +1750,10 @@ class EnhancedStreamJackingDetector:
         # Signal 8: Topic Consistency from channel API topics (weight: 40)
         # Check if a non-tech/finance channel is posting crypto content WITH impersonation
         channel_topics = [self._map_topic_url(t) for t in channel.topic_categories]
-        safe_topics = {'Gaming', 'Music', 'Entertainment', 'Lifestyle'}
         
         # Only flag topic mismatch if there's ALSO impersonation (indicates hijack vs natural giveaway)
-        if channel_topics and any(t in safe_topics for t in channel_topics) and \
-           not any(t in {'Tech', 'Society', 'Knowledge'} for t in channel_topics) and \
+        if channel_topics and any(t in self.HIJACK_PRONE_TOPICS for t in channel_topics) and \
+           not any(t in self.HIJACK_EXEMPT_TOPICS for t in channel_topics) and \
            impersonations:  # CRITICAL: Require impersonation to confirm hijack
             signals.append(f"YouTube topic mismatch (Possible Hijack): {', '.join(channel_topics)} channel streaming crypto")
             risk_score += 40.0
@@ -1257,35 +1791,46 @@ class EnhancedStreamJackingDetector:
     
     def analyze_video_enhanced(self, video: EnhancedVideoMetadata) -> EnhancedVideoMetadata:
         """Enhanced video analysis with composite scoring"""
+        # Whitelist check: videos from trusted channels skip every scan (and the chat API call)
+        if video.channel_id in self.TRUSTED_CHANNELS_SET:
+            video.suspicious_signals = ["Trusted Channel (Whitelisted)"]
+            video.risk_score = 0.0
+            video.risk_category = "LOW"
+            return video
+        
         signals = []
         risk_score = 0.0
         
-        all_targets = self.CRYPTO_FIGURES + self.TECH_BRANDS + self.CRYPTO_PROJECTS
+        all_targets = self.IMPERSONATION_TARGETS
         
         # NEW: Intent Classification
-        title_lower = video.title.lower()
-        desc_lower = video.description.lower()
+        title_lower = video.title_lower = video.title.lower()
+        desc_lower = video.description_lower = video.description.lower()
         combined = title_lower + ' ' + desc_lower
         channel_lower = video.channel_title.lower()
         
-        educational_score = sum(1 for kw in self.EDUCATIONAL_KEYWORDS if kw in combined)
-        scam_score = sum(1 for kw in self.SCAM_KEYWORDS if kw in combined)
+        # One scan of the combined text feeds every keyword-based signal below
+        keyword_hits = self._match_keyword_categories(self._VIDEO_TEXT_AC, self.VIDEO_TEXT_KEYWORDS, combined)
+        educational_score = len(keyword_hits['educational'])
+        scam_score = len(keyword_hits['scam'])
         
         # Check if channel is crypto-native (naturally uses crypto terms)
-        is_crypto_native = any(indicator in channel_lower for indicator in self.CRYPTO_NATIVE_INDICATORS)
+        is_crypto_native = bool(self._match_keywords(
+            self._CRYPTO_NATIVE_AC, self.CRYPTO_NATIVE_INDICATORS, channel_lower
+        ))
         
         is_educational = educational_score > scam_score or is_crypto_native
         # Signal 1: Title impersonation (weight: 25)
         # REFINED: Only flag if exact match is NOT just a subject mention
         # e.g. "SpaceX Launch" is fine, but "SpaceX Official" is suspicious
-        title_impersonations = self.detect_character_substitution(video.title, all_targets)
+        title_impersonations = self._detect_character_substitution_lc(title_lower, all_targets)
         if title_impersonations:
             # Check if it's likely just a subject mention
             is_subject_mention = False
             for imp in title_impersonations:
                 if "Exact match" in imp:
                     # If it's an exact match, check for "Official" or "Live" claims to confirm impersonation
-                    if not any(kw in video.title.lower() for kw in ['official', 'giveaway', 'gift']):
+                    if not self._IMPERSONATION_CLAIM_RE.search(title_lower):
                         is_subject_mention = True
             
             if not is_subject_mention:
@@ -1293,14 +1838,14 @@ class EnhancedStreamJackingDetector:
                 risk_score += 25.0
         
         # Signal 2: High-confidence scam phrases (NEW - weight: 35)
-        has_scam_phrase, phrases = self.detect_high_confidence_scam_phrases(video.title + ' ' + video.description)
+        has_scam_phrase, phrases = self._detect_high_confidence_scam_phrases_lc(combined)
         if has_scam_phrase:
             signals.append(f"High-confidence scam phrase detected")
             risk_score += 35.0
         
         # Signal 3: Scam keywords (weight: 15)
         # Filter out 'btc'/'eth' if channel is crypto-native
-        scam_matches = [kw for kw in self.SCAM_KEYWORDS if kw in combined]
+        scam_matches = keyword_hits['scam']
         if is_crypto_native:
             # Remove generic crypto terms for crypto-native channels
             scam_matches = [kw for kw in scam_matches if kw not in ['btc', 'eth', 'cryptocurrency']]
@@ -1310,8 +1855,8 @@ class EnhancedStreamJackingDetector:
             risk_score += 15.0
         
         # Signal 4: Urgency language (NEW - weight: 10)
-        has_urgency, urgency_words = self.detect_urgency_language(combined)
-        if has_urgency and len(urgency_words) >= 2:
+        urgency_words = keyword_hits['urgency']
+        if len(urgency_words) >= 2:
             # Only penalize urgency if not educational
             if not is_educational:
                 signals.append(f"Urgency language: {', '.join(urgency_words[:2])}")
@@ -1324,7 +1869,7 @@ class EnhancedStreamJackingDetector:
             any(anchor in s for anchor in ['impersonation', 'scam phrase', 'scam keyword'])
             for s in signals
         )
-        if self._contains_crypto_address(video.description) or self._contains_suspicious_url(video.description):
+        if self._contains_crypto_address(video.description) or self._contains_suspicious_url(video.description, desc_lower):
             if _anchor_signals_present:
                 signals.append("Contains crypto address or suspicious URL")
                 risk_score += 25.0
@@ -1334,7 +1879,7 @@ class EnhancedStreamJackingDetector:
         
         # Signal 5b: QR Code mention (weight: 30)
         # CONJUNCTIVE: same anchor requirement — text-based QR detection is too noisy standalone
-        if self.detect_qr_code_mention(video.title + ' ' + video.description):
+        if keyword_hits['qr_code']:
             if _anchor_signals_present:
                 signals.append("QR code mentioned (common scam tactic)")
                 risk_score += 30.0
@@ -1344,7 +1889,7 @@ class EnhancedStreamJackingDetector:
         # Signal 6: Disabled comments (weight: 30 for crypto content, 20 otherwise)
         # CONJUNCTIVE: only scores if anchor signal present (reduces 23 FP significantly)
         if video.comments_disabled:
-            has_crypto_content = any(kw in combined for kw in ['crypto', 'bitcoin', 'ethereum', 'giveaway'])
+            has_crypto_content = bool(keyword_hits['crypto_content'])
             weight = 30.0 if has_crypto_content else 20.0
             if _anchor_signals_present:
                 signals.append("Comments disabled or restricted")
@@ -1359,14 +1904,14 @@ class EnhancedStreamJackingDetector:
         
         # Signal 8: Engagement anomalies (weight: 15)
         # REFINED: Exception for 24/7 cams
-        is_247_cam = any(kw in video.title.lower() for kw in ['cam', '24/7', 'sentinel', 'rover', 'live view'])
+        is_247_cam = bool(self._LIVE_CAM_RE.search(title_lower))
         if video.view_count > 1000 and video.comment_count < 10 and not is_247_cam:
             signals.append(f"High views ({video.view_count:,}) but very low engagement")
             risk_score += 15.0
         
         # Signal 9: Known scam domains (NEW - weight: 40 for patterns, 15 for shorteners)
-        has_scam_domain, domains = self.check_known_scam_domains(video.description)
-        has_promo_domain = any(d in video.description.lower() for d in self.PROMO_DOMAINS)
+        has_scam_domain, domains = self._check_known_scam_domains_lc(desc_lower)
+        has_promo_domain = bool(self._PROMO_RE.search(desc_lower))
         
         if has_scam_domain:
             # Higher weight for pattern-based domains (gift-trump.com, bitcoin-mena.today)
@@ -1439,6 +1984,54 @@ class EnhancedStreamJackingDetector:
         video.risk_score = min(risk_score, 100.0)
         
         return video
+    def analyze_stream(
+        self,
+        video_meta: EnhancedVideoMetadata,
+        channel_meta: Optional[EnhancedChannelMetadata]
+    ) -> Tuple[Optional[EnhancedVideoMetadata], Optional[EnhancedChannelMetadata], Optional[Dict], List[str]]:
+        """Analyze one stream's video and channel and apply the composite rules
+        
+        Returns:
+            (analyzed_video, analyzed_channel, composite, errors). analyzed_video or
+            composite is None when that step failed; a failed channel analysis only
+            leaves analyzed_channel as None.
+        """
+        errors = []
+        try:
+            analyzed_video = self.analyze_video_enhanced(video_meta)
+        except Exception as e:
+            return None, None, None, [f"Error analyzing video: {str(e)}"]
+        
+        analyzed_channel = None
+        if channel_meta:
+            try:
+                analyzed_channel = self.analyze_channel_enhanced(channel_meta)
+            except Exception as e:
+                errors.append(f"Error analyzing channel: {str(e)}, continuing without channel analysis")
+        
+        try:
+            composite = self.apply_composite_rules(analyzed_video, analyzed_channel)
+        except Exception as e:
+            errors.append(f"Error applying composite rules: {str(e)}")
+            composite = None
+        
+        return analyzed_video, analyzed_channel, composite, errors
+    
+    def analyze_streams_parallel(
+        self,
+        streams: List[Tuple[EnhancedVideoMetadata, Optional[EnhancedChannelMetadata]]],
+        max_workers: int = ANALYSIS_WORKERS
+    ) -> List[Tuple[Optional[EnhancedVideoMetadata], Optional[EnhancedChannelMetadata], Optional[Dict], List[str]]]:
+        """Run analyze_stream over (video, channel) pairs on a thread pool, results in input order
+        
+        The API client gives each worker thread its own HTTP connection, so the live
+        chat and channel history requests made during analysis overlap.
+        """
+        if len(streams) <= 1 or max_workers <= 1:
+            return [self.analyze_stream(video_meta, channel_meta) for video_meta, channel_meta in streams]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(streams))) as executor:
+            return list(executor.map(lambda stream: self.analyze_stream(*stream), streams))
+    
     def apply_composite_rules(
         self,
         video: EnhancedVideoMetadata,
@@ -1449,7 +2042,7 @@ class EnhancedStreamJackingDetector:
         Based on teammate's document section 6
         """
         # NEW: Whitelist check
-        if channel and channel.channel_id in self.TRUSTED_CHANNELS:
+        if channel and channel.channel_id in self.TRUSTED_CHANNELS_SET:
              return {
                 'risk_category': "LOW",
                 'confidence_score': 1.0,
@@ -1465,21 +2058,12 @@ class EnhancedStreamJackingDetector:
         
         total_risk = min(total_risk, 100.0)
         
-        # Check critical risk criteria (all must be true)
-        critical_checks = [
-            video.is_live,  # Currently live
-            self._contains_crypto_address(video.description),  # Wallet address
-            len(self.detect_character_substitution(
-                channel.channel_title if channel else '', 
-                self.CRYPTO_FIGURES + self.TECH_BRANDS + self.CRYPTO_PROJECTS
-            )) > 0,  # Channel impersonation
-            video.comments_disabled,  # Comments disabled
-            any(kw in video.title.lower() + video.description.lower() 
-                for kw in ['crypto', 'giveaway', 'double', 'send'])  # Scam keywords
-        ]
+        # Check critical risk criteria (all must be true), stopping at the first failure
+        critical_checks_passed = sum(1 for _ in takewhile(bool, self._critical_checks(video, channel)))
+        meets_critical_criteria = critical_checks_passed == self.CRITICAL_CHECK_COUNT
         
         # Determine risk category
-        if all(critical_checks):
+        if meets_critical_criteria:
             risk_category = "CRITICAL"
             confidence = 0.95
         elif total_risk >= 70:
@@ -1496,18 +2080,55 @@ class EnhancedStreamJackingDetector:
             'risk_category': risk_category,
             'confidence_score': round(confidence, 2),
             'total_risk_score': round(total_risk, 1),
-            'critical_checks_passed': sum(critical_checks),
-            'meets_critical_criteria': all(critical_checks)
+            'critical_checks_passed': critical_checks_passed,
+            'meets_critical_criteria': meets_critical_criteria
         }
     
+    # Number of checks yielded by _critical_checks
+    CRITICAL_CHECK_COUNT = 5
+    
+    def _critical_checks(self, video: EnhancedVideoMetadata, channel: Optional[EnhancedChannelMetadata]):
+        """Lazily evaluate the CRITICAL criteria, cheapest first
+        
+        Callers stop at the first failure, so the text scans only run for live streams
+        with comments disabled; critical_checks_passed counts the checks passed before it.
+        """
+        yield video.is_live  # Currently live
+        yield video.comments_disabled  # Comments disabled
+        yield self._has_critical_scam_keyword(
+            (video.title_lower if video.title_lower is not None else video.title.lower()) +
+            (video.description_lower if video.description_lower is not None else video.description.lower())
+        )  # Scam keywords
+        yield self._contains_crypto_address(video.description)  # Wallet address
+        yield len(self._channel_impersonations(
+            channel.channel_title if channel else ''
+        )) > 0  # Channel impersonation
+    
+    def _has_critical_scam_keyword(self, text_lower: str) -> bool:
+        """Whether any critical scam keyword occurs, stopping at the first automaton hit"""
+        if self._CRITICAL_SCAM_AC is None:
+            return self._CRITICAL_SCAM_RE.search(text_lower) is not None
+        return next(self._CRITICAL_SCAM_AC.iter(text_lower), None) is not None
+
     def _calculate_account_age(self, published_at: str) -> int:
         """Calculate account age in days"""
-        try:
-            pub_date = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-            age = datetime.now(pub_date.tzinfo) - pub_date
-            return age.days
-        except:
+        pub_date = self._parse_published_at(published_at)
+        if pub_date is None:
             return 0
+        age = datetime.now(pub_date.tzinfo) - pub_date
+        return age.days
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _parse_published_at(published_at: str) -> Optional[datetime]:
+        """Parse an API publishedAt timestamp, or None if it is missing or malformed
+        
+        Only the parse is cached; ages are still computed against the current time.
+        """
+        try:
+            return datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+        except (AttributeError, TypeError, ValueError):
+            return None
     
     def _is_exchange_referral_url(self, text: str) -> bool:
         """Return True if every PROMO_DOMAINS hit in *text* occurs inside a URL
@@ -1536,37 +2157,20 @@ class EnhancedStreamJackingDetector:
 
     def _contains_crypto_address(self, text: str) -> bool:
         """Check for cryptocurrency addresses"""
-        # BTC, ETH, and other common patterns
-        patterns = [
-            r'[13][a-km-zA-HJ-NP-Z1-9]{25,34}',  # BTC
-            r'0x[a-fA-F0-9]{40}',  # ETH
-            r'bc1[a-z0-9]{39,59}',  # BTC Bech32
-        ]
-        
-        for pattern in patterns:
-            if re.search(pattern, text):
-                return True
-        return False
-    def _contains_suspicious_url(self, text: str) -> bool:
-        """Check for suspicious URLs"""
-        # Only flag if combined with scam keywords in the same text block
-        suspicious_patterns = [
-            r'bit\.ly',
-            r'tinyurl',
-            r'goo\.gl',
-            r't\.co',
-            r'ow\.ly',
-        ]
-        
-        text_lower = text.lower()
-        has_shortener = any(re.search(p, text, re.IGNORECASE) for p in suspicious_patterns)
-        
-        if not has_shortener:
+        # Every address pattern needs a 1, a 3 or 0x; skip the regex when none occur
+        if '1' not in text and '3' not in text and '0x' not in text:
             return False
-            
-        # Only return True if shortener is present AND scam keywords are nearby
-        scam_context = any(kw in text_lower for kw in ['giveaway', 'double', 'free', 'bonus', 'elon', 'tesla'])
-        return scam_context
+        return self._CRYPTO_ADDRESS_RE.search(text) is not None
+
+    def _contains_suspicious_url(self, text: str, text_lower: Optional[str] = None) -> bool:
+        """Check for suspicious URLs (pass text_lower when the caller already has it)"""
+        # Only flag if combined with scam keywords in the same text block.
+        # The substring check is far cheaper than the regex, so it runs first.
+        if text_lower is None:
+            text_lower = text.lower()
+        if not any(kw in text_lower for kw in self.SHORTENER_SCAM_CONTEXT):
+            return False
+        return self._SHORTENER_RE.search(text) is not None
 
 
 def main():
@@ -1825,19 +2429,24 @@ def main():
     t1_count = len(TIERED_QUERIES[0]["queries"])
     t2_count = len(TIERED_QUERIES[1]["queries"])
     t3_count = len(TIERED_QUERIES[2]["queries"])
-    estimated_quota = (t1_count * 100 + t2_count * 100 + t3_count * 100 +
-                       t1_count * 50 * 10 + t2_count * 25 * 10 + t3_count * 10 * 10)
+    # 100 units per search plus one batched videos.list and channels.list call (5 each) per query
+    estimated_quota = (t1_count + t2_count + t3_count) * (100 + 10)
     print(f"⚠️  Estimated API quota usage: ~{estimated_quota:,} units")
     print("⏱️  Estimated time: 30-90 minutes\n")
 
-    # Collect all results
+    # Collect all results, also streaming them to the JSON Lines log as queries finish
     all_results = []
+    os.makedirs(os.path.dirname(RESULTS_LOG_FILE), exist_ok=True)
     failed_queries = []
     processed_videos = 0
     failed_videos = 0
     skipped_existing = 0
+    # Streams returned by several queries (or twice by one) are only analyzed and reported once
+    seen_video_ids: Set[str] = set()
+    skipped_duplicates = 0
 
-    for query_idx, (query, tier_max_results) in enumerate(ordered_queries, 1):
+    searches = api_client.prefetch_livestream_searches(ordered_queries, max_quota)
+    for query_idx, (query, tier_max_results, search) in enumerate(searches, 1):
         try:
             # Check quota limit before searching
             if max_quota and api_client.quota_used >= max_quota:
@@ -1850,7 +2459,10 @@ def main():
 
             # Search for live streams
             try:
-                livestreams = api_client.search_livestreams(query, max_results=tier_max_results)
+                if search is not None:
+                    livestreams = search.result()
+                else:
+                    livestreams = api_client.search_livestreams(query, max_results=tier_max_results)
                 
                 print(f"   Found {len(livestreams)} live streams")
             except Exception as e:
@@ -1874,6 +2486,48 @@ def main():
                 if existing_video_ids:
                     print(f"   ℹ️  Skipping {len(existing_video_ids)} already-processed videos")
 
+            # Fetch metadata for the new videos and then their channels, 50 ids per API call
+            new_video_ids = [vid for vid in video_ids
+                             if vid not in existing_video_ids and vid not in seen_video_ids]
+            video_metas: Dict[str, EnhancedVideoMetadata] = {}
+            channel_metas: Dict[str, EnhancedChannelMetadata] = {}
+            try:
+                video_metas = api_client.get_videos_metadata_batch(new_video_ids)
+            except Exception as e:
+                print(f"   ⚠️  Error fetching video metadata: {str(e)}")
+            try:
+                channel_ids = [meta.channel_id for meta in video_metas.values() if meta.channel_id]
+                channel_metas = api_client.get_channels_metadata_batch(channel_ids)
+            except Exception as e:
+                print(f"   ⚠️  Error fetching channel metadata: {str(e)}, continuing without it")
+
+            # Analyze all new streams concurrently before reporting them in search order.
+            # Each stream gets its own copy of the channel, which analysis annotates in place
+            new_video_ids = [vid for vid in dict.fromkeys(new_video_ids) if vid in video_metas]
+            analyses = dict(zip(new_video_ids, detector.analyze_streams_parallel([
+                (video_metas[vid], copy.copy(channel_metas.get(video_metas[vid].channel_id)))
+                for vid in new_video_ids
+            ])))
+
+            # Fetch uploads history concurrently for every stored high-risk stream whose
+            # channel is old enough for ATO classification (> 365 days, to save quota)
+            history_channel_ids = []
+            for analyzed_video, analyzed_channel, composite, _ in analyses.values():
+                if (analyzed_video is not None and analyzed_channel and composite
+                        and composite['total_risk_score'] >= risk_threshold
+                        and composite['risk_category'] in detector.HIGH_RISK_CATEGORIES
+                        and detector._compute_channel_age_days(analyzed_channel.published_at) > 365):
+                    history_channel_ids.append(analyzed_channel.channel_id)
+            channel_histories = {}
+            if history_channel_ids:
+                print(f"   Fetching past videos of {len(set(history_channel_ids))} channel(s) for ATO classification (~3 quota units each)...")
+                channel_histories = api_client.get_channel_histories(history_channel_ids)
+
+            # Detections from this query, upserted to MongoDB in bulk once the query is done.
+            # The query's streams were analyzed together, so they share one detection timestamp
+            query_detections = []
+            detected_at = datetime.now().isoformat()
+
             for stream_idx, stream in enumerate(livestreams, 1):
                 try:
                     # Extract video ID safely
@@ -1889,52 +2543,33 @@ def main():
                         skipped_existing += 1
                         continue
 
-                    # Get detailed metadata
-                    try:
-                        video_meta = api_client.get_video_metadata(video_id)
-                        if not video_meta:
-                            print(f"   ⚠️  Stream {stream_idx}: Could not fetch video metadata for {video_id}")
-                            failed_videos += 1
-                            continue
-                    except Exception as e:
-                        print(f"   ⚠️  Stream {stream_idx}: Error fetching video metadata: {str(e)}")
-                        failed_videos += 1
+                    # Skip if an earlier query (or stream) already processed this video
+                    if video_id in seen_video_ids:
+                        skipped_duplicates += 1
                         continue
 
-                    # Get channel metadata
-                    channel_meta = None
-                    try:
-                        channel_meta = api_client.get_channel_metadata(video_meta.channel_id)
-                        if not channel_meta:
-                            print(f"   ⚠️  Stream {stream_idx}: Could not fetch channel metadata, continuing without it")
-                    except Exception as e:
-                        print(f"   ⚠️  Stream {stream_idx}: Error fetching channel metadata: {str(e)}, continuing without it")
-
-                    # Analyze video
-                    try:
-                        analyzed_video = detector.analyze_video_enhanced(video_meta)
-                    except Exception as e:
-                        print(f"   ⚠️  Stream {stream_idx}: Error analyzing video: {str(e)}")
+                    # Get detailed metadata (prefetched in batch above)
+                    video_meta = video_metas.get(video_id)
+                    if not video_meta:
+                        print(f"   ⚠️  Stream {stream_idx}: Could not fetch video metadata for {video_id}")
                         failed_videos += 1
                         continue
 
-                    # Analyze channel
-                    analyzed_channel = None
-                    if channel_meta:
-                        try:
-                            analyzed_channel = detector.analyze_channel_enhanced(channel_meta)
-                        except Exception as e:
-                            print(f"   ⚠️  Stream {stream_idx}: Error analyzing channel: {str(e)}, continuing without channel analysis")
-
-                    # Apply composite rules
-                    try:
-                        composite = detector.apply_composite_rules(analyzed_video, analyzed_channel)
-                    except Exception as e:
-                        print(f"   ⚠️  Stream {stream_idx}: Error applying composite rules: {str(e)}")
+                    # Get channel metadata
+                    channel_meta = channel_metas.get(video_meta.channel_id)
+                    if not channel_meta:
+                        print(f"   ⚠️  Stream {stream_idx}: Could not fetch channel metadata, continuing without it")
+
+                    # Video analysis, channel analysis and composite rules (run above)
+                    analyzed_video, analyzed_channel, composite, errors = analyses[video_id]
+                    for error in errors:
+                        print(f"   ⚠️  Stream {stream_idx}: {error}")
+                    if analyzed_video is None or composite is None:
                         failed_videos += 1
                         continue
 
                     processed_videos += 1
+                    seen_video_ids.add(video_id)
 
                     # Store results if above threshold (configurable, default: 10)
                     if composite['total_risk_score'] >= risk_threshold:
@@ -1956,25 +2591,22 @@ def main():
                             'channel_signals': analyzed_channel.suspicious_signals if analyzed_channel else [],
                             'bert_scam_score': analyzed_video.bert_scam_score,  # Signal 12
                             'takeover_type': 'UNKNOWN',  # Will be updated if classification runs
-                            'detected_at': datetime.now().isoformat(),
+                            'detected_at': detected_at,
                             'search_query': query,
                             'video_url': f"https://youtube.com/watch?v={video_id}",
                             'channel_url': f"https://youtube.com/channel/{video_meta.channel_id}"
                         }
                         
                         # Apply ATO classification if high risk
-                        if composite['risk_category'] in ['CRITICAL', 'HIGH'] and analyzed_channel:
+                        if composite['risk_category'] in detector.HIGH_RISK_CATEGORIES and analyzed_channel:
                             age = detector._compute_channel_age_days(analyzed_channel.published_at)
                             
-                            # Only fetch past videos if age > 365 days to save quota
+                            # Past videos were only fetched if age > 365 days to save quota
                             past_videos = []
                             if age > 365:
-                                try:
-                                    print("       Fetching past videos for ATO classification (~3 quota units)...")
-                                    past_videos, _ = api_client.get_channel_history(analyzed_channel.channel_id)
-                                    time.sleep(0.5)
-                                except Exception as e:
-                                    print(f"       ⚠️  Failed to fetch past videos: {e}")
+                                past_videos, history_error = channel_histories.get(analyzed_channel.channel_id, ([], None))
+                                if history_error:
+                                    print(f"       ⚠️  Failed to fetch past videos: {history_error}")
                             
                             takeover_type = detector.classify_takeover(analyzed_channel, past_videos, analyzed_video, composite)
                             result['takeover_type'] = takeover_type
@@ -1982,9 +2614,8 @@ def main():
 
                         all_results.append(result)
                         
-                        # Upsert to MongoDB
-                        if mongo_manager:
-                            mongo_manager.upsert_detection(result)
+                        # Queue for the MongoDB bulk upsert after this query
+                        query_detections.append(result)
 
                         # Show in terminal
                         risk_emoji = "🔴" if composite['risk_category'] in ['CRITICAL', 'HIGH'] else "🟡" if composite['risk_category'] == 'MEDIUM' else "🟢"
@@ -1993,58 +2624,53 @@ def main():
                         print(f"       Channel: {video_meta.channel_title}")
                         print(f"       Signals: {len(analyzed_video.suspicious_signals) + (len(analyzed_channel.suspicious_signals) if analyzed_channel else 0)}")
 
-                    # Rate limiting
-                    time.sleep(0.5)
-
                 except Exception as e:
                     print(f"   ⚠️  Stream {stream_idx}: Unexpected error: {str(e)}")
                     failed_videos += 1
                     continue
 
+            # Upsert to MongoDB before the next query's already-processed check
+            if mongo_manager and query_detections:
+                mongo_manager.bulk_upsert_detections(query_detections)
+
+            if query_detections:
+                with open(RESULTS_LOG_FILE, 'ab') as results_log:
+                    results_log.writelines(_json_line(result) for result in query_detections)
+
         except Exception as e:
             print(f"   ❌ Query failed with unexpected error: {str(e)}")
             failed_queries.append({'query': query, 'error': str(e)})
             continue
     
+    searches.close()
+    print(f"\n💾 Detections logged to {RESULTS_LOG_FILE}")
+
     # Save results - ensure directory exists
     output_file = 'data/results/streamjacking_detection_results.json'
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    report = {
+        'results': all_results,
+        'metadata': {
+            'total_queries': total_queries,
+            'failed_queries': len(failed_queries),
+            'processed_videos': processed_videos,
+            'failed_videos': failed_videos,
+            'total_detections': len(all_results),
+            'api_quota_used': api_client.quota_used,
+            'scan_completed_at': datetime.now().isoformat()
+        },
+        'failed_queries': failed_queries
+    }
 
     try:
-        with open(output_file, 'w') as f:
-            json.dump({
-                'results': all_results,
-                'metadata': {
-                    'total_queries': total_queries,
-                    'failed_queries': len(failed_queries),
-                    'processed_videos': processed_videos,
-                    'failed_videos': failed_videos,
-                    'total_detections': len(all_results),
-                    'api_quota_used': api_client.quota_used,
-                    'scan_completed_at': datetime.now().isoformat()
-                },
-                'failed_queries': failed_queries
-            }, f, indent=2)
-        print(f"\n💾 Results saved to {output_file}")
+        _write_json(output_file, report)
+        print(f"💾 Results saved to {output_file}")
     except Exception as e:
         print(f"\n❌ Error saving results to {output_file}: {str(e)}")
         # Try to save to backup location
         backup_file = 'streamjacking_results_backup.json'
         try:
-            with open(backup_file, 'w') as f:
-                json.dump({
-                    'results': all_results,
-                    'metadata': {
-                        'total_queries': total_queries,
-                        'failed_queries': len(failed_queries),
-                        'processed_videos': processed_videos,
-                        'failed_videos': failed_videos,
-                        'total_detections': len(all_results),
-                        'api_quota_used': api_client.quota_used,
-                        'scan_completed_at': datetime.now().isoformat()
-                    },
-                    'failed_queries': failed_queries
-                }, f, indent=2)
+            _write_json(backup_file, report)
             print(f"💾 Results saved to backup location: {backup_file}")
         except Exception as e2:
             print(f"❌ Could not save to backup location either: {str(e2)}")
@@ -2057,36 +2683,33 @@ def main():
     print(f"Total queries attempted: {total_queries}")
     print(f"Failed queries: {len(failed_queries)}")
     print(f"Videos skipped (already in DB): {skipped_existing}")
+    print(f"Videos skipped (seen in earlier results): {skipped_duplicates}")
     print(f"Videos processed successfully: {processed_videos}")
     print(f"Videos failed to process: {failed_videos}")
     print(f"Total suspicious detections: {len(all_results)}")
     print(api_client.quota_summary())
     if skipped_existing > 0:
-        estimated_saved = skipped_existing * 10  # ~10 units per video (5 for video + 5 for channel)
-        print(f"API quota saved by skipping: ~{estimated_saved} units")
+        # 10 units (5 for video + 5 for channel) per batch of up to 50 ids
+        estimated_saved = skipped_existing * 10 / api_client.MAX_IDS_PER_REQUEST
+        print(f"API quota saved by skipping: ~{estimated_saved:.0f} units")
     
     if all_results:
-        # Risk distribution
-        critical = sum(1 for r in all_results if r['risk_category'] == 'CRITICAL')
-        high = sum(1 for r in all_results if r['risk_category'] == 'HIGH')
-        medium = sum(1 for r in all_results if r['risk_category'] == 'MEDIUM')
-        low = sum(1 for r in all_results if r['risk_category'] == 'LOW')
+        # Risk distribution and signal frequencies, tallied in one pass over the results
+        risk_counts = Counter()
+        signal_counts = Counter()
+        for result in all_results:
+            risk_counts[result['risk_category']] += 1
+            signal_counts.update(result['video_signals'])
+            signal_counts.update(result['channel_signals'])
         
         print("\nRisk Distribution:")
-        print(f"  🔴 CRITICAL: {critical}")
-        print(f"  🔴 HIGH:     {high}")
-        print(f"  🟡 MEDIUM:   {medium}")
-        print(f"  🟢 LOW:      {low}")
+        print(f"  🔴 CRITICAL: {risk_counts['CRITICAL']}")
+        print(f"  🔴 HIGH:     {risk_counts['HIGH']}")
+        print(f"  🟡 MEDIUM:   {risk_counts['MEDIUM']}")
+        print(f"  🟢 LOW:      {risk_counts['LOW']}")
         
         # Most common signals
-        all_signals = []
-        for result in all_results:
-            all_signals.extend(result['video_signals'])
-            all_signals.extend(result['channel_signals'])
-        
-        if all_signals:
-            from collections import Counter
-            signal_counts = Counter(all_signals)
+        if signal_counts:
             print("\nMost Common Signals:")
             for signal, count in signal_counts.most_common(5):
                 print(f"  • {signal}: {count}")
@@ -2097,8 +2720,7 @@ def main():
             high_risk_file = 'data/results/high_risk_channels.json'
             try:
                 os.makedirs(os.path.dirname(high_risk_file), exist_ok=True)
-                with open(high_risk_file, 'w') as f:
-                    json.dump(high_risk, f, indent=2)
+                _write_json(high_risk_file, high_risk)
                 print(f"\n💾 High-risk channels saved to {high_risk_file}")
             except Exception as e:
                 print(f"\n⚠️  Could not save high-risk channels: {str(e)}")